@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
-from datasanity import check_dataset
+import asyncio
+
+from datasanity import DataSanityReport, check_dataset, check_dataset_iter, compare_datasets
+from datasanity.cache import ResultCache
+from datasanity.ingest import read_csv_compact
 
 st.set_page_config(page_title="DataSanity", layout="wide")
 
@@ -18,6 +22,12 @@ def load_css(path: str):
         st.markdown(f"<style>{p.read_text(encoding='utf-8')}</style>", unsafe_allow_html=True)
 
 load_css("assets/styles/streamlit.css")
+
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    # One cache per server process, shared across reruns and sessions.
+    return ResultCache(max_entries=64)
+
 st.title("🧠 DataSanity — Dataset Health Check")
 st.caption("Upload a CSV and detect common ML dataset issues before training.")
 
@@ -27,23 +37,41 @@ if uploaded is None:
     st.info("Upload a CSV to begin.")
     st.stop()
 
-df = pd.read_csv(uploaded)
+df, memory = read_csv_compact(uploaded)
+st.caption(
+    f"Loaded with compact dtypes: {memory['compact_bytes'] / 1e6:,.1f} MB in memory, "
+    f"{memory['saved_fraction']:.0%} less than a default read."
+)
 
 st.subheader("Preview")
 st.dataframe(df.head(30), use_container_width=True)
 
 target = st.selectbox("Select target column", df.columns)
 
-if st.button("Run check", type="primary"):
-    report = check_dataset(df, target)
-    r = report.results
+reference_file = st.file_uploader(
+    "Reference CSV for drift (optional)", type=["csv"],
+    help="E.g. the training snapshot; the upload above is compared against it.",
+)
+
+QUICK_SAMPLE_ROWS = 100_000
+quick = False
+if len(df) > QUICK_SAMPLE_ROWS:
+    quick = st.checkbox(
+        f"Quick check on a {QUICK_SAMPLE_ROWS:,}-row sample",
+        value=True,
+        help="Stratified by target. Decisions the sample cannot settle are flagged.",
+    )
 
+
+def render_shape(r):
     c1, c2 = st.columns(2)
     with c1:
         st.metric("Rows", r["shape"][0])
     with c2:
         st.metric("Columns", r["shape"][1])
 
+
+def render_severity(r):
     st.divider()
     st.subheader("📊 Dataset health score")
 
@@ -75,7 +103,7 @@ if st.button("Run check", type="primary"):
         st.success("No major risks detected.")
 
 
-    # Warnings + sections
+def render_imbalance(r):
     st.subheader("⚖️ Target analysis")
     im = r["imbalance"]
 
@@ -94,7 +122,13 @@ if st.button("Run check", type="primary"):
 
     with st.expander("Show target distribution"):
         st.write(im.get("distribution", {}))
+        if im.get("other"):
+            st.caption(f"+ {im['other']['classes']} more classes ({im['other']['share']:.1%} of rows)")
+        if im.get("quantiles"):
+            st.write({"quantiles": im["quantiles"]})
+
 
+def render_advice(r):
     st.subheader("🧭 Modeling advice")
     a = r.get("advice", {})
 
@@ -110,6 +144,8 @@ if st.button("Run check", type="primary"):
     if actions:
         st.info("**Recommended actions:**\n- " + "\n- ".join(actions))
 
+
+def render_missing(r):
     st.subheader("❗ Missing values (>30%)")
     if len(r["missing"]["high_missing_columns"]) == 0:
         st.success("No columns above 30% missing.")
@@ -118,6 +154,8 @@ if st.button("Run check", type="primary"):
         if r["missing"].get("warning"):
             st.warning(r["missing"]["warning"])
 
+
+def render_constants(r):
     st.subheader("🧱 Constant columns")
     if len(r["constants"]["constant_columns"]) == 0:
         st.success("No constant columns.")
@@ -126,6 +164,8 @@ if st.button("Run check", type="primary"):
         if r["constants"].get("warning"):
             st.warning(r["constants"]["warning"])
 
+
+def render_id_columns(r):
     st.subheader("🆔 ID-like columns")
     if len(r["id_columns"]["id_like_columns"]) == 0:
         st.success("No ID-like columns.")
@@ -134,20 +174,86 @@ if st.button("Run check", type="primary"):
         if r["id_columns"].get("warning"):
             st.warning(r["id_columns"]["warning"])
 
-    st.subheader("🚨 Possible target leakage (corr > 0.95, numeric only)")
+
+def render_leakage(r):
+    st.subheader("🚨 Possible target leakage (corr > 0.95 or Cramér's V > 0.9)")
     if len(r["leakage"]["suspicious_features"]) == 0:
-        st.success("No suspicious correlations found.")
+        st.success("No suspicious correlations or associations found.")
     else:
-        st.error("Suspicious correlation with target detected.")
+        st.error("Suspicious correlation/association with target detected.")
         st.write(r["leakage"]["suspicious_features"])
+        if r["leakage"].get("associations"):
+            with st.expander("Association scores (Cramér's V, mutual information)"):
+                st.write(r["leakage"]["associations"])
         if r["leakage"].get("warning"):
             st.error(r["leakage"]["warning"])
 
+
+def render_numeric_distribution(r):
+    st.subheader("📈 Numeric distributions")
+    d = r["numeric_distribution"]
+    if d.get("warning"):
+        st.warning(d["warning"])
+    else:
+        st.success("No infinities, heavy skew or outlier-heavy features.")
+    if d.get("infinite_columns"):
+        st.write({"infinite values": d["infinite_columns"]})
+    if d.get("log_transform_candidates"):
+        st.info(f"log1p candidates (right-skewed, non-negative): {d['log_transform_candidates']}")
+    if d.get("outlier_columns"):
+        st.write({"outlier share (1.5 x IQR)": d["outlier_columns"]})
+    if d.get("columns"):
+        with st.expander("Per-column stats"):
+            st.dataframe(pd.DataFrame.from_dict(d["columns"], orient="index"), use_container_width=True)
+
+
+def render_temporal(r):
+    st.subheader("🕒 Time")
+    t = r["temporal"]
+    if not t.get("time_column"):
+        st.info("No timestamp columns detected.")
+        return
+    if t.get("warning"):
+        st.warning(t["warning"])
+    else:
+        st.success("No time-related leakage or target drift found.")
+    c = t["columns"][t["time_column"]]
+    st.markdown(f"**Time column:** `{t['time_column']}` — {c['min']} → {c['max']}, "
+                f"{c['n_periods']} {c['period']}s ({c['empty_periods']} empty)")
+    if t.get("lockstep_features"):
+        st.write({"move with time (corr)": t["lockstep_features"]})
+    if t.get("after_event_columns"):
+        st.write({f"later than {t['time_column']} (share of rows)": t["after_event_columns"]})
+    if t.get("target_by_period"):
+        st.caption(f"Target {t['target_stat']} per {c['period']}" +
+                   (f" (trend {t['target_trend']})" if t.get("target_trend") is not None else ""))
+        st.line_chart(pd.Series(t["target_by_period"]))
+    with st.expander("Per time column"):
+        st.dataframe(pd.DataFrame.from_dict(t["columns"], orient="index").astype(str), use_container_width=True)
+
+
+def render_groups(r):
+    st.subheader("👥 Groups")
+    g = r["groups"]
+    if not g.get("candidates"):
+        st.info("No grouping keys detected.")
+        return
+    if g.get("warning"):
+        st.warning(g["warning"])
+    else:
+        st.success("Repeated groups barely predict the target; a random split is fine.")
+    st.dataframe(pd.DataFrame.from_dict(g["columns"], orient="index").astype(str), use_container_width=True)
+
+
+def render_duplicates(r):
     st.subheader("🔁 Duplicate rows")
     if r["duplicates"]["num_duplicates"] == 0:
         st.success("No duplicate rows.")
     else:
         st.warning(f"Found {r['duplicates']['num_duplicates']} duplicate rows.")
+
+
+def render_model_suggestion(r):
     st.subheader("🤖 Model suggestions")
 
     ms = (r or {}).get("model_suggestion") or {}
@@ -207,6 +313,8 @@ if st.button("Run check", type="primary"):
     else:
         st.info("No baseline workflow available.")
 
+
+def render_code_snippet(r):
     st.markdown("### 🧩 Ready-to-run training code")
     code = (r or {}).get("code_snippet", "")
     if code:
@@ -214,12 +322,101 @@ if st.button("Run check", type="primary"):
     else:
         st.info("No code snippet available.")
 
-    # Download HTML report
+
+def render_download(r):
     st.divider()
-    html = report.to_html()
+    html = DataSanityReport(r).to_html()
     st.download_button(
         label="⬇️ Download HTML report",
         data=html,
         file_name="datasanity_report.html",
         mime="text/html",
     )
+
+
+def render_timings(r):
+    timings = r.get("_profile") or {}
+    if timings:
+        with st.expander("⏱️ Run profile (time per step)"):
+            st.dataframe(pd.DataFrame.from_dict(timings, orient="index"), use_container_width=True)
+
+
+def render_drift(r):
+    st.subheader("🌊 Drift vs reference")
+    d = r["drift"]
+    if d.get("warning"):
+        st.warning(d["warning"])
+    else:
+        st.success("No drifted columns.")
+    if d.get("drifted_columns"):
+        rows = {col: d["columns"][col] for col in d["drifted_columns"]}
+        st.dataframe(pd.DataFrame.from_dict(rows, orient="index"), use_container_width=True)
+    if d.get("missing_columns"):
+        st.write({"missing in current": d["missing_columns"]})
+    if d.get("new_columns"):
+        st.write({"new in current": d["new_columns"]})
+
+
+# Page order of the result sections; each one is filled in as its check finishes.
+SECTIONS = (
+    "shape", "severity", "imbalance", "advice", "missing", "constants",
+    "id_columns", "leakage", "numeric_distribution", "temporal", "groups", "duplicates", "model_suggestion",
+    "code_snippet",
+)
+RENDERERS = {name: globals()[f"render_{name}"] for name in SECTIONS}
+RENDERERS["_profile"] = render_timings
+RENDERERS["drift"] = render_drift
+SECTIONS += ("_profile",)
+
+
+def render_section(name, r):
+    result = r.get(name)
+    if isinstance(result, dict) and set(result) == {"error"}:
+        st.error(f"{name}: {result['error']}")
+    else:
+        RENDERERS[name](r)
+
+
+def render_sampling(r):
+    sampling = r.get("sampling")
+    if not sampling:
+        return
+    st.info(
+        f"Checked a {sampling['method']} sample of {sampling['n_sampled']:,} "
+        f"of {sampling['n_rows']:,} rows ({sampling['confidence']:.0%} intervals)."
+    )
+    if sampling["needs_full_pass"]:
+        st.warning(
+            "Too close to call on the sample; untick the quick check for a full pass:\n- "
+            + "\n- ".join(sampling["uncertain"])
+        )
+
+
+async def run_progressive(df, target, slots: dict) -> dict:
+    r = {}
+    async for name, result in check_dataset_iter(df, target, cache=get_result_cache()):
+        r[name] = result
+        with slots[name].container():
+            render_section(name, r)
+    return r
+
+
+if st.button("Run check", type="primary"):
+    if quick:
+        r = check_dataset(df, target, cache=get_result_cache(),
+                          sample=QUICK_SAMPLE_ROWS, sample_method="stratified").to_dict()
+        render_sampling(r)
+        for name in SECTIONS:
+            render_section(name, r)
+    else:
+        slots = {name: st.empty() for name in SECTIONS}
+        with st.spinner("Running checks..."):
+            r = asyncio.run(run_progressive(df, target, slots))
+
+    if reference_file is not None:
+        reference_df, _ = read_csv_compact(reference_file)
+        r["drift"] = compare_datasets(reference_df, df, target).results["drift"]
+        render_section("drift", r)
+
+    if not any(isinstance(v, dict) and set(v) == {"error"} for v in r.values()):
+        render_download(r)
@@ -1,3 +1,37 @@
-from .core import check_dataset, DataSanityReport
+# Public names are imported on first use, so `import datasanity` stays cheap
+# for short-lived workers that only need part of the package.
+_EXPORTS = {
+    "check_dataset": ".core",
+    "check_dataset_multi": ".multi",
+    "check_dataset_stream": ".stream",
+    "check_dataset_incremental": ".stream",
+    "check_dataset_from_profile": ".stream",
+    "build_profile": ".stream",
+    "merge_profiles": ".stream",
+    "check_file": ".files",
+    "compare_datasets": ".drift",
+    "DriftSketch": ".drift",
+    "check_dataset_iter": ".progressive",
+    "read_csv_compact": ".ingest",
+    "DataSanityReport": ".core",
+    "profile_dataset": ".profile",
+    "DatasetProfile": ".profile",
+    "Check": ".registry",
+    "register_check": ".registry",
+}
 
-__all__ = ["check_dataset", "DataSanityReport"]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'datasanity' has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,79 @@
+"""
+Single-file container for named NumPy arrays plus a JSON header, laid out
+so the arrays can be memory-mapped straight from disk:
+
+    magic (8 bytes) | header length (uint64, little endian) | JSON header | arrays
+
+Each array starts on a 64-byte boundary; the header lists its dtype
+(with byte order), shape and offset, so reading a file is one small JSON
+parse and a view per array, whatever the size of the arrays.
+"""
+from __future__ import annotations
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"DSANITY\x00"
+ALIGN = 64
+
+
+def _aligned(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def write_arrays(path, meta: dict, arrays: dict) -> Path:
+    """Write `meta` (JSON-serializable) and `arrays` ({name: ndarray}) to `path`, atomically."""
+    path = Path(path)
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    table, offset = {}, 0
+    for name, a in arrays.items():
+        if a.dtype.hasobject:
+            raise TypeError(f"Array {name!r} has dtype object and cannot be stored.")
+        table[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset += _aligned(a.nbytes)
+    header = json.dumps({"meta": meta, "arrays": table}, default=str).encode("utf-8")
+    start = _aligned(len(MAGIC) + 8 + len(header))
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\x00" * (start - f.tell()))
+        for a in arrays.values():
+            f.write(a.reshape(-1).view("uint8").data)
+            f.write(b"\x00" * (_aligned(a.nbytes) - a.nbytes))
+    os.replace(tmp, path)
+    return path
+
+
+def read_arrays(path, mmap: bool = True) -> tuple:
+    """
+    (meta, {name: ndarray}) from a file written by write_arrays. With
+    mmap=True the arrays are read-only views of the memory-mapped file,
+    paged in only when used; otherwise the file is read into memory.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a datasanity profile file.")
+        (size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(size))
+        start = _aligned(len(MAGIC) + 8 + size)
+        if mmap:
+            buf = np.memmap(path, dtype="uint8", mode="r")
+        else:
+            f.seek(start)
+            buf = np.frombuffer(f.read(), dtype="uint8")
+            start = 0
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        begin = start + spec["offset"]
+        n_bytes = int(np.prod(shape, dtype="int64")) * dtype.itemsize
+        arrays[name] = np.asarray(buf[begin:begin + n_bytes]).view(dtype).reshape(shape)
+    return header["meta"], arrays
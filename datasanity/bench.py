@@ -0,0 +1,226 @@
+"""
+Benchmarks for the checks on synthetic data.
+
+    python -m datasanity.bench --sizes 10000x20 100000x20 --out bench.json
+    python -m datasanity.bench --baseline bench.json      # exit 1 on regressions
+
+Every task of the check_dataset graph (profile, each check, advice,
+severity, model suggestion, code snippet) is timed on its own, and so is
+the whole check_dataset call.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .core import _check_tasks, check_dataset
+from .scheduler import _call, _ordered
+
+DEFAULT_SIZES = ((10_000, 20), (100_000, 20), (1_000_000, 20))
+
+
+def make_dataset(
+    n_rows: int = 100_000,
+    n_cols: int = 20,
+    numeric_fraction: float = 0.5,
+    missing_rate: float = 0.05,
+    duplicate_rate: float = 0.01,
+    cardinality: int = 20,
+    leaky_columns: int = 1,
+    id_columns: int = 1,
+    task: str = "classification",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Synthetic table with `n_cols` features plus a "target" column.
+
+    numeric_fraction of the features are normal floats, the rest strings
+    with `cardinality` levels; missing_rate of their cells are NaN. Of the
+    features, `leaky_columns` are the target plus small noise and
+    `id_columns` are unique row ids. duplicate_rate of the rows are copies
+    of other rows. task "classification" gives a binary target with a 20%
+    minority class, "regression" a continuous one.
+    """
+    rng = np.random.default_rng(seed)
+    if task == "classification":
+        y = (rng.random(n_rows) < 0.2).astype("int64")
+    elif task == "regression":
+        y = rng.normal(size=n_rows)
+    else:
+        raise ValueError("task must be 'classification' or 'regression'.")
+
+    data = {}
+    for i in range(id_columns):
+        data[f"id_{i}"] = rng.permutation(n_rows)
+    for i in range(leaky_columns):
+        data[f"leak_{i}"] = y + rng.normal(scale=0.01, size=n_rows)
+
+    n_plain = max(n_cols - id_columns - leaky_columns, 0)
+    n_numeric = int(round(n_plain * numeric_fraction))
+    levels = np.array([f"level_{k}" for k in range(max(cardinality, 1))], dtype=object)
+    for i in range(n_plain):
+        if i < n_numeric:
+            col = rng.normal(size=n_rows)
+            col[rng.random(n_rows) < missing_rate] = np.nan
+            data[f"num_{i}"] = col
+        else:
+            col = levels[rng.integers(0, len(levels), n_rows)]
+            col[rng.random(n_rows) < missing_rate] = None
+            data[f"cat_{i}"] = col
+    data["target"] = y
+    df = pd.DataFrame(data)
+
+    n_dup = int(n_rows * duplicate_rate)
+    if n_dup:
+        dst = rng.choice(n_rows, size=n_dup, replace=False)
+        src = rng.integers(0, n_rows, n_dup)
+        df.iloc[dst] = df.iloc[src].to_numpy()
+    return df
+
+
+def _timed(fn, *args, repeat: int = 1, **kwargs):
+    """(last result, best wall seconds over `repeat` runs, peak MB of one traced run)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return out, best, peak / 1e6
+
+
+def bench_checks(df: pd.DataFrame, target: str = "target", repeat: int = 3) -> dict:
+    """
+    {task name: {"wall_s", "peak_mb"}} for every task of the check_dataset
+    graph (run serially, in dependency order) and for check_dataset itself.
+    wall_s is the best of `repeat` runs; peak_mb is the peak of Python and
+    NumPy allocations (tracemalloc) during one more run.
+    """
+    out = {}
+    done = {}
+    for t in _ordered(_check_tasks(df, target)):
+        kwargs = {d: done[d] for d in t.deps}
+        done[t.name], wall, peak = _timed(_call, t.fn, t.args, kwargs, repeat=repeat)
+        out[t.name] = {"wall_s": round(wall, 6), "peak_mb": round(peak, 3)}
+    _, wall, peak = _timed(check_dataset, df, target, repeat=repeat)
+    out["check_dataset"] = {"wall_s": round(wall, 6), "peak_mb": round(peak, 3)}
+    return out
+
+
+def run_grid(sizes=DEFAULT_SIZES, repeat: int = 3, **dataset_kwargs) -> dict:
+    """Benchmark every (n_rows, n_cols) in `sizes`; dataset_kwargs go to make_dataset."""
+    runs = []
+    for n_rows, n_cols in sizes:
+        df = make_dataset(n_rows, n_cols, **dataset_kwargs)
+        runs.append({"n_rows": n_rows, "n_cols": n_cols, "checks": bench_checks(df, repeat=repeat)})
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "dataset": dataset_kwargs,
+        },
+        "runs": runs,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25, min_seconds: float = 0.01) -> list:
+    """
+    Regressions of `current` against `baseline` (both run_grid outputs):
+    a check is flagged when its time or peak memory grew by more than
+    `tolerance` (0.25 = 25%). Times under `min_seconds` in both runs are
+    too noisy to compare and are skipped.
+    """
+    base = {(r["n_rows"], r["n_cols"]): r["checks"] for r in baseline.get("runs", [])}
+    regressions = []
+    for run in current.get("runs", []):
+        old_checks = base.get((run["n_rows"], run["n_cols"]))
+        if old_checks is None:
+            continue
+        for name, new in run["checks"].items():
+            old = old_checks.get(name)
+            if old is None:
+                continue
+            for metric in ("wall_s", "peak_mb"):
+                if metric == "wall_s" and max(old[metric], new[metric]) < min_seconds:
+                    continue
+                if old[metric] > 0 and new[metric] > old[metric] * (1 + tolerance):
+                    regressions.append({
+                        "n_rows": run["n_rows"],
+                        "n_cols": run["n_cols"],
+                        "check": name,
+                        "metric": metric,
+                        "baseline": old[metric],
+                        "current": new[metric],
+                        "ratio": round(new[metric] / old[metric], 3),
+                    })
+    return regressions
+
+
+def _size(text: str):
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m datasanity.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", nargs="+", type=_size, default=list(DEFAULT_SIZES),
+                        help="ROWSxCOLS, e.g. 100000x20")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--numeric-fraction", type=float, default=0.5)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--cardinality", type=int, default=20)
+    parser.add_argument("--leaky-columns", type=int, default=1)
+    parser.add_argument("--id-columns", type=int, default=1)
+    parser.add_argument("--task", choices=("classification", "regression"), default="classification")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    result = run_grid(
+        args.sizes,
+        repeat=args.repeat,
+        numeric_fraction=args.numeric_fraction,
+        missing_rate=args.missing_rate,
+        duplicate_rate=args.duplicate_rate,
+        cardinality=args.cardinality,
+        leaky_columns=args.leaky_columns,
+        id_columns=args.id_columns,
+        task=args.task,
+    )
+    for run in result["runs"]:
+        print(f"{run['n_rows']:>10} x {run['n_cols']:<4}")
+        for name, m in run["checks"].items():
+            print(f"    {name:<18} {m['wall_s']:9.4f}s {m['peak_mb']:10.1f} MB")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['n_rows']}x{r['n_cols']} {r['check']} {r['metric']}: "
+                  f"{r['baseline']} -> {r['current']} (x{r['ratio']})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Bump when cached result layouts change, so old entries are never reused.
+CACHE_VERSION = 1
+
+# Checks whose result does not depend on the target; their cache entries
+# are shared between runs on the same data with different targets.
+TARGET_FREE = ("profile", "missing", "constants", "id_columns", "duplicates")
+
+
+def dataset_fingerprint(df: pd.DataFrame, blocks: int = 16, block_rows: int = 1024, full: bool = False) -> str:
+    """
+    Fast content fingerprint of a DataFrame: schema (column names, dtypes,
+    shape) plus row hashes of `blocks` evenly spaced blocks of `block_rows`
+    rows (first and last block included). Cost does not grow with the row
+    count. full=True hashes every row instead, for when edits confined to
+    unsampled rows must also be caught.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((CACHE_VERSION, df.shape)).encode())
+    for col, dtype in df.dtypes.items():
+        h.update(repr((col, str(dtype))).encode())
+
+    n = len(df)
+    if full or n <= blocks * block_rows:
+        parts = [df]
+    else:
+        starts = np.linspace(0, n - block_rows, blocks).astype("int64")
+        parts = [df.iloc[s:s + block_rows] for s in starts]
+    for part in parts:
+        h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def cache_key(*parts) -> str:
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-level cache for check results: an in-memory LRU of `max_entries`
+    and, if `directory` is given, an on-disk pickle store that evicts the
+    least recently used files once it grows past `max_bytes`.
+    Thread-safe; values are returned as stored (do not mutate them).
+    """
+
+    def __init__(self, max_entries: int = 256, directory=None, max_bytes: int = 1 << 30):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        if self.directory is None:
+            return default
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+        os.utime(path)  # mark as recently used for eviction
+        self._remember(key, value)
+        return value
+
+    def set(self, key: str, value) -> None:
+        self._remember(key, value)
+        if self.directory is None:
+            return
+        tmp = self._path(key).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self._evict_disk()
+
+    def _remember(self, key: str, value) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        files = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
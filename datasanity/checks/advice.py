@@ -1,7 +1,8 @@
 def generate_modeling_advice(results: dict) -> dict:
     """
     Generate practical modeling advice based on earlier checks.
-    Expects the full results dict from core (with keys: imbalance, missing, id_columns, leakage, duplicates).
+    Expects the full results dict from core (with keys: imbalance, missing, id_columns, leakage, duplicates,
+    numeric_distribution, temporal, groups).
     """
     advice = []
     risks = []
@@ -11,6 +12,13 @@ def generate_modeling_advice(results: dict) -> dict:
     ids = results.get("id_columns", {})
     leakage = results.get("leakage", {})
     duplicates = results.get("duplicates", {})
+    dist = results.get("numeric_distribution", {}) or {}
+    target_dist = dist.get("target") or {}
+    temporal = results.get("temporal", {}) or {}
+    time_col = temporal.get("time_column")
+    time_split = f"Split by time on '{time_col}': train on the past, validate on the most recent period."
+    groups = results.get("groups", {}) or {}
+    group_col = groups.get("group_column")
 
     task = imbalance.get("task_hint", "classification")
     n_unique = imbalance.get("n_unique")
@@ -23,6 +31,32 @@ def generate_modeling_advice(results: dict) -> dict:
     if leakage.get("suspicious_features"):
         risks.append("Possible leakage can inflate offline metrics and fail in production.")
         advice.append("Audit suspicious features and ensure they’re available at prediction time (no future info).")
+    if leakage.get("associations"):
+        advice.append("Check categorical/status-like features that almost determine the target; they are often set after the outcome.")
+
+    if temporal.get("after_event_columns"):
+        risks.append("Timestamps recorded after the event leak the outcome.")
+        cols = ", ".join(map(str, list(temporal["after_event_columns"])[:5]))
+        advice.append(
+            f"Columns timestamped after '{time_col}' ({cols}) are likely set after the outcome; "
+            "drop them and anything derived from them."
+        )
+    if temporal.get("lockstep_features"):
+        cols = ", ".join(map(str, list(temporal["lockstep_features"])[:5]))
+        advice.append(
+            f"Features that track '{time_col}' ({cols}) encode time: check they are known at prediction time, "
+            "or use relative versions (age, days since)."
+        )
+    if temporal.get("target_trend") is not None and abs(temporal["target_trend"]) > 0.7:
+        risks.append("The target drifts over time; random splits overstate performance.")
+
+    if group_col:
+        entry = groups["columns"][group_col]
+        risks.append(f"Rows repeat per '{group_col}' and the group predicts the target: a random split leaks.")
+        advice.append(
+            f"Split by '{group_col}' (GroupShuffleSplit, GroupKFold for CV) so no group is in both train and "
+            f"validation; about {entry['val_rows_seen_in_train']:.0%} of validation rows would share a group with training."
+        )
 
     if duplicates.get("num_duplicates", 0) > 0:
         risks.append("Duplicate rows can bias training and evaluation.")
@@ -31,20 +65,47 @@ def generate_modeling_advice(results: dict) -> dict:
     if missing.get("high_missing_columns"):
         advice.append("Handle missingness: impute (median/most_frequent), add missing indicators, or drop high-missing columns.")
 
+    if dist.get("infinite_columns"):
+        risks.append("Infinite values break most models and scalers.")
+        advice.append(f"Replace or clip infinite values in: {', '.join(map(str, dist['infinite_columns'][:5]))}.")
+
     # --- Task-specific advice ---
     if task == "classification":
+        if time_col:
+            advice.append(time_split)
         if imbalance.get("warning"):
-            advice.append("Use stratified split; consider class weights or resampling (SMOTE/undersampling).")
+            advice.append(
+                "Keep the time-based split; consider class weights or resampling (SMOTE/undersampling) on the training period."
+                if time_col else "Use stratified split; consider class weights or resampling (SMOTE/undersampling)."
+            )
             advice.append("Prefer macro-F1 / balanced accuracy for multi-class; for imbalanced binary use PR-AUC, recall/precision.")
         if isinstance(n_unique, int) and n_unique > 15:
             advice.append("If too many classes: consider label grouping or binning to reduce class cardinality.")
         advice.append("Start with strong baselines: Logistic Regression / Linear SVM / LightGBM/XGBoost.")
     else:
         # regression
-        advice.append("Use train/validation split appropriate for data (time-based if temporal).")
-        advice.append("Use MAE/RMSE; check residuals and outliers; consider log-transform if target is heavy-tailed.")
+        advice.append(time_split if time_col else "Use train/validation split appropriate for data (time-based if temporal).")
+        if target_dist.get("log_transform"):
+            advice.append(
+                f"Target is right-skewed (skew {target_dist['skew']}): train on log1p(target), "
+                "e.g. with TransformedTargetRegressor, and report MAE/RMSE on the original scale."
+            )
+        elif target_dist.get("heavy_tailed"):
+            advice.append(
+                f"Target is heavy-tailed (skew {target_dist['skew']}) but not a log1p candidate "
+                "(negative values or left skew): prefer MAE or a robust loss (Huber) over RMSE."
+            )
+        else:
+            advice.append("Use MAE/RMSE; check residuals and outliers.")
         advice.append("Start with baselines: Linear/Ridge, RandomForestRegressor, LightGBM/XGBoost.")
 
+    # --- Feature shape (only matters for scale-sensitive models) ---
+    if dist.get("log_transform_candidates"):
+        cols = ", ".join(map(str, dist["log_transform_candidates"][:5]))
+        advice.append(f"Right-skewed non-negative features ({cols}): log1p-transform them for linear models; trees don't need it.")
+    if dist.get("outlier_columns"):
+        advice.append("Several features have many IQR outliers: use RobustScaler or clip/winsorize for linear models.")
+
     # Nice compact output
     return {
         "task_hint": task,
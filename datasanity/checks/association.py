@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Categories kept per column (the rest go to an "other" code) and quantile
+# bins for numeric columns with many values.
+MAX_LEVELS = 50
+NUMERIC_BINS = 20
+
+
+class Binner:
+    """
+    Maps a column to small integer codes for contingency tables.
+    Fitted once (on a sample or the first chunk) so codes are comparable
+    across samples and chunks. Nulls always get their own code.
+    """
+
+    def __init__(self, s: pd.Series, numeric: bool):
+        self.edges = None
+        self.levels = None
+        values = s.dropna()
+        if numeric and values.nunique() > NUMERIC_BINS:
+            q = np.linspace(0, 1, NUMERIC_BINS + 1)[1:-1]
+            self.edges = np.unique(np.quantile(values.to_numpy(dtype="float64"), q))
+            self.n_codes = len(self.edges) + 2          # bins + null
+        else:
+            top = values.value_counts().index[:MAX_LEVELS - 1]
+            self.levels = pd.Index(top)
+            self.n_codes = len(self.levels) + 2         # levels + other + null
+
+    def transform(self, s: pd.Series) -> np.ndarray:
+        null = s.isna().to_numpy()
+        if self.edges is not None:
+            x = s.to_numpy(dtype="float64", na_value=np.nan)
+            codes = np.searchsorted(self.edges, x, side="right")
+        else:
+            codes = self.levels.get_indexer(s)
+            codes[codes < 0] = len(self.levels)         # other
+        codes[null] = self.n_codes - 1
+        return codes.astype("int64")
+
+    @classmethod
+    def fitted(cls, edges=None, levels=None) -> "Binner":
+        """A Binner with known edges or levels (e.g. read back from a profile file)."""
+        binner = cls.__new__(cls)
+        binner.edges, binner.levels = edges, levels
+        binner.n_codes = (len(edges) if edges is not None else len(levels)) + 2
+        return binner
+
+    def same(self, other: "Binner") -> bool:
+        if self.edges is not None or other.edges is not None:
+            return self.edges is not None and other.edges is not None and np.array_equal(self.edges, other.edges)
+        return self.levels.equals(other.levels)
+
+
+def contingency(x: np.ndarray, y: np.ndarray, kx: int, ky: int) -> np.ndarray:
+    """kx x ky table of code pairs, via one np.bincount."""
+    return np.bincount(x * ky + y, minlength=kx * ky).reshape(kx, ky)
+
+
+def cramers_v(table: np.ndarray) -> float:
+    """Bias-corrected Cramér's V (Bergsma 2013) of a contingency table."""
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+    r, k = table.shape
+    if n < 2 or r < 2 or k < 2:
+        return 0.0
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+    chi2 = ((table - expected) ** 2 / expected).sum()
+    phi2 = max(chi2 / n - (k - 1) * (r - 1) / (n - 1), 0.0)
+    r_corr = r - (r - 1) ** 2 / (n - 1)
+    k_corr = k - (k - 1) ** 2 / (n - 1)
+    denom = min(r_corr - 1, k_corr - 1)
+    return float(np.sqrt(phi2 / denom)) if denom > 0 else 0.0
+
+
+def uncertainty(table: np.ndarray) -> float:
+    """Mutual information of feature and target divided by the target entropy."""
+    n = table.sum()
+    if n == 0:
+        return 0.0
+    p = table / n
+    px = p.sum(axis=1, keepdims=True)
+    py = p.sum(axis=0, keepdims=True)
+    nz = p > 0
+    mi = float((p[nz] * np.log(p[nz] / (px @ py)[nz])).sum())
+    hy = float(-(py[py > 0] * np.log(py[py > 0])).sum())
+    return mi / hy if hy > 0 else 0.0
+
+
+def _scores(xc, yc, kx, ky, folds: int):
+    """Cramér's V on all rows, plus the half-width of a normal-approx interval from fold spread."""
+    table = contingency(xc, yc, kx, ky)
+    v, u = cramers_v(table), uncertainty(table)
+    parts = [cramers_v(contingency(xc[i::folds], yc[i::folds], kx, ky)) for i in range(folds)]
+    return v, u, 2.0 * float(np.std(parts) / np.sqrt(folds))
+
+
+def _is_numeric(df, col, profile) -> bool:
+    if profile is not None:
+        return profile[col].dtype_class == "numeric"
+    return pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+
+
+def association_candidates(df, target, profile=None) -> list:
+    """
+    Features worth scoring: not the target, not constant, and not ID-like
+    categoricals (unique per row, so they trivially "predict" anything).
+    Numeric columns are binned, so high cardinality is fine for them.
+    """
+    n = profile.n_rows if profile is not None else len(df)
+    out = []
+    for col in (profile.names() if profile is not None else df.columns):
+        if col == target:
+            continue
+        n_unique = profile[col].n_unique if profile is not None else df[col].nunique(dropna=False)
+        if n_unique <= 1:
+            continue
+        if n_unique > 0.98 * n and not _is_numeric(df, col, profile):
+            continue
+        out.append(col)
+    return out
+
+
+def target_associations(
+    df,
+    target,
+    columns,
+    profile=None,
+    threshold: float = 0.9,
+    sample_rows: int = 50_000,
+    folds: int = 5,
+    seed: int = 0,
+    population: int | None = None,
+) -> dict:
+    """
+    Cramér's V / normalized mutual information of each column with the target.
+
+    Starts on a uniform sample of `sample_rows` rows and grows it 4x for the
+    columns whose confidence interval still straddles `threshold`, up to the
+    full table, so clear-cut columns are decided on the first sample.
+    Returns {column: {"cramers_v", "uncertainty", "ci", "n_rows"}}.
+
+    When df is itself a sample, `population` is the row count of the table
+    it was drawn from: intervals are then scaled by the finite population
+    correction instead of collapsing to a point once all of df is scored.
+    """
+    return target_associations_multi(df, {target: columns}, profile, threshold, sample_rows, folds, seed,
+                                     population)[target]
+
+
+def target_associations_multi(
+    df,
+    columns_by_target: dict,
+    profile=None,
+    threshold: float = 0.9,
+    sample_rows: int = 50_000,
+    folds: int = 5,
+    seed: int = 0,
+    population: int | None = None,
+) -> dict:
+    """
+    target_associations for several targets at once: {target: columns} in,
+    {target: {column: scores}} out, each the same as its own call. Every
+    round draws one sample and bins each column once, whichever targets
+    it is scored against.
+    """
+    from ..sampling import _fpc
+
+    n = len(df)
+    rng = np.random.default_rng(seed)
+    pending = {t: list(cols) for t, cols in columns_by_target.items()}
+    out = {t: {} for t in pending}
+    binners = None
+    m = min(sample_rows, n)
+
+    while any(pending.values()):
+        idx = np.sort(rng.choice(n, size=m, replace=False)) if m < n else slice(None)
+        needed = list(dict.fromkeys(c for t, cols in pending.items() if cols for c in cols + [t]))
+        sample = df.iloc[idx] if len(needed) == len(df.columns) else df[needed].iloc[idx]
+        if binners is None:
+            binners = {c: Binner(sample[c], _is_numeric(df, c, profile)) for c in needed}
+        codes = {c: binners[c].transform(sample[c]) for c in needed}
+
+        for target, cols in pending.items():
+            yb = binners[target] if cols else None
+            undecided = []
+            for col in cols:
+                xb = binners[col]
+                v, u, half = _scores(codes[col], codes[target], xb.n_codes, yb.n_codes, folds)
+                if population is not None:
+                    half *= _fpc(m, population)
+                elif m == n:
+                    half = 0.0  # whole table, no sampling error
+                ci = (max(v - half, 0.0), min(v + half, 1.0))
+                out[target][col] = {"cramers_v": round(v, 4), "uncertainty": round(u, 4),
+                                    "ci": [round(ci[0], 4), round(ci[1], 4)], "n_rows": int(m)}
+                if m < n and ci[0] <= threshold <= ci[1]:
+                    undecided.append(col)
+            pending[target] = undecided
+        m = min(m * 4, n)
+    return out
+
+
+class AssociationState:
+    """
+    Mergeable contingency tables of every column against the target, for
+    the streaming path. Binners are fitted on the first chunk.
+    """
+
+    def __init__(self):
+        self.target = None
+        self.binners = None
+        self.tables = {}
+        self.mixed = set()                      # columns merged from incompatible bins
+
+    def update(self, chunk: pd.DataFrame, target: str, classes: dict) -> None:
+        if target not in chunk.columns:
+            return
+        self.target = target
+        if self.binners is None:
+            self.binners = {
+                c: Binner(chunk[c], classes[c] == "numeric") for c in chunk.columns
+            }
+        yb = self.binners[target]
+        yc = yb.transform(chunk[target])
+        for col, xb in self.binners.items():
+            if col == target or col not in chunk.columns or col in self.mixed:
+                continue
+            table = contingency(xb.transform(chunk[col]), yc, xb.n_codes, yb.n_codes)
+            self.tables[col] = self.tables[col] + table if col in self.tables else table
+
+    def merge(self, other: "AssociationState") -> "AssociationState":
+        # Tables are only comparable when built with the same binners; states
+        # fitted on different data (e.g. separate partitions) lose the
+        # columns whose bins differ rather than adding up unrelated codes.
+        if self.binners is None:
+            self.target, self.binners = other.target, other.binners
+        elif other.binners is not None and other.binners is not self.binners:
+            same_target = self.binners[self.target].same(other.binners[other.target])
+            for col in set(self.tables) | set(other.tables):
+                if not same_target or (col in self.binners and col in other.binners
+                                       and not self.binners[col].same(other.binners[col])):
+                    self.mixed.add(col)
+            self.binners = {**other.binners, **self.binners}
+        self.mixed |= other.mixed
+        for col, table in other.tables.items():
+            self.tables[col] = self.tables[col] + table if col in self.tables else table
+        for col in self.mixed:
+            self.tables.pop(col, None)
+        return self
+
+    def associations(self, columns) -> dict:
+        out = {}
+        for col in columns:
+            if col not in self.tables:
+                continue
+            table = self.tables[col]
+            v = round(cramers_v(table), 4)
+            out[col] = {"cramers_v": v, "uncertainty": round(uncertainty(table), 4),
+                        "ci": [v, v], "n_rows": int(table.sum())}
+        return out
@@ -1,5 +1,8 @@
-def check_constant_columns(df):
-    constant_cols = [col for col in df.columns if df[col].nunique(dropna=False) <= 1]
+def check_constant_columns(df, profile=None):
+    if profile is not None:
+        constant_cols = [col for col in profile.names() if profile[col].n_unique <= 1]
+    else:
+        constant_cols = [col for col in df.columns if df[col].nunique(dropna=False) <= 1]
 
     return {
         "constant_columns": constant_cols,
@@ -0,0 +1,246 @@
+import numpy as np
+import pandas as pd
+
+# Columns per block; bounds the float64 copy (and its sorted copy) to
+# n_rows * BLOCK_COLUMNS values at a time.
+BLOCK_COLUMNS = 256
+
+SKEW_THRESHOLD = 1.0        # |skew| above this is "heavily skewed"
+OUTLIER_FRACTION = 0.05     # share of values outside the 1.5 * IQR fences
+IQR_FENCE = 1.5
+
+
+def check_numeric_distribution(df, target=None, profile=None, block_size: int = BLOCK_COLUMNS):
+    """
+    Shape of every numeric column, the target included: skewness, excess
+    kurtosis, IQR outliers, zero / negative shares and infinities.
+
+    Columns are processed as 2D float blocks of `block_size`, one
+    vectorized pass each, so thousands of columns cost a handful of NumPy
+    calls rather than a pandas call per column and statistic.
+    """
+    return _distribution_result(numeric_stats(df, profile, block_size), target)
+
+
+def numeric_stats(df, profile=None, block_size: int = BLOCK_COLUMNS) -> pd.DataFrame:
+    """NumericMoments.stats() of every numeric column of df, block by block."""
+    if profile is not None:
+        numeric = profile.names("numeric")
+    else:
+        numeric = df.select_dtypes(include=np.number).columns.tolist()
+
+    moments = NumericMoments()
+    for start in range(0, len(numeric), block_size):
+        block = numeric[start:start + block_size]
+        X = df[block].to_numpy(dtype="float64", na_value=np.nan)
+        moments = moments.merge(NumericMoments.from_arrays(block, X))
+    return moments.stats()
+
+
+class NumericMoments:
+    """
+    Mergeable per-column moments of numeric columns.
+
+    Keeps the count, mean and the 2nd to 4th central moment sums of the
+    finite values (Pébay's parallel update, so chunks combine to the same
+    skewness and kurtosis as one pass), plus missing / infinite / zero /
+    negative counts and min / max. Quartiles and IQR outlier counts are
+    known only for columns seen in a single block; merging two blocks of
+    the same column (chunks of a stream) leaves them NaN.
+    """
+
+    FIELDS = ("n", "mean", "m2", "m3", "m4", "n_missing", "n_infinite", "n_zero", "n_negative",
+              "min", "max", "q1", "median", "q3", "n_outliers")
+
+    def __init__(self, columns=()):
+        self.columns = list(columns)
+        p = len(self.columns)
+        for field in self.FIELDS:
+            setattr(self, field, np.zeros(p))
+        self.min = np.full(p, np.inf)
+        self.max = np.full(p, -np.inf)
+        for field in ("q1", "median", "q3", "n_outliers"):
+            setattr(self, field, np.full(p, np.nan))
+
+    @classmethod
+    def from_arrays(cls, columns, X: np.ndarray, quartiles: bool = True) -> "NumericMoments":
+        """Moments of a 2D float block X (rows x columns); quartiles=False skips the sort."""
+        m = cls(columns)
+        if X.size == 0:
+            return m
+        finite = np.isfinite(X)
+        all_finite = finite.all()
+        n = finite.sum(axis=0).astype("float64")
+        m.n = n
+        m.n_missing = np.isnan(X).sum(axis=0).astype("float64")
+        m.n_infinite = len(X) - n - m.n_missing
+        Xf = X if all_finite else np.where(finite, X, np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            m.mean = np.nan_to_num((X if all_finite else np.where(finite, X, 0.0)).sum(axis=0) / n)
+        d = X - m.mean if all_finite else np.where(finite, X - m.mean, 0.0)
+        d2 = d * d
+        m.m2 = d2.sum(axis=0)
+        m.m3 = np.einsum("ij,ij->j", d2, d)
+        m.m4 = np.einsum("ij,ij->j", d2, d2)
+        del d, d2
+        m.n_zero = (Xf == 0).sum(axis=0).astype("float64")
+        m.n_negative = (Xf < 0).sum(axis=0).astype("float64")
+        has = n > 0
+        m.min = np.where(has, np.fmin.reduce(Xf, axis=0), np.inf)
+        m.max = np.where(has, np.fmax.reduce(Xf, axis=0), -np.inf)
+
+        if quartiles and has.any():
+            # NaN sorts last, so the finite values of each column are its first n rows.
+            S = np.sort(Xf, axis=0)
+            q1, median, q3 = (_sorted_quantile(S, n, q) for q in (0.25, 0.5, 0.75))
+            iqr = q3 - q1
+            low, high = q1 - IQR_FENCE * iqr, q3 + IQR_FENCE * iqr
+            del S
+            m.q1, m.median, m.q3 = q1, median, q3
+            with np.errstate(invalid="ignore"):
+                outside = (Xf < low) | (Xf > high)
+            m.n_outliers = np.where(has, outside.sum(axis=0), np.nan)
+        return m
+
+    def _aligned(self, columns):
+        idx = {c: i for i, c in enumerate(self.columns)}
+        out = NumericMoments(columns)
+        for j, c in enumerate(columns):
+            i = idx.get(c)
+            if i is None:
+                continue
+            for field in self.FIELDS:
+                getattr(out, field)[j] = getattr(self, field)[i]
+        return out
+
+    def merge(self, other: "NumericMoments") -> "NumericMoments":
+        columns = self.columns + [c for c in other.columns if c not in set(self.columns)]
+        a = self if columns == self.columns else self._aligned(columns)
+        b = other if columns == other.columns else other._aligned(columns)
+
+        out = NumericMoments(columns)
+        na, nb = a.n, b.n
+        n = na + nb
+        d = b.mean - a.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            f = np.where(n > 0, nb / n, 0.0)
+            w = np.where(n > 0, na * nb / n, 0.0)
+            out.mean = a.mean + d * f
+            out.m2 = a.m2 + b.m2 + d * d * w
+            out.m3 = a.m3 + b.m3 + np.where(
+                n > 0, d ** 3 * w * (na - nb) / n + 3 * d * (na * b.m2 - nb * a.m2) / n, 0.0)
+            out.m4 = a.m4 + b.m4 + np.where(
+                n > 0,
+                d ** 4 * w * (na * na - na * nb + nb * nb) / (n * n)
+                + 6 * d * d * (na * na * b.m2 + nb * nb * a.m2) / (n * n)
+                + 4 * d * (na * b.m3 - nb * a.m3) / n,
+                0.0,
+            )
+        out.n = n
+        for field in ("n_missing", "n_infinite", "n_zero", "n_negative"):
+            setattr(out, field, getattr(a, field) + getattr(b, field))
+        out.min = np.minimum(a.min, b.min)
+        out.max = np.maximum(a.max, b.max)
+
+        # Quartiles survive only where one side has not seen the column.
+        a_only = (b.n + b.n_missing + b.n_infinite) == 0
+        b_only = (a.n + a.n_missing + a.n_infinite) == 0
+        for field in ("q1", "median", "q3", "n_outliers"):
+            setattr(out, field, np.where(a_only, getattr(a, field),
+                                         np.where(b_only, getattr(b, field), np.nan)))
+        return out
+
+    def drop(self, columns) -> "NumericMoments":
+        drop = set(columns)
+        return self._aligned([c for c in self.columns if c not in drop])
+
+    def stats(self) -> pd.DataFrame:
+        """One row per column; skewness and kurtosis are bias-adjusted, as in pandas."""
+        n, m2 = self.n, self.m2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.where(n > 1, m2 / (n - 1), np.nan)
+            g1 = np.sqrt(n) * self.m3 / m2 ** 1.5
+            skew = np.where((n > 2) & (m2 > 0), g1 * np.sqrt(n * (n - 1)) / (n - 2), np.nan)
+            g2 = n * self.m4 / (m2 * m2) - 3
+            kurt = np.where((n > 3) & (m2 > 0), ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3)), np.nan)
+            has = n > 0
+            return pd.DataFrame({
+                "n": n,
+                "n_missing": self.n_missing,
+                "n_infinite": self.n_infinite,
+                "mean": np.where(has, self.mean, np.nan),
+                "std": np.sqrt(var),
+                "min": np.where(has, self.min, np.nan),
+                "q1": self.q1,
+                "median": self.median,
+                "q3": self.q3,
+                "max": np.where(has, self.max, np.nan),
+                "skew": skew,
+                "kurtosis": kurt,
+                "zero_fraction": np.where(has, self.n_zero / n, np.nan),
+                "negative_fraction": np.where(has, self.n_negative / n, np.nan),
+                "n_outliers": self.n_outliers,
+                "outlier_fraction": np.where(has, self.n_outliers / n, np.nan),
+            }, index=pd.Index(self.columns, dtype=object))
+
+
+def _sorted_quantile(S: np.ndarray, n: np.ndarray, q: float) -> np.ndarray:
+    """Linear-interpolation quantile of each column of S, whose first n[j] rows are sorted values."""
+    pos = np.maximum(n - 1, 0) * q
+    lo = np.floor(pos).astype("int64")
+    hi = np.minimum(lo + 1, np.maximum(n - 1, 0).astype("int64"))
+    cols = np.arange(S.shape[1])
+    out = S[lo, cols] + (S[hi, cols] - S[lo, cols]) * (pos - lo)
+    return np.where(n > 0, out, np.nan)
+
+
+COUNT_FIELDS = ("n", "n_missing", "n_infinite", "n_outliers")
+
+
+def _round(v, digits: int = 4):
+    return None if v is None or not np.isfinite(v) else round(float(v), digits)
+
+
+def _column_stats(row) -> dict:
+    return {k: (int(v) if np.isfinite(v) else None) if k in COUNT_FIELDS else _round(v) for k, v in row.items()}
+
+
+def _distribution_result(stats: pd.DataFrame, target=None) -> dict:
+    """Build the result from NumericMoments.stats(); quartile fields may be NaN (streaming)."""
+    if target is not None and target in stats.index:
+        target_row = stats.loc[target]
+        features = stats.drop(index=target)
+    else:
+        target_row = None
+        features = stats
+
+    skewed = features.index[features["skew"].abs() > SKEW_THRESHOLD].tolist()
+    log_candidates = features.index[(features["skew"] > SKEW_THRESHOLD) & (features["min"] >= 0)].tolist()
+    outliers = features.loc[features["outlier_fraction"] > OUTLIER_FRACTION, "outlier_fraction"]
+    infinite = stats.index[stats["n_infinite"] > 0].tolist()
+
+    target_out = None
+    if target_row is not None:
+        heavy = bool(abs(target_row["skew"]) > SKEW_THRESHOLD) if np.isfinite(target_row["skew"]) else False
+        target_out = {
+            **_column_stats(target_row),
+            "heavy_tailed": heavy,
+            # log1p needs non-negative values; skew to the left is not helped by a log.
+            "log_transform": bool(heavy and target_row["skew"] > 0 and target_row["min"] >= 0),
+        }
+
+    warnings = []
+    if infinite:
+        warnings.append("Infinite values in numeric columns.")
+    if skewed or outliers.size:
+        warnings.append("Heavily skewed or outlier-heavy numeric features.")
+    return {
+        "columns": {col: _column_stats(row) for col, row in stats.iterrows()},
+        "target": target_out,
+        "skewed_columns": skewed,
+        "log_transform_candidates": log_candidates,
+        "outlier_columns": {col: round(float(v), 4) for col, v in outliers.sort_values(ascending=False).items()},
+        "infinite_columns": infinite,
+        "warning": " ".join(warnings) or None,
+    }
@@ -1,7 +1,198 @@
-def check_duplicates(df):
-    num_duplicates = int(df.duplicated().sum())
+from __future__ import annotations
+import shutil
+import tempfile
+from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+_MIX = np.uint64(1000003)
+
+
+def _combine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a * _MIX) ^ b
+
+
+def row_hashes(df: pd.DataFrame, columns=None) -> np.ndarray:
+    """
+    64-bit hash per row over the given columns (all columns by default).
+    Columns are hashed one at a time, so only one column's hashes are
+    alive next to the running row hash.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    h = np.zeros(len(df), dtype="uint64")
+    for col in columns:
+        s = df[col]
+        if pd.api.types.is_float_dtype(s.dtype):
+            s = s + 0.0  # -0.0 and 0.0 are equal rows for duplicated()
+        h = _combine(h, pd.util.hash_pandas_object(s, index=False).to_numpy())
+    return h
+
+
+def _hash_groups(h: np.ndarray):
+    """
+    Group rows by hash. Returns (order, starts, sizes) for hash values that
+    occur more than once: order[starts[i]:starts[i] + sizes[i]] are the rows
+    of group i.
+    """
+    order = np.argsort(h, kind="stable")
+    sorted_h = h[order]
+    if len(sorted_h) == 0:
+        empty = np.empty(0, dtype="int64")
+        return order, empty, empty
+    boundary = np.flatnonzero(np.diff(sorted_h)) + 1
+    starts = np.concatenate([[0], boundary])
+    sizes = np.diff(np.concatenate([starts, [len(sorted_h)]]))
+    keep = sizes > 1
+    return order, starts[keep], sizes[keep]
+
+
+def _group_rows(order, starts, sizes) -> np.ndarray:
+    """Row positions of all hash groups, group after group."""
+    within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return order[np.repeat(starts, sizes) + within]
+
+
+def _verify_groups(df: pd.DataFrame, columns, order, starts, sizes) -> int:
+    """
+    Exact duplicate count for rows that share a hash.
+    Each row is compared with the first row of its hash group column by
+    column; groups with a mismatch (a real hash collision) fall back to
+    DataFrame.duplicated on just those rows.
+    """
+    if len(starts) == 0:
+        return 0
+    group_of = np.repeat(np.arange(len(starts)), sizes)
+    rows = _group_rows(order, starts, sizes)
+    firsts = order[starts][group_of]
+
+    same = np.ones(len(rows), dtype=bool)
+    for col in columns:
+        s = df[col]
+        a = s.iloc[rows].reset_index(drop=True)
+        b = s.iloc[firsts].reset_index(drop=True)
+        same &= (a == b).fillna(False).to_numpy(dtype=bool) | (a.isna() & b.isna()).to_numpy()
+
+    bad = np.unique(group_of[~same])
+    clean = np.ones(len(starts), dtype=bool)
+    clean[bad] = False
+    count = int((sizes[clean] - 1).sum())
+    for g in bad:
+        members = order[starts[g]:starts[g] + sizes[g]]
+        count += int(df.iloc[members][list(columns)].duplicated().sum())
+    return count
+
+
+def _clusters(df: pd.DataFrame, order, starts, sizes, max_clusters: int) -> list:
+    top = np.argsort(-sizes, kind="stable")[:max_clusters]
+    return [
+        {
+            "size": int(sizes[g]),
+            "rows": df.index[order[starts[g]:starts[g] + sizes[g]]][:10].tolist(),
+        }
+        for g in top
+    ]
+
+
+def check_duplicates(df, subset=None, max_clusters: int = 5):
+    """
+    Count duplicate rows via row hashes instead of df.duplicated(), so no
+    factorized copy of every column is built. Rows sharing a hash are
+    verified against each other, so the count is exact.
+
+    With `subset` (key columns) the result also reports rows that repeat a
+    key, how many of those differ outside the key (near duplicates) and the
+    largest key clusters. Key and remaining columns are hashed once each and
+    combined for the full-row hash.
+    """
+    columns = list(df.columns)
+    if subset is None:
+        return _duplicates_from_hashes(df, row_hashes(df, columns))
+
+    keys = [subset] if isinstance(subset, str) else list(subset)
+    rest = [c for c in columns if c not in set(keys)]
+    key_h = row_hashes(df, keys)
+    full_h = _combine(key_h, row_hashes(df, rest)) if rest else key_h
+
+    order, starts, sizes = _hash_groups(full_h)
+    num_duplicates = _verify_groups(df, columns, order, starts, sizes)
+    k_order, k_starts, k_sizes = _hash_groups(key_h)
+    num_key_duplicates = _verify_groups(df, keys, k_order, k_starts, k_sizes)
+
+    out = _duplicates_result(num_duplicates)
+    out.update({
+        "subset": keys,
+        "num_key_duplicates": num_key_duplicates,
+        "num_near_duplicates": num_key_duplicates - num_duplicates,
+        "duplicate_clusters": _clusters(df, k_order, k_starts, k_sizes, max_clusters),
+    })
+    return out
+
+
+def _duplicates_from_hashes(df: pd.DataFrame, *hashes: np.ndarray) -> dict:
+    """
+    Duplicate result from row hashes of column groups (e.g. hashed in
+    parallel shards); the group hashes are combined into one row hash.
+    """
+    h = hashes[0]
+    for part in hashes[1:]:
+        h = _combine(h, part)
+    order, starts, sizes = _hash_groups(h)
+    return _duplicates_result(_verify_groups(df, list(df.columns), order, starts, sizes))
+
+
+def _duplicates_result(num_duplicates: int) -> dict:
     return {
         "num_duplicates": num_duplicates,
         "warning": "Duplicate rows found." if num_duplicates > 0 else None
     }
+
+
+class SpilledHashSet:
+    """
+    Distinct counter for row hashes that spills to disk.
+
+    Hashes are appended to `partitions` files, split on their top bits,
+    and counted one partition at a time, so memory at count time is about
+    1/partitions of the hashes. Same interface as state.HashSet.
+    """
+
+    def __init__(self, directory=None, partitions: int = 64):
+        self.partitions = partitions
+        self._bits = max(int(np.log2(partitions)), 1)
+        self.directory = Path(tempfile.mkdtemp(prefix="datasanity-", dir=directory))
+
+    def _path(self, p: int) -> Path:
+        return self.directory / f"rows_{p:04d}.u64"
+
+    def add(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype="uint64")
+        part = (values >> np.uint64(64 - self._bits)).astype("int64") % self.partitions
+        order = np.argsort(part, kind="stable")
+        values, part = values[order], part[order]
+        bounds = np.searchsorted(part, np.arange(self.partitions + 1))
+        for p in range(self.partitions):
+            lo, hi = bounds[p], bounds[p + 1]
+            if hi > lo:
+                with open(self._path(p), "ab") as f:
+                    np.unique(values[lo:hi]).tofile(f)
+
+    def merge(self, other: "SpilledHashSet") -> "SpilledHashSet":
+        for p in range(other.partitions):
+            path = other._path(p)
+            if path.exists():
+                self.add(np.fromfile(path, dtype="uint64"))
+        return self
+
+    def __len__(self) -> int:
+        total = 0
+        for p in range(self.partitions):
+            path = self._path(p)
+            if path.exists():
+                total += len(np.unique(np.fromfile(path, dtype="uint64")))
+        return total
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
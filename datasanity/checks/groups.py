@@ -0,0 +1,365 @@
+from __future__ import annotations
+import re
+
+import numpy as np
+import pandas as pd
+
+from ..sketch import BLOCK_ROWS, hash_numeric, hash_values
+
+# A grouping key (customer, session, store ...) has at least MIN_GROUPS
+# groups of a few rows each: distinct non-null values per non-null row
+# between MIN_RATIO and MAX_RATIO. Numeric columns also need a key-like name.
+MIN_GROUPS = 50
+MIN_RATIO = 0.001
+MAX_RATIO = 0.5
+MAX_CANDIDATES = 10
+KEY_NAME = r"(?i)(^|[_\W])(id|key|code|uuid|no|nr|number)$|(?<=[a-z])(Id|ID)$"
+# Streaming picks the key columns on the first chunk, before the profile
+# is known: key-like columns with at most TRACK_RATIO distinct values per
+# row in it (the ratio drops as rows come in), up to MAX_TRACKED.
+TRACK_RATIO = 0.95
+MAX_TRACKED = 32
+
+# Values of a non-numeric (or few-valued numeric) target counted per group;
+# later ones share an "other" count. Level codes fit in the low 6 bits of
+# the (group, level) key.
+MAX_TARGET_LEVELS = 50
+LEVEL_BITS = 6
+
+VAL_FRACTION = 0.2          # validation share of the random split the estimate assumes
+LEAK_HIGH = 0.3
+LEAK_MODERATE = 0.1
+
+
+def check_group_leakage(df, target, profile=None):
+    """
+    Entity structure of the table: finds columns that look like grouping
+    keys (many groups of a few rows, e.g. customer_id) and, per key, rows
+    per group, how much of the target the group explains (within-group
+    purity, chance-corrected) and how much a random split would leak:
+    the share of validation rows whose group is also in training, times
+    the share of the target explained by the group.
+
+    Keys are hashed and rows reduced per group with pd.factorize and
+    np.bincount, one block of rows at a time; the state is mergeable
+    (see GroupState) for streaming.
+    """
+    if profile is None:
+        from ..profile import profile_dataset
+
+        profile = profile_dataset(df)
+    classes = {c: profile[c].dtype_class for c in df.columns}
+    return GroupState(group_candidates(profile, target)).update(df, target, classes).result()
+
+
+def check_group_leakage_multi(df, targets, profile) -> dict:
+    """{target: check_group_leakage(df, target)}: each key column is hashed once for all targets."""
+    classes = {c: profile[c].dtype_class for c in df.columns}
+    states = {}
+    for t in targets:
+        states[t] = GroupState(group_candidates(profile, t))
+        if t in df.columns:
+            states[t].fit(df, t, classes)
+    keys = list(dict.fromkeys(c for s in states.values() for c in s.columns))
+    for start in range(0, len(df), BLOCK_ROWS):
+        block = df.iloc[start:start + BLOCK_ROWS]
+        ys = {t: s._target_codes(block[t]) for t, s in states.items() if t in df.columns}
+        for col in keys:
+            g, present = group_hashes(block[col], classes[col])
+            for t, y in ys.items():
+                if col in states[t].columns:
+                    states[t].add_keys(col, g, present, y)
+    return {t: s.result() for t, s in states.items()}
+
+
+def _key_like(col, dtype_class: str) -> bool:
+    if dtype_class == "categorical":
+        return True
+    return dtype_class == "numeric" and re.search(KEY_NAME, str(col)) is not None
+
+
+def group_candidates(profile, target=None) -> list:
+    """
+    Columns of the profile that look like grouping keys, key-like names
+    first, then by distinct values per row (most groups first).
+    """
+    ratios = {}
+    for col, p in profile.columns.items():
+        if col == target or not _key_like(col, p.dtype_class):
+            continue
+        rows = p.n_rows - p.null_count
+        groups = p.n_unique - (1 if p.null_count else 0)
+        if groups >= MIN_GROUPS and rows and MIN_RATIO <= groups / rows <= MAX_RATIO:
+            ratios[col] = groups / rows
+    named = {c: re.search(KEY_NAME, str(c)) is not None for c in ratios}
+    return sorted(ratios, key=lambda c: (not named[c], -ratios[c]))[:MAX_CANDIDATES]
+
+
+def _tracked_columns(df: pd.DataFrame, target, classes: dict) -> list:
+    """Key-like columns of a first chunk that repeat within it, for streaming."""
+    ratios = {}
+    for col in df.columns:
+        if col == target or not _key_like(col, classes[col]):
+            continue
+        values = df[col].dropna()
+        if len(values):
+            ratio = values.nunique() / len(values)
+            if ratio <= TRACK_RATIO:
+                ratios[col] = ratio
+    return sorted(ratios, key=lambda c: -ratios[c])[:MAX_TRACKED]
+
+
+def group_hashes(s: pd.Series, dtype_class: str) -> tuple:
+    """(hash of each non-null key value, with the low LEVEL_BITS bits free; non-null mask)."""
+    present = s.notna().to_numpy()
+    values = s[present]
+    # int in one chunk, float (because of NaN) in the next: equal IDs hash equally either way.
+    h = hash_numeric(values) if dtype_class == "numeric" else hash_values(values)
+    return h >> np.uint64(LEVEL_BITS) << np.uint64(LEVEL_BITS), present
+
+
+def _reduce(keys: np.ndarray, values: np.ndarray) -> tuple:
+    """(distinct keys, per-key sums of the value columns)."""
+    codes, uniques = pd.factorize(keys)
+    out = np.empty((len(uniques), values.shape[1]))
+    for j in range(values.shape[1]):
+        out[:, j] = np.bincount(codes, weights=values[:, j], minlength=len(uniques))
+    return np.asarray(uniques, dtype="uint64"), out
+
+
+class GroupStats:
+    """
+    Mergeable per-group sums of one key column, keyed by 64-bit hash:
+    [rows, rows with a target, target sum, sum of squares] per group for
+    numeric targets, rows per (group, target level) otherwise (the level
+    code is in the low bits of the key). Reduced blocks are kept pending
+    and folded in once they outgrow the table, like state.HashSet.
+    """
+
+    def __init__(self, width: int):
+        self.keys = np.empty(0, dtype="uint64")
+        self.values = np.zeros((0, width))
+        self._pending = []
+        self._pending_size = 0
+
+    def add(self, keys: np.ndarray, values: np.ndarray) -> None:
+        if len(keys) == 0:
+            return
+        self._pending.append(_reduce(keys, values))
+        self._pending_size += len(self._pending[-1][0])
+        if self._pending_size > max(len(self.keys), 1 << 16):
+            self._compact()
+
+    def _compact(self) -> None:
+        if self._pending:
+            self.keys, self.values = _reduce(
+                np.concatenate([self.keys] + [k for k, _ in self._pending]),
+                np.vstack([self.values] + [v for _, v in self._pending]),
+            )
+            self._pending = []
+            self._pending_size = 0
+
+    def merge(self, other: "GroupStats") -> "GroupStats":
+        other._compact()
+        self.add(other.keys, other.values)
+        return self
+
+    def table(self) -> tuple:
+        self._compact()
+        return self.keys, self.values
+
+
+class GroupState:
+    """
+    Mergeable state of the group check: the key columns, the target kind
+    (numeric targets with more than MAX_TARGET_LEVELS values are summed,
+    others counted per level; decided on the first chunk) and GroupStats
+    per key column.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns                  # key columns; None = picked on the first chunk
+        self.numeric_target = None
+        self.shift = 0.0                        # subtracted from a numeric target, for precision
+        self.levels = []                        # tracked values of a counted target
+        self.stats = {}                         # key column -> GroupStats
+
+    def fit(self, df: pd.DataFrame, target, classes: dict) -> None:
+        if self.columns is None:
+            self.columns = _tracked_columns(df, target, classes)
+        y = df[target]
+        self.numeric_target = classes[target] == "numeric" and y.nunique() > MAX_TARGET_LEVELS
+        if self.numeric_target:
+            mean = y.mean()
+            self.shift = float(mean) if pd.notna(mean) and np.isfinite(mean) else 0.0
+
+    def _target_codes(self, y: pd.Series) -> np.ndarray:
+        if self.numeric_target:
+            return y.to_numpy(dtype="float64", na_value=np.nan) - self.shift
+        # Factorize first, so only the distinct values are looked up.
+        codes, uniques = pd.factorize(y)
+        if len(self.levels) < MAX_TARGET_LEVELS:
+            known = set(self.levels)
+            new = [v for v in uniques if v not in known]
+            self.levels += new[:MAX_TARGET_LEVELS - len(self.levels)]
+        # 0 = other, i + 1 = levels[i], -1 = missing (code -1 picks the appended -1).
+        lookup = pd.Index(self.levels, dtype=object).get_indexer(pd.Index(uniques).astype(object)) + 1
+        return np.append(lookup, -1)[codes]
+
+    def add_keys(self, col, g: np.ndarray, present: np.ndarray, y: np.ndarray) -> None:
+        """Fold in the key hashes of a block's non-null rows and the target (from _target_codes) of all its rows."""
+        y = y[present]
+        if self.numeric_target:
+            has = np.isfinite(y)
+            v = np.where(has, y, 0.0)
+            keys, values = g, np.column_stack([np.ones(len(g)), has, v, v * v])
+        else:
+            keys, values = g | (y + 1).astype("uint64"), np.ones((len(g), 1))
+        stats = self.stats.setdefault(col, GroupStats(values.shape[1]))
+        stats.add(keys, values)
+
+    def update(self, df: pd.DataFrame, target, classes: dict) -> "GroupState":
+        if target is None or target not in df.columns:
+            return self
+        if self.numeric_target is None:
+            self.fit(df, target, classes)
+        columns = [c for c in self.columns if c in df.columns]
+        for start in range(0, len(df), BLOCK_ROWS):
+            block = df.iloc[start:start + BLOCK_ROWS]
+            y = self._target_codes(block[target])
+            for col in columns:
+                g, present = group_hashes(block[col], classes[col])
+                self.add_keys(col, g, present, y)
+        return self
+
+    def merge(self, other: "GroupState") -> "GroupState":
+        if other.numeric_target is None:
+            return self
+        if self.numeric_target is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        if other.numeric_target != self.numeric_target:
+            # One partition summed the target, the other counted it.
+            self.columns, self.stats = [], {}
+            return self
+        # Keys tracked in only one of the two would miss the other's rows.
+        self.columns = [c for c in self.columns if c in other.columns]
+        remap = self._level_map(other.levels)
+        self.stats = {c: s for c, s in self.stats.items() if c in self.columns}
+        for col in self.columns:
+            if col not in other.stats:
+                continue
+            keys, values = other.stats[col].table()
+            if self.numeric_target:
+                d = other.shift - self.shift        # other's sums about self's shift
+                n = values[:, 1]
+                values = np.column_stack([values[:, 0], n, values[:, 2] + d * n,
+                                          values[:, 3] + 2 * d * values[:, 2] + d * d * n])
+            elif remap is not None:
+                low = (keys & np.uint64((1 << LEVEL_BITS) - 1)).astype("int64")
+                keys = keys - low.astype("uint64") + remap[low].astype("uint64")
+            self.stats.setdefault(col, GroupStats(values.shape[1])).add(keys, values)
+        return self
+
+    def _level_map(self, levels) -> np.ndarray | None:
+        """Key code (missing, other, levels...) in self of each of other's codes, adding new levels."""
+        if self.numeric_target or list(levels) == self.levels[:len(levels)]:
+            return None
+        index = {v: i for i, v in enumerate(self.levels)}
+        out = [0, 1]
+        for v in levels:
+            if v not in index and len(self.levels) < MAX_TARGET_LEVELS:
+                index[v] = len(self.levels)
+                self.levels.append(v)
+            out.append(index[v] + 2 if v in index else 1)
+        return np.array(out)
+
+    def result(self, columns=None) -> dict:
+        """The report of the key columns in `columns` (default: all tracked ones)."""
+        return _group_result(self, self.columns if columns is None else columns)
+
+
+def _explained(sst: float, ssw: float, n: float, groups: int) -> float:
+    """Share of the target variance between groups, corrected for chance (epsilon squared)."""
+    if sst <= 0 or n <= groups:
+        return 0.0
+    msw = ssw / (n - groups)
+    return float(np.clip((sst - ssw - (groups - 1) * msw) / sst, 0.0, 1.0))
+
+
+def _key_result(state: GroupState, stats: GroupStats) -> dict | None:
+    keys, values = stats.table()
+    purity = baseline = None
+    if state.numeric_target:
+        rows, m, s1, s2 = values.T
+        seen = m > 0
+        total_m, total_s1 = m.sum(), s1.sum()
+        sst = s2.sum() - total_s1 ** 2 / total_m if total_m else 0.0
+        ssw = np.maximum(s2[seen] - s1[seen] ** 2 / m[seen], 0.0).sum()
+        explained = _explained(sst, ssw, total_m, int(seen.sum()))
+    else:
+        group, n = keys >> np.uint64(LEVEL_BITS), values[:, 0]
+        level = (keys & np.uint64((1 << LEVEL_BITS) - 1)).astype("int64") - 1
+        gi, uniques = pd.factorize(group)
+        k = len(uniques)
+        rows = np.bincount(gi, weights=n, minlength=k)
+        has = level >= 0
+        gi, n, level = gi[has], n[has], level[has]
+        m = np.bincount(gi, weights=n, minlength=k)
+        top = np.zeros(k)
+        np.maximum.at(top, gi, n)
+        totals = np.bincount(level, weights=n)
+        total_m = m.sum()
+        sst = total_m - (totals ** 2).sum() / total_m if total_m else 0.0
+        seen = m > 0
+        ssw = (m[seen] - np.bincount(gi, weights=n * n, minlength=k)[seen] / m[seen]).sum()
+        explained = _explained(sst, ssw, total_m, int(seen.sum()))
+        repeated = m >= 2
+        if repeated.any():
+            purity = round(float(top[repeated].sum() / m[repeated].sum()), 4)
+            baseline = round(float(totals.max() / total_m), 4)
+
+    n_rows = float(rows.sum())
+    if not n_rows:
+        return None
+    # Rows of a group land in validation independently, so a validation row
+    # meets its group in training unless all its group's other rows are held out too.
+    seen_in_train = float((rows * (1 - VAL_FRACTION ** (rows - 1))).sum() / n_rows)
+    leak = seen_in_train * explained
+    return {
+        "n_groups": len(rows),
+        "cardinality_ratio": round(len(rows) / n_rows, 4),
+        "rows_per_group": {"mean": round(float(n_rows / len(rows)), 2), "median": float(np.median(rows)),
+                           "max": int(rows.max())},
+        "repeated_row_share": round(float(rows[rows >= 2].sum() / n_rows), 4),
+        "target_explained": round(explained, 4),
+        "purity": purity,
+        "baseline_purity": baseline,
+        "val_rows_seen_in_train": round(seen_in_train, 4),
+        "leak_estimate": round(leak, 4),
+        "risk": "high" if leak >= LEAK_HIGH else "moderate" if leak >= LEAK_MODERATE else "low",
+    }
+
+
+def _group_result(state: GroupState, columns) -> dict:
+    out = {"candidates": [], "columns": {}, "group_column": None, "risk": None, "warning": None}
+    for col in columns:
+        if col in state.stats:
+            entry = _key_result(state, state.stats[col])
+            if entry is not None:
+                out["candidates"].append(col)
+                out["columns"][col] = entry
+    if not out["columns"]:
+        return out
+
+    best = max(out["candidates"], key=lambda c: out["columns"][c]["leak_estimate"])
+    entry = out["columns"][best]
+    out["risk"] = entry["risk"]
+    if entry["risk"] != "low":
+        out["group_column"] = best
+        out["warning"] = (
+            f"Rows repeat per '{best}' ({entry['rows_per_group']['mean']} rows per group on average) and the "
+            f"group explains {entry['target_explained']:.0%} of the target: a random split leaks about "
+            f"{entry['leak_estimate']:.0%}. Split by '{best}' (GroupKFold / GroupShuffleSplit)."
+        )
+    return out
@@ -1,8 +1,22 @@
-def check_id_like_columns(df):
-    if len(df) == 0:
+from ..sketch import approx_nunique
+
+
+def check_id_like_columns(df, profile=None, approx_distinct=None):
+    """
+    Flag columns with more than 98% distinct values.
+    approx_distinct (relative error, e.g. 0.01) counts with a HyperLogLog
+    sketch instead of an exact hash set; ignored when a profile is given.
+    """
+    n_rows = profile.n_rows if profile is not None else len(df)
+    if n_rows == 0:
         return {"id_like_columns": []}
 
-    id_like = [col for col in df.columns if df[col].nunique(dropna=False) > 0.98 * len(df)]
+    if profile is not None:
+        id_like = [col for col in profile.names() if profile[col].n_unique > 0.98 * n_rows]
+    elif approx_distinct is not None:
+        id_like = [col for col in df.columns if approx_nunique(df[col], approx_distinct) > 0.98 * n_rows]
+    else:
+        id_like = [col for col in df.columns if df[col].nunique(dropna=False) > 0.98 * n_rows]
 
     return {
         "id_like_columns": id_like,
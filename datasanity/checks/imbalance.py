@@ -1,31 +1,75 @@
+import numpy as np
 import pandas as pd
 
-def check_class_imbalance(df, target):
+from ..sketch import approx_nunique
+
+# The result stays this size however many rows or classes the target has.
+TOP_CLASSES = 20
+HISTOGRAM_BINS = 20
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def check_class_imbalance(df, target, profile=None, approx_distinct=None):
     if target not in df.columns:
         return {"error": "Target column not found."}
 
     y = df[target]
-    n = len(y)
-    nunique = int(y.nunique(dropna=False))
-
-    # --- Heuristics: is this more like regression? ---
-    # If many unique values (especially numeric), it's likely regression or should be binned.
+    if profile is not None:
+        nunique = int(profile[target].n_unique)
+    elif approx_distinct is not None:
+        nunique = approx_nunique(y, approx_distinct)
+    else:
+        nunique = int(y.nunique(dropna=False))
     is_numeric = pd.api.types.is_numeric_dtype(y)
 
+    if _likely_regression(nunique, len(y), is_numeric):
+        # Histogram and quantiles straight from the values; no value_counts.
+        values = y.to_numpy(dtype="float64", na_value=np.nan)
+        return _imbalance_result(None, nunique, is_numeric, values=values)
+    if isinstance(y.dtype, pd.CategoricalDtype):
+        # Break count ties by first appearance, as value_counts does for plain values.
+        codes, uniques = pd.factorize(y, use_na_sentinel=False)
+        counts = pd.Series(np.bincount(codes), index=pd.Index(uniques.to_numpy(dtype=object)))
+        counts = counts.sort_values(ascending=False, kind="stable")
+    else:
+        counts = y.value_counts(dropna=False)
+
+    return _imbalance_result(counts, nunique, is_numeric)
+
+
+def _likely_regression(nunique: int, n: int, is_numeric: bool) -> bool:
+    # If many unique values (especially numeric), it's likely regression or should be binned.
     # "Many classes" thresholds (tunable)
     many_unique_absolute = nunique > 15
     many_unique_relative = (nunique / max(n, 1)) > 0.05  # e.g., >5% unique of rows
-    likely_regression = is_numeric and (many_unique_absolute or many_unique_relative)
+    return is_numeric and (many_unique_absolute or many_unique_relative)
+
+
+def _imbalance_result(counts, nunique: int, is_numeric: bool, values=None) -> dict:
+    """
+    Build the imbalance result from raw target value counts (NaN included),
+    sorted by count. A regression-like target may instead pass its values
+    as a float array (counts=None). Shared by the in-memory and the
+    streaming path.
 
-    # Distribution (still useful even for numeric target, but could be huge)
-    counts = y.value_counts(normalize=True, dropna=False)
+    "distribution" holds the TOP_CLASSES most frequent classes and an
+    "other" share for the rest, or, for a continuous target, the shares of
+    HISTOGRAM_BINS equal-width bins; "quantiles" summarises the latter.
+    """
+    if counts is not None and pd.api.types.is_extension_array_dtype(counts.index.dtype) \
+            and pd.api.types.is_integer_dtype(counts.index.dtype):
+        # Nullable ints (e.g. compacted reads): same keys as the float column they came from.
+        counts.index = counts.index.astype("float64")
+    n = int(counts.sum()) if counts is not None else len(values)
 
     warning = None
     recommendation = None
     task_hint = "classification"
+    summary = {}
 
-    if likely_regression:
+    if _likely_regression(nunique, n, is_numeric):
         task_hint = "regression"
+        summary = _numeric_summary(counts, values, n)
         recommendation = (
             "Target looks continuous / high-cardinality. Consider regression, "
             "or bin the target into fewer groups before classification."
@@ -33,11 +77,12 @@ def check_class_imbalance(df, target):
         # Not a "class imbalance" issue per se, but it's still a modeling warning
         warning = "Target likely better treated as regression (or binned classification)."
     else:
+        summary = _class_summary(counts, n)
         # Standard imbalance warning for classification-like targets
         if nunique > 50:
             warning = "High number of classes. Consider binning/label grouping."
             recommendation = "Reduce class cardinality (binning) or revisit target definition."
-        elif counts.min() < 0.1:
+        elif counts.min() / max(n, 1) < 0.1:
             warning = "Severe class imbalance detected."
             recommendation = (
                 "Consider stratified split, class weights, resampling, and metrics like macro-F1."
@@ -50,7 +95,66 @@ def check_class_imbalance(df, target):
         "n_unique": nunique,
         "is_numeric": bool(is_numeric),
         "task_hint": task_hint,              # "classification" or "regression"
-        "distribution": counts.to_dict(),    # may be large; ok for now
+        **summary,
         "warning": warning,
         "recommendation": recommendation,
     }
+
+
+def _class_summary(counts, n: int) -> dict:
+    """Shares of the TOP_CLASSES most frequent classes, the rest pooled as "other"."""
+    top = counts.iloc[:TOP_CLASSES]
+    rest = counts.iloc[TOP_CLASSES:]
+    other = {"classes": int(len(rest)), "count": int(rest.sum()), "share": float(rest.sum() / max(n, 1))}
+    return {
+        "distribution": (top / max(n, 1)).to_dict(),
+        "class_counts": {k: int(v) for k, v in top.items()},
+        "other": other if len(rest) else None,
+        "minority_share": float(counts.min() / max(n, 1)) if n else None,
+    }
+
+
+def _numeric_summary(counts, values, n: int) -> dict:
+    """
+    Equal-width histogram and quantiles of a continuous target, from its
+    values or from (value, count) pairs; both give the same numbers.
+    """
+    if values is not None:
+        x, w = values, None
+        n_missing = int(np.isnan(x).sum())
+        n_infinite = int(np.isinf(x).sum())
+    else:
+        x = counts.index.to_numpy(dtype="float64", na_value=np.nan)
+        w = counts.to_numpy(dtype="float64")
+        n_missing = int(w[np.isnan(x)].sum())
+        n_infinite = int(w[np.isinf(x)].sum())
+    finite = np.isfinite(x)
+    if n_missing or n_infinite:
+        x = x[finite]
+        w = w[finite] if w is not None else None
+    if len(x) == 0:
+        return {"distribution": {}, "histogram": None, "quantiles": {},
+                "n_missing": n_missing, "n_infinite": n_infinite}
+
+    lo, hi = float(x.min()), float(x.max())
+    edges = np.linspace(lo, hi, HISTOGRAM_BINS + 1) if hi > lo else np.array([lo, hi])
+    hist, edges = np.histogram(x, bins=edges, weights=w)
+    if w is None:
+        # Inverted-CDF quantiles are what the weighted form below gives, so
+        # the in-memory and streaming paths agree exactly.
+        qs = np.quantile(x, QUANTILES, method="inverted_cdf")
+    else:
+        order = np.argsort(x, kind="stable")
+        cum = np.cumsum(w[order])
+        idx = np.searchsorted(cum, np.asarray(QUANTILES) * cum[-1], side="left")
+        qs = x[order][np.minimum(idx, len(cum) - 1)]
+
+    labels = [f"[{a:.4g}, {b:.4g}" + (")" if i < len(hist) - 1 else "]")
+              for i, (a, b) in enumerate(zip(edges[:-1], edges[1:]))]
+    return {
+        "distribution": {label: float(c / max(n, 1)) for label, c in zip(labels, hist)},
+        "histogram": {"edges": [float(e) for e in edges], "counts": [int(c) for c in hist]},
+        "quantiles": {str(q): float(v) for q, v in zip(QUANTILES, qs)},
+        "n_missing": n_missing,
+        "n_infinite": n_infinite,
+    }
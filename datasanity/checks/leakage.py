@@ -1,15 +1,270 @@
 import numpy as np
+import pandas as pd
 
-def check_target_leakage(df, target):
-    numeric_df = df.select_dtypes(include=np.number)
+from .association import association_candidates, target_associations
 
-    if target not in numeric_df.columns:
+# Columns per block in target_correlations; bounds the float64 copy to
+# n_rows * BLOCK_COLUMNS values at a time.
+BLOCK_COLUMNS = 256
+
+
+def check_target_leakage(df, target, profile=None, method: str = "pearson", categorical: bool = True):
+    """
+    Flag features that look like they leak the target.
+
+    Numeric features vs a numeric target: |correlation| > 0.95.
+    With `categorical` (default) every feature, categorical or numeric, is
+    also scored with Cramér's V / mutual information on contingency tables
+    (sampled adaptively, see target_associations), which catches leaky
+    categorical columns and non-linear relationships.
+    """
+    if target not in df.columns:
         return {"suspicious_features": []}
 
-    corrs = numeric_df.corr(numeric_only=True)[target].abs().sort_values(ascending=False)
+    if profile is not None:
+        numeric = profile.names("numeric")
+    else:
+        numeric = df.select_dtypes(include=np.number).columns.tolist()
+
+    corrs = pd.Series(dtype="float64")
+    if target in numeric:
+        features = [c for c in numeric if c != target]
+        corrs = target_correlations(df, target, features, method=method)
+
+    associations = None
+    if categorical:
+        candidates = association_candidates(df, target, profile)
+        associations = target_associations(df, target, candidates, profile)
+    elif target not in numeric:
+        return {"suspicious_features": []}
+    return _leakage_result(corrs, target, associations)
+
+
+def target_correlations(df, target, columns, method: str = "pearson", block_size: int = BLOCK_COLUMNS) -> pd.Series:
+    """
+    Correlation of each column with the target only (not the full p x p
+    matrix DataFrame.corr builds). Columns are processed in blocks of
+    `block_size`; NaN is handled pairwise like DataFrame.corr.
+    method: "pearson" or "spearman" (Pearson on average ranks, ranked over
+    the rows where both the column and the target are present).
+    """
+    if method not in ("pearson", "spearman"):
+        raise ValueError("method must be 'pearson' or 'spearman'.")
+    columns = list(columns)
+    y = df[target].to_numpy(dtype="float64", na_value=np.nan)
+
+    parts = []
+    for start in range(0, len(columns), block_size):
+        block = columns[start:start + block_size]
+        X = df[block].to_numpy(dtype="float64", na_value=np.nan)
+        if method == "spearman":
+            parts.append(_spearman_block(block, X, y))
+        else:
+            parts.append(CorrelationMoments.from_arrays(block, X, y).correlations())
+    if not parts:
+        return pd.Series(dtype="float64")
+    return pd.concat(parts)
+
+
+def _centred(A: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """A minus its column means over the masked values; 0 outside the mask."""
+    mean = np.where(mask, A, 0.0).sum(axis=0) / np.maximum(mask.sum(axis=0), 1)
+    return np.where(mask, A - mean, 0.0)
+
+
+def target_correlation_matrix(df, targets, columns, block_size: int = BLOCK_COLUMNS) -> pd.DataFrame:
+    """
+    Pearson correlation of every column with every target (targets x
+    columns), NaN handled pairwise like DataFrame.corr. Columns are
+    centred once and each block of `block_size` columns is one matrix
+    product against all targets; with missing values the pairwise counts,
+    sums and squares are masked products as well.
+    """
+    targets, columns = list(targets), list(columns)
+    Y = df[targets].to_numpy(dtype="float64", na_value=np.nan)
+    y_mask = ~np.isnan(Y)
+    Y0 = _centred(Y, y_mask)
+    My = y_mask.astype("float64")
+
+    parts = []
+    for start in range(0, len(columns), block_size):
+        block = columns[start:start + block_size]
+        X = df[block].to_numpy(dtype="float64", na_value=np.nan)
+        x_mask = ~np.isnan(X)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if x_mask.all() and y_mask.all():
+                # Same rows for every pair: unit-norm centred columns, one product.
+                X0 = X - X.mean(axis=0)
+                nx = np.sqrt(np.einsum("ij,ij->j", X0, X0))
+                ny = np.sqrt(np.einsum("ij,ij->j", Y0, Y0))
+                r = (Y0 / ny).T @ (X0 / nx)
+                r[:, nx == 0] = np.nan
+                r[ny == 0, :] = np.nan
+            else:
+                X0 = _centred(X, x_mask)
+                Mx = x_mask.astype("float64")
+                n = My.T @ Mx
+                sx, sy = My.T @ X0, Y0.T @ Mx
+                vx = My.T @ (X0 * X0) - sx * sx / n
+                vy = (Y0 * Y0).T @ Mx - sy * sy / n
+                cov = Y0.T @ X0 - sx * sy / n
+                r = np.where((vx > 0) & (vy > 0) & (n > 1), cov / np.sqrt(vx * vy), np.nan)
+        parts.append(pd.DataFrame(np.clip(r, -1.0, 1.0), index=targets, columns=block))
+    if not parts:
+        return pd.DataFrame(index=targets, dtype="float64")
+    return pd.concat(parts, axis=1)
+
+
+def _rank(a: np.ndarray) -> np.ndarray:
+    if a.ndim == 1:
+        return pd.Series(a).rank(method="average").to_numpy()
+    return pd.DataFrame(a).rank(method="average").to_numpy()
+
+
+def _spearman_block(columns, X: np.ndarray, y: np.ndarray) -> pd.Series:
+    keep = ~np.isnan(y)
+    X, y = X[keep], y[keep]
+    has_nan = np.isnan(X).any(axis=0)
+
+    out = pd.Series(np.nan, index=columns, dtype="float64")
+    full = ~has_nan
+    if full.any():
+        # Same rows for every column: rank the target once.
+        ranks = _rank(X[:, full])
+        m = CorrelationMoments.from_arrays(np.asarray(columns)[full], ranks, _rank(y))
+        out[full] = m.correlations().to_numpy()
+    for j in np.flatnonzero(has_nan):
+        # Pairwise-complete rows differ per column, so rank both on them.
+        mask = ~np.isnan(X[:, j])
+        m = CorrelationMoments.from_arrays([columns[j]], _rank(X[mask, j])[:, None], _rank(y[mask]))
+        out.iloc[j] = m.correlations().iloc[0]
+    return out
+
+
+def _leakage_result(corrs, target, associations=None, threshold: float = 0.9) -> dict:
+    """
+    Build the leakage result from correlations of every numeric column with
+    the target and (optionally) association scores of every feature.
+    """
+    corrs = corrs.abs().sort_values(ascending=False)
     suspicious = [col for col in corrs.index if col != target and corrs[col] > 0.95]
 
-    return {
+    out = {
         "suspicious_features": suspicious,
         "warning": "Possible target leakage detected." if suspicious else None
     }
+    if associations is not None:
+        strong = sorted(
+            (col for col, a in associations.items() if a["cramers_v"] > threshold),
+            key=lambda col: -associations[col]["cramers_v"],
+        )
+        suspicious += [col for col in strong if col not in suspicious]
+        out["warning"] = "Possible target leakage detected." if suspicious else None
+        out["associations"] = {col: associations[col] for col in strong}
+    return out
+
+
+class CorrelationMoments:
+    """
+    Mergeable pairwise moments of numeric columns against the target.
+
+    Keeps, per column, the count, means, sums of squared deviations and
+    co-deviation over rows where both the column and the target are
+    non-null (the same pairwise NaN handling as DataFrame.corr).
+    Chunks are combined with Chan's parallel update, so the result does
+    not depend on how the data was split.
+    """
+
+    def __init__(self, columns=()):
+        self.columns = list(columns)
+        p = len(self.columns)
+        self.n = np.zeros(p)
+        self.mean_x = np.zeros(p)
+        self.mean_y = np.zeros(p)
+        self.m2_x = np.zeros(p)
+        self.m2_y = np.zeros(p)
+        self.c_xy = np.zeros(p)
+
+    @classmethod
+    def from_arrays(cls, columns, X: np.ndarray, y: np.ndarray) -> "CorrelationMoments":
+        """Moments of a 2D float block X (rows x columns) against the 1D target y."""
+        m = cls(columns)
+        if X.size == 0:
+            return m
+        x_nan, y_nan = np.isnan(X), np.isnan(y)
+        if not x_nan.any() and not y_nan.any():
+            # No missing values: plain centred sums, no masking temporaries.
+            m.n = np.full(X.shape[1], float(len(y)))
+            m.mean_x, m.mean_y = X.mean(axis=0), np.full(X.shape[1], y.mean())
+            dx = X - m.mean_x
+            dy = y - y.mean()
+            m.m2_x = np.einsum("ij,ij->j", dx, dx)
+            m.m2_y = np.full(X.shape[1], dy @ dy)
+            m.c_xy = dy @ dx
+            return m
+
+        mask = ~x_nan & ~y_nan[:, None]
+        n = mask.sum(axis=0).astype("float64")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x = np.where(mask, X, 0.0).sum(axis=0) / n
+            mean_y = np.where(mask, y[:, None], 0.0).sum(axis=0) / n
+        mean_x = np.nan_to_num(mean_x)
+        mean_y = np.nan_to_num(mean_y)
+        dx = np.where(mask, X - mean_x, 0.0)
+        dy = np.where(mask, y[:, None] - mean_y, 0.0)
+
+        m.n = n
+        m.mean_x, m.mean_y = mean_x, mean_y
+        m.m2_x = (dx * dx).sum(axis=0)
+        m.m2_y = (dy * dy).sum(axis=0)
+        m.c_xy = (dx * dy).sum(axis=0)
+        return m
+
+    @classmethod
+    def from_frame(cls, df, target, columns=None) -> "CorrelationMoments":
+        columns = list(df.columns) if columns is None else list(columns)
+        X = df[columns].to_numpy(dtype="float64", na_value=np.nan)
+        y = df[target].to_numpy(dtype="float64", na_value=np.nan)
+        return cls.from_arrays(columns, X, y)
+
+    def _aligned(self, columns):
+        idx = {c: i for i, c in enumerate(self.columns)}
+        out = CorrelationMoments(columns)
+        for j, c in enumerate(columns):
+            i = idx.get(c)
+            if i is None:
+                continue
+            out.n[j] = self.n[i]
+            out.mean_x[j], out.mean_y[j] = self.mean_x[i], self.mean_y[i]
+            out.m2_x[j], out.m2_y[j], out.c_xy[j] = self.m2_x[i], self.m2_y[i], self.c_xy[i]
+        return out
+
+    def merge(self, other: "CorrelationMoments") -> "CorrelationMoments":
+        columns = self.columns + [c for c in other.columns if c not in set(self.columns)]
+        a = self if columns == self.columns else self._aligned(columns)
+        b = other if columns == other.columns else other._aligned(columns)
+
+        out = CorrelationMoments(columns)
+        n = a.n + b.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            w = np.where(n > 0, a.n * b.n / n, 0.0)
+            f = np.where(n > 0, b.n / n, 0.0)
+        d_x = b.mean_x - a.mean_x
+        d_y = b.mean_y - a.mean_y
+        out.n = n
+        out.mean_x = a.mean_x + d_x * f
+        out.mean_y = a.mean_y + d_y * f
+        out.m2_x = a.m2_x + b.m2_x + d_x * d_x * w
+        out.m2_y = a.m2_y + b.m2_y + d_y * d_y * w
+        out.c_xy = a.c_xy + b.c_xy + d_x * d_y * w
+        return out
+
+    def drop(self, columns) -> "CorrelationMoments":
+        drop = set(columns)
+        return self._aligned([c for c in self.columns if c not in drop])
+
+    def correlations(self) -> pd.Series:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            denom = np.sqrt(self.m2_x * self.m2_y)
+            r = np.where(denom > 0, self.c_xy / denom, np.nan)
+        return pd.Series(np.clip(r, -1.0, 1.0), index=self.columns, dtype="float64")
@@ -1,5 +1,5 @@
-def check_missing_values(df):
-    missing = df.isnull().mean()
+def check_missing_values(df, profile=None):
+    missing = profile.null_fractions() if profile is not None else df.isnull().mean()
     high_missing = missing[missing > 0.3].sort_values(ascending=False)
 
     return {
@@ -2,12 +2,17 @@ from __future__ import annotations
 import pandas as pd
 
 
-def _count_feature_types(df: pd.DataFrame, target: str | None = None) -> dict:
-    X = df.drop(columns=[target], errors="ignore") if target else df
-    n_cols = X.shape[1]
+def _count_feature_types(df: pd.DataFrame, target: str | None = None, profile=None) -> dict:
+    if profile is not None:
+        num_cols = [c for c in profile.names("numeric", "bool") if c != target]
+        cat_cols = [c for c in profile.names("categorical") if c != target]
+        n_cols = len(num_cols) + len(cat_cols)
+    else:
+        X = df.drop(columns=[target], errors="ignore") if target else df
+        n_cols = X.shape[1]
 
-    num_cols = X.select_dtypes(include=["number", "bool"]).columns.tolist()
-    cat_cols = X.select_dtypes(exclude=["number", "bool"]).columns.tolist()
+        num_cols = X.select_dtypes(include=["number", "bool"]).columns.tolist()
+        cat_cols = X.select_dtypes(exclude=["number", "bool"]).columns.tolist()
 
     # bool tretiramo kao numeric-ish
     return {
@@ -20,13 +25,34 @@ def _count_feature_types(df: pd.DataFrame, target: str | None = None) -> dict:
     }
 
 
-def suggest_models(df: pd.DataFrame, target: str, results: dict) -> dict:
+def _without_target(feat: dict, target: str) -> dict:
+    """Feature types of all columns (target=None) narrowed to the features of one target."""
+    num_cols = [c for c in feat["numeric_cols"] if c != target]
+    cat_cols = [c for c in feat["categorical_cols"] if c != target]
+    n_cols = len(num_cols) + len(cat_cols)
+    return {
+        "n_features": n_cols,
+        "n_numeric": len(num_cols),
+        "n_categorical": len(cat_cols),
+        "numeric_cols": num_cols,
+        "categorical_cols": cat_cols,
+        "cat_ratio": (len(cat_cols) / n_cols) if n_cols else 0.0,
+    }
+
+
+def suggest_models(df: pd.DataFrame, target: str, results: dict, profile=None, feature_types=None) -> dict:
     """
     Returns a ranked list of model suggestions and a baseline recipe.
     Uses dataset shape + feature types + earlier checks.
+    If a column profile is given, shape and feature types are read from it;
+    feature_types (_count_feature_types of all columns, target=None) saves
+    recounting them when the same table is checked against many targets.
     """
-    n_rows = df.shape[0]
-    feat = _count_feature_types(df, target)
+    n_rows = profile.n_rows if profile is not None else df.shape[0]
+    if feature_types is not None:
+        feat = _without_target(feature_types, target)
+    else:
+        feat = _count_feature_types(df, target, profile)
 
     imb = results.get("imbalance", {}) or {}
     task = imb.get("task_hint", "classification")
@@ -37,6 +63,15 @@ def suggest_models(df: pd.DataFrame, target: str, results: dict) -> dict:
 
     imbalance_warning = bool(imb.get("warning"))
 
+    dist = results.get("numeric_distribution", {}) or {}
+    target_dist = dist.get("target") or {}
+    log_target = bool(target_dist.get("log_transform"))
+    outlier_heavy = bool(dist.get("outlier_columns"))
+    time_col = (results.get("temporal", {}) or {}).get("time_column")
+    time_format = (results.get("temporal", {}) or {}).get("time_format")
+    groups = results.get("groups", {}) or {}
+    group_col = groups.get("group_column") if groups.get("risk") == "high" else None
+
     suggestions = []
 
     def add(name: str, why: list[str], when: list[str], notes: list[str] | None = None):
@@ -142,7 +177,8 @@ def suggest_models(df: pd.DataFrame, target: str, results: dict) -> dict:
             ],
             notes=[
                 "Evaluate with MAE and RMSE.",
-                "Consider log-transform if target has heavy tails."
+                "Target is right-skewed: fit on log1p(target) and invert predictions with expm1."
+                if log_target else "Target is not heavy-tailed enough to need a log-transform."
             ]
         )
 
@@ -156,7 +192,8 @@ def suggest_models(df: pd.DataFrame, target: str, results: dict) -> dict:
                 "Smaller datasets or mostly linear relationships."
             ],
             notes=[
-                "Standardize numerical features before training."
+                "Use RobustScaler: several features have many outliers." if outlier_heavy
+                else "Standardize numerical features before training."
             ]
         )
 
@@ -185,6 +222,19 @@ def suggest_models(df: pd.DataFrame, target: str, results: dict) -> dict:
                 "Train baselines: Ridge, RF, then XGBoost/LightGBM",
             ],
         }
+        if log_target:
+            baseline["pipeline"].insert(3, "Log-transform the target (log1p); invert predictions with expm1")
+
+    if time_col:
+        baseline["split"] = f"Time-based split on '{time_col}' (train on the past, validate on the latest rows)"
+        baseline["pipeline"].insert(1, f"Drop the raw timestamp '{time_col}' (derive calendar features if useful)")
+    if group_col:
+        baseline["split"] = (
+            f"Group split on '{group_col}' in time order: whole groups, the ones starting latest in '{time_col}' "
+            "validate" if time_col else
+            f"Group split on '{group_col}' (GroupShuffleSplit / GroupKFold): no group in both train and validation"
+        )
+        baseline["pipeline"].insert(1, f"Drop '{group_col}' from the features; use it only to split")
 
     # Simple ranking heuristic: prefer trees when many categoricals or more rows
     def score_suggestion(s):
@@ -219,4 +269,8 @@ def suggest_models(df: pd.DataFrame, target: str, results: dict) -> dict:
         },
         "top_models": suggestions[:3],
         "baseline_plan": baseline,
+        "log_target": log_target,
+        "time_column": time_col,
+        "time_format": time_format if time_col else None,
+        "group_column": group_col,
     }
@@ -11,6 +11,9 @@ def compute_dataset_severity(results: dict) -> dict:
     ids = results.get("id_columns", {})
     leakage = results.get("leakage", {})
     duplicates = results.get("duplicates", {})
+    dist = results.get("numeric_distribution", {}) or {}
+    temporal = results.get("temporal", {}) or {}
+    groups = results.get("groups", {}) or {}
 
     # --- Class imbalance ---
     if imbalance.get("warning"):
@@ -37,6 +40,30 @@ def compute_dataset_severity(results: dict) -> dict:
         score += 10
         reasons.append("Duplicate rows detected")
 
+    # --- Numeric distributions ---
+    if dist.get("infinite_columns"):
+        score += 15
+        reasons.append("Infinite values in numeric columns")
+    if dist.get("outlier_columns"):
+        score += 5
+        reasons.append("Outlier-heavy numeric features")
+
+    # --- Time ---
+    if temporal.get("after_event_columns"):
+        score += 20
+        reasons.append("Timestamps recorded after the event")
+    if temporal.get("lockstep_features"):
+        score += 10
+        reasons.append("Features that move in lockstep with time")
+
+    # --- Groups ---
+    if groups.get("risk") == "high":
+        score += 20
+        reasons.append("Repeated groups leak under a random split")
+    elif groups.get("risk") == "moderate":
+        score += 10
+        reasons.append("Repeated groups partly leak under a random split")
+
     # Cap score at 100
     score = min(score, 100)
 
@@ -0,0 +1,504 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+from .leakage import CorrelationMoments
+
+# A column is a time column when SAMPLE_ROWS of its non-null values (taken
+# from the first SCAN_ROWS rows) parse as dates at PARSE_RATE or better.
+SAMPLE_ROWS = 1_000
+SCAN_ROWS = 100_000
+PARSE_RATE = 0.95
+# Cheap pre-filter before parsing: digits separated like a date.
+DATE_PATTERN = r"^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}"
+
+# Rows are counted in hourly buckets, daily ones for spans over ~30 years;
+# reports use the finest unit that gives at most MAX_PERIODS periods.
+MAX_HOUR_BUCKETS = 1 << 18
+UNITS = ("h", "D", "W", "M", "Y")
+UNIT_NAMES = {"h": "hour", "D": "day", "W": "week", "M": "month", "Y": "year"}
+MAX_PERIODS = 200
+BLOCK_COLUMNS = 256
+
+# Distinct values of a non-numeric target counted per period; later ones
+# share an "other" count.
+MAX_TARGET_LEVELS = 20
+
+MIN_PERIOD_ROWS = 30        # periods with fewer rows are left out of the trend
+TREND_CORR = 0.7            # |corr(period, target rate)| above this: target drifts
+LOCKSTEP_CORR = 0.95        # |corr(feature, time)| above this: feature tracks time
+AFTER_EVENT_SHARE = 0.95    # share of rows where another timestamp is later
+GAP_SHARE = 0.1             # share of empty periods worth a warning
+
+
+def check_temporal(df, target=None, profile=None):
+    """
+    Time structure of the table: detects timestamp columns (datetime dtypes,
+    or strings whose sample parses as dates), then per time column its
+    coverage, empty periods and whether rows arrive in time order, and for
+    the main one (most non-null values) the target rate per period,
+    features that move in lockstep with it and other timestamps that are
+    always later (recorded after the event).
+
+    Rows are counted into period buckets with np.bincount, so nothing is
+    sorted; the state is mergeable (see TemporalState) for streaming.
+    """
+    if profile is not None:
+        classes = {c: profile[c].dtype_class for c in df.columns if c in profile}
+    else:
+        from ..profile import _dtype_classes
+
+        classes = _dtype_classes(df)
+    return TemporalState().update(df, target, classes).result()
+
+
+def check_temporal_multi(df, targets, profile=None) -> dict:
+    """
+    {target: check_temporal(df, target)}: time columns are detected and
+    parsed, and feature-vs-time moments computed, once for all targets.
+    """
+    from ..profile import _dtype_classes
+
+    classes = {c: profile[c].dtype_class for c in df.columns} if profile is not None else _dtype_classes(df)
+    shared = TemporalState()
+    shared.fit(df, None, classes)
+    times = {c: epoch_seconds(df[c], fmt) for c, fmt in shared.formats.items()}
+    shared._add_frame(df, [c for c in df.columns if classes[c] == "numeric"], times)
+
+    out = {}
+    for target in targets:
+        state = TemporalState()
+        state.formats = {c: fmt for c, fmt in shared.formats.items() if c != target}
+        y = None
+        if target in df.columns:
+            state.numeric_target = classes[target] in ("numeric", "bool")
+            y = df[target]
+        state.add_rows({c: t for c, t in times.items() if c != target}, y)
+        state.lockstep = {c: m.drop([target]) for c, m in shared.lockstep.items() if c != target}
+        out[target] = state.result()
+    return out
+
+
+def _head_values(s: pd.Series) -> pd.Series:
+    head = s.iloc[:SCAN_ROWS]
+    return head[head.notna()].iloc[:SAMPLE_ROWS]
+
+
+def detect_time_format(s: pd.Series):
+    """
+    How to parse a column as timestamps: "native" for datetime dtypes, a
+    strptime format (or "mixed") for date-like strings, None otherwise.
+    """
+    dtype = s.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return detect_time_format(pd.Series(dtype.categories))
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "native"
+    if not (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+        return None
+    values = _head_values(s).astype(str)
+    if len(values) == 0 or values.str.match(DATE_PATTERN).mean() < PARSE_RATE:
+        return None
+    from pandas.tseries.api import guess_datetime_format
+
+    # Day-first strings ("31/01/2020") get a month-first guess; try both and
+    # keep the explicit format that parses more, "mixed" only if neither does.
+    guesses = [guess_datetime_format(values.iloc[0], dayfirst=d) for d in (False, True)]
+    rates = {fmt: _parse_rate(values, fmt) for fmt in dict.fromkeys(g for g in guesses if g)}
+    if rates:
+        best = max(rates, key=rates.get)
+        if rates[best] >= PARSE_RATE:
+            return best
+    return "mixed" if _parse_rate(values, "mixed") >= PARSE_RATE else None
+
+
+def _parse_rate(values: pd.Series, fmt: str) -> float:
+    return pd.to_datetime(values, format=fmt, errors="coerce", utc=True).notna().mean()
+
+
+def epoch_seconds(s: pd.Series, fmt: str) -> tuple:
+    """(int64 seconds since 1970 in UTC, valid mask) of a time column."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # Parse each category once and look the rows up by code.
+        seconds, valid = epoch_seconds(pd.Series(s.dtype.categories), fmt)
+        codes = s.cat.codes.to_numpy()
+        present = codes >= 0
+        codes = np.where(present, codes, 0)
+        return seconds[codes], present & valid[codes]
+    if fmt == "native":
+        t = s if s.dt.tz is None else s.dt.tz_convert("UTC").dt.tz_localize(None)
+    else:
+        t = pd.to_datetime(s, format=fmt, errors="coerce", utc=True).dt.tz_localize(None)
+    valid = t.notna().to_numpy()
+    seconds = t.dt.as_unit("s").to_numpy().view("int64")
+    return np.where(valid, seconds, 0), valid
+
+
+def _period_codes(start: int, n: int, base: str, unit: str) -> np.ndarray:
+    """Period (in `unit`) of each of n consecutive `base` buckets from `start`."""
+    codes = np.arange(start, start + n, dtype="int64")
+    if unit == base:
+        return codes
+    return codes.astype(f"datetime64[{base}]").astype(f"datetime64[{unit}]").astype("int64")
+
+
+def _label(code: int, unit: str) -> str:
+    return str(np.datetime64(int(code), unit))
+
+
+def _rebucket(start, counts, target, base, unit) -> tuple:
+    """(first period, counts, target sums) of base buckets regrouped into `unit` periods."""
+    codes = _period_codes(start, len(counts), base, unit)
+    first = int(codes[0])
+    k = codes - first
+    n = int(k[-1]) + 1
+    out = np.bincount(k, weights=counts, minlength=n).astype("int64")
+    table = np.zeros((n, target.shape[1]))
+    for j in range(target.shape[1]):
+        table[:, j] = np.bincount(k, weights=target[:, j], minlength=n)
+    return first, out, table
+
+
+class TimeBuckets:
+    """
+    Mergeable row counts and target sums of one time column per hourly
+    bucket (daily when the span is over MAX_HOUR_BUCKETS hours), plus its
+    range, missing count and whether the rows came in time order.
+    """
+
+    def __init__(self):
+        self.unit = "h"
+        self.start = 0
+        self.counts = np.zeros(0, dtype="int64")
+        self.target = np.zeros((0, 0))          # per bucket: [sum, count] or per-level counts
+        self.n_rows = 0
+        self.n_missing = 0
+        self.min = self.max = self.first = self.last = None   # epoch seconds
+        self.ordered = True
+
+    @classmethod
+    def from_arrays(cls, seconds: np.ndarray, valid: np.ndarray, y=None, width: int = 0) -> "TimeBuckets":
+        """
+        Buckets of one column. y is a float array (numeric target, summed),
+        an int array of level codes (-1 = missing, counted per code, `width`
+        codes), or None.
+        """
+        b = cls()
+        b.n_rows = len(seconds)
+        b.n_missing = int(b.n_rows - valid.sum())
+        s = seconds[valid]
+        if len(s) == 0:
+            return b
+        b.min, b.max = int(s.min()), int(s.max())
+        b.first, b.last = int(s[0]), int(s[-1])
+        b.ordered = bool((s[1:] >= s[:-1]).all())
+        b.unit = "h" if b.max // 3600 - b.min // 3600 < MAX_HOUR_BUCKETS else "D"
+        codes = s // (3600 if b.unit == "h" else 86400)
+        b.start = int(codes.min())
+        k = codes - b.start
+        n = int(k.max()) + 1
+        b.counts = np.bincount(k, minlength=n)
+        if y is None:
+            b.target = np.zeros((n, 0))
+        elif y.dtype.kind == "f":
+            v = y[valid]
+            finite = np.isfinite(v)
+            b.target = np.column_stack([
+                np.bincount(k[finite], weights=v[finite], minlength=n),
+                np.bincount(k[finite], minlength=n).astype("float64"),
+            ])
+        else:
+            c = y[valid]
+            seen = c >= 0
+            b.target = np.bincount(k[seen] * width + c[seen], minlength=n * width).reshape(n, width).astype("float64")
+        return b
+
+    def _as_unit(self, unit: str) -> tuple:
+        if unit == self.unit:
+            return self.start, self.counts, self.target
+        return _rebucket(self.start, self.counts, self.target, self.unit, unit)
+
+    def merge(self, other: "TimeBuckets") -> "TimeBuckets":
+        """Buckets of self's rows followed by other's."""
+        out = TimeBuckets()
+        out.n_rows = self.n_rows + other.n_rows
+        out.n_missing = self.n_missing + other.n_missing
+        seen = [b for b in (self, other) if b.min is not None]
+        if not seen:
+            return out
+        out.min = min(b.min for b in seen)
+        out.max = max(b.max for b in seen)
+        out.first, out.last = seen[0].first, seen[-1].last
+        out.ordered = all(b.ordered for b in seen) and (len(seen) == 1 or self.last <= other.first)
+        wide = out.max // 3600 - out.min // 3600 >= MAX_HOUR_BUCKETS
+        out.unit = "D" if wide or any(b.unit == "D" for b in seen) else "h"
+
+        parts = [b._as_unit(out.unit) for b in seen]
+        out.start = min(p[0] for p in parts)
+        n = max(p[0] + len(p[1]) for p in parts) - out.start
+        width = max(p[2].shape[1] for p in parts)
+        out.counts = np.zeros(n, dtype="int64")
+        out.target = np.zeros((n, width))
+        for start, counts, target in parts:
+            i = start - out.start
+            out.counts[i:i + len(counts)] += counts
+            out.target[i:i + len(counts), :target.shape[1]] += target
+        return out
+
+    def summary(self) -> dict:
+        """Range, coverage and gaps, in the finest unit with at most MAX_PERIODS periods."""
+        if self.min is None:
+            return {"n_rows": self.n_rows, "n_missing": self.n_missing, "min": None, "max": None}
+        unit = self.display_unit()
+        first, counts, _ = self._as_unit(unit)
+        filled = np.flatnonzero(counts)
+        gaps = np.diff(filled) - 1
+        largest = None
+        if len(gaps) and gaps.max() > 0:
+            i = int(np.argmax(gaps))
+            largest = {
+                "periods": int(gaps[i]),
+                "from": _label(first + filled[i] + 1, unit),
+                "to": _label(first + filled[i + 1] - 1, unit),
+            }
+        return {
+            "n_rows": self.n_rows,
+            "n_missing": self.n_missing,
+            "min": str(np.datetime64(self.min, "s")),
+            "max": str(np.datetime64(self.max, "s")),
+            "span_days": round((self.max - self.min) / 86400, 2),
+            "ordered": self.ordered,
+            "period": UNIT_NAMES[unit],
+            "n_periods": len(counts),
+            "empty_periods": int((counts == 0).sum()),
+            "largest_gap": largest,
+            "rows_per_period": {"min": int(counts.min()), "median": float(np.median(counts)),
+                                "max": int(counts.max())},
+        }
+
+    def display_unit(self) -> str:
+        for unit in UNITS[UNITS.index(self.unit):]:
+            codes = _period_codes(self.start, len(self.counts), self.unit, unit)
+            if codes[-1] - codes[0] + 1 <= MAX_PERIODS:
+                return unit
+        return UNITS[-1]
+
+
+class TemporalState:
+    """
+    Mergeable state of the temporal check: time columns and their parse
+    format (detected on the first chunk), TimeBuckets per time column,
+    correlation moments of every numeric feature against each time column,
+    and per pair of time columns how often one is later than the other.
+    """
+
+    def __init__(self):
+        self.formats = None                     # time column -> format for epoch_seconds
+        self.numeric_target = None
+        self.levels = []                        # tracked values of a non-numeric target
+        self.buckets = {}                       # time column -> TimeBuckets
+        self.lockstep = {}                      # time column -> CorrelationMoments vs days
+        self.later = {}                         # (a, b) -> [rows with b after a, rows with both]
+
+    def fit(self, df: pd.DataFrame, target, classes: dict) -> None:
+        """Detect the time columns (and target kind) on the first chunk."""
+        self.formats = {}
+        for col in df.columns:
+            if col == target:
+                continue
+            fmt = detect_time_format(df[col])
+            if fmt is not None:
+                self.formats[col] = fmt
+        if target is not None and target in df.columns:
+            self.numeric_target = classes[target] in ("numeric", "bool")
+
+    def _target_codes(self, y: pd.Series) -> tuple:
+        if self.numeric_target:
+            return y.to_numpy(dtype="float64", na_value=np.nan), 2
+        present = y.notna().to_numpy()
+        if len(self.levels) < MAX_TARGET_LEVELS:
+            known = set(self.levels)
+            new = [v for v in pd.unique(y[present]) if v not in known]
+            self.levels += new[:MAX_TARGET_LEVELS - len(self.levels)]
+        # 0 = other, i + 1 = levels[i], -1 = missing.
+        codes = pd.Index(self.levels, dtype=object).get_indexer(y.astype(object)) + 1
+        return np.where(present, codes, -1), len(self.levels) + 1
+
+    def add_rows(self, times: dict, y: pd.Series | None) -> None:
+        """Fold in {time column: (seconds, valid)} of a chunk and its target."""
+        codes, width = (None, 0) if y is None else self._target_codes(y)
+        for col, (seconds, valid) in times.items():
+            chunk = TimeBuckets.from_arrays(seconds, valid, codes, width)
+            self.buckets[col] = self.buckets[col].merge(chunk) if col in self.buckets else chunk
+        for a, (sa, va) in times.items():
+            for b, (sb, vb) in times.items():
+                if a == b:
+                    continue
+                both = va & vb
+                counts = self.later.setdefault((a, b), [0, 0])
+                counts[0] += int((sb[both] > sa[both]).sum())
+                counts[1] += int(both.sum())
+
+    def add_features(self, columns, X: np.ndarray, days: dict) -> None:
+        """Fold in a float block X (rows x columns) against {time column: days since 1970, NaN if missing}."""
+        for col, t in days.items():
+            self.add_lockstep(col, CorrelationMoments.from_arrays(columns, X, t))
+
+    def add_lockstep(self, col, moments: CorrelationMoments) -> None:
+        self.lockstep[col] = self.lockstep[col].merge(moments) if col in self.lockstep else moments
+
+    def update(self, df: pd.DataFrame, target, classes: dict) -> "TemporalState":
+        if self.formats is None:
+            self.fit(df, target, classes)
+        times = {c: epoch_seconds(df[c], fmt) for c, fmt in self.formats.items() if c in df.columns}
+        y = df[target] if target is not None and target in df.columns and self.numeric_target is not None else None
+        self.add_rows(times, y)
+        self._add_frame(df, [c for c in df.columns if classes.get(c) == "numeric" and c != target], times)
+        return self
+
+    def _add_frame(self, df: pd.DataFrame, numeric, times: dict) -> None:
+        if not times:
+            return
+        days = {c: np.where(v, s / 86400.0, np.nan) for c, (s, v) in times.items()}
+        for start in range(0, len(numeric), BLOCK_COLUMNS):
+            block = numeric[start:start + BLOCK_COLUMNS]
+            self.add_features(block, df[block].to_numpy(dtype="float64", na_value=np.nan), days)
+
+    def merge(self, other: "TemporalState") -> "TemporalState":
+        if other.formats is None:
+            return self
+        if self.formats is None:
+            self.formats, self.numeric_target = {}, other.numeric_target
+        self.formats = {**other.formats, **self.formats}
+        remap = self._level_map(other.levels)
+        for col, b in other.buckets.items():
+            if remap is not None:
+                b = _remapped(b, remap, len(self.levels) + 1)
+            self.buckets[col] = self.buckets[col].merge(b) if col in self.buckets else b
+        for col, m in other.lockstep.items():
+            self.add_lockstep(col, m)
+        for pair, (n_later, n_both) in other.later.items():
+            counts = self.later.setdefault(pair, [0, 0])
+            counts[0] += n_later
+            counts[1] += n_both
+        return self
+
+    def _level_map(self, levels) -> np.ndarray | None:
+        """Column of each of other's level counts in self's (0 = other), adding new levels."""
+        if self.numeric_target or list(levels) == self.levels[:len(levels)]:
+            return None
+        index = {v: i for i, v in enumerate(self.levels)}
+        out = [0]
+        for v in levels:
+            if v not in index and len(self.levels) < MAX_TARGET_LEVELS:
+                index[v] = len(self.levels)
+                self.levels.append(v)
+            out.append(index[v] + 1 if v in index else 0)
+        return np.array(out)
+
+    def time_column(self):
+        """
+        The event time: the time column with the most non-null values (the
+        longest span on ties), or a well-filled column that is earlier than
+        it in almost every row (e.g. created_at rather than closed_at).
+        """
+        filled = {col: b.n_rows - b.n_missing for col, b in self.buckets.items() if b.min is not None}
+        if not filled:
+            return None
+        best = max(filled, key=lambda c: (filled[c], self.buckets[c].max - self.buckets[c].min))
+        for _ in range(len(filled)):
+            earlier = [c for c in filled if c != best and filled[c] >= filled[best] / 2
+                       and self._later_share(c, best) >= AFTER_EVENT_SHARE]
+            if not earlier:
+                break
+            best = max(earlier, key=lambda c: filled[c])
+        return best
+
+    def _later_share(self, a, b) -> float:
+        """Share of rows with both set where b is later than a."""
+        n_later, n_both = self.later.get((a, b), (0, 0))
+        return n_later / n_both if n_both else 0.0
+
+    def result(self) -> dict:
+        return _temporal_result(self)
+
+
+def _remapped(b: TimeBuckets, remap: np.ndarray, width: int) -> TimeBuckets:
+    out = TimeBuckets()
+    out.__dict__.update(b.__dict__)
+    out.target = np.zeros((len(b.counts), width))
+    for j, k in enumerate(remap[:b.target.shape[1]]):
+        out.target[:, k] += b.target[:, j]
+    return out
+
+
+def _target_by_period(state: TemporalState, b: TimeBuckets) -> tuple:
+    """(statistic name, {period: value}, trend) of the target over the periods of b."""
+    if b.target.shape[1] == 0 or b.min is None:
+        return None, {}, None
+    unit = b.display_unit()
+    first, _, table = b._as_unit(unit)
+    if state.numeric_target:
+        stat, num, den = "mean", table[:, 0], table[:, 1]
+    else:
+        totals = table[:, 1:].sum(axis=0)
+        if not (totals > 0).any():
+            return None, {}, None
+        # The rarest tracked value, e.g. the positive class of a binary target.
+        level = int(np.argmin(np.where(totals > 0, totals, np.inf)))
+        stat, num, den = f"share of {state.levels[level]}", table[:, level + 1], table.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = num / den
+    has = den > 0
+    by_period = {_label(first + i, unit): round(float(rate[i]), 4) for i in np.flatnonzero(has)}
+
+    trend = None
+    full = np.flatnonzero(den >= MIN_PERIOD_ROWS)
+    if len(full) >= 4 and np.ptp(rate[full]) > 0:
+        trend = round(float(np.corrcoef(full, rate[full])[0, 1]), 4)
+    return stat, by_period, trend
+
+
+def _temporal_result(state: TemporalState) -> dict:
+    time_column = state.time_column()
+    out = {
+        "time_columns": list(state.buckets),
+        "time_column": time_column,
+        "time_format": state.formats.get(time_column) if time_column is not None else None,
+        "columns": {col: b.summary() for col, b in state.buckets.items()},
+        "target_stat": None,
+        "target_by_period": {},
+        "target_trend": None,
+        "lockstep_features": {},
+        "after_event_columns": {},
+        "warning": None,
+    }
+    if time_column is None:
+        return out
+
+    b = state.buckets[time_column]
+    out["target_stat"], out["target_by_period"], out["target_trend"] = _target_by_period(state, b)
+
+    if time_column in state.lockstep:
+        r = state.lockstep[time_column].correlations().dropna()
+        r = r[r.abs() > LOCKSTEP_CORR]
+        out["lockstep_features"] = {col: round(float(v), 4) for col, v in r.sort_values(key=abs, ascending=False).items()}
+
+    for col in state.buckets:
+        share = state._later_share(time_column, col)
+        if col != time_column and share >= AFTER_EVENT_SHARE:
+            out["after_event_columns"][col] = round(share, 4)
+
+    warnings = []
+    if out["lockstep_features"]:
+        warnings.append(f"Features that move in lockstep with '{time_column}': they may encode time or be recorded after the event.")
+    if out["after_event_columns"]:
+        warnings.append(f"Timestamps later than '{time_column}' in almost every row: likely recorded after the event.")
+    if out["target_trend"] is not None and abs(out["target_trend"]) > TREND_CORR:
+        warnings.append("The target changes over time; validate on the most recent period, not a random split.")
+    summary = out["columns"][time_column]
+    if summary["empty_periods"] > GAP_SHARE * summary["n_periods"]:
+        warnings.append(f"Gaps in '{time_column}': {summary['empty_periods']} of {summary['n_periods']} "
+                        f"{summary['period']}s have no rows.")
+    out["warning"] = " ".join(warnings) or None
+    return out
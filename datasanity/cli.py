@@ -0,0 +1,216 @@
+"""
+Check many tables in one go.
+
+    datasanity "data/*.csv" --target label --out reports/
+    datasanity --manifest tables.csv --workers 8 --memory-limit 4096 --fail-above 70
+
+Each (file, target) gets <name>.json and <name>.html in --out as soon as it is done,
+and a line in summary.jsonl; a severity table is printed at the end.
+Exit status: 0 if every file was checked and scored below --fail-above,
+1 if any scored at or above it, 2 if any file failed.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+CSV_SUFFIXES = (".csv", ".tsv", ".txt", ".gz", ".bz2", ".zip", ".xz")
+
+
+def read_manifest(path) -> list:
+    """[(file, target)] from a CSV with "path" and "target" columns or a JSON list of such objects."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        rows = json.loads(path.read_text(encoding="utf-8"))
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    base = path.parent
+    out = []
+    for row in rows:
+        file = Path(row["path"])
+        out.append((str(file if file.is_absolute() else base / file), row["target"]))
+    return out
+
+
+def _jobs(patterns, target, manifest) -> list:
+    jobs = read_manifest(manifest) if manifest else []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or ([pattern] if Path(pattern).exists() else [])
+        if not matches:
+            print(f"warning: no files match {pattern!r}", file=sys.stderr)
+        jobs.extend((m, target) for m in matches)
+    return jobs
+
+
+def _report_name(path: str, target: str) -> str:
+    # Readable and safe as a file name; unique per (path, target) through a
+    # short digest, so "data/a.csv" and "/data/a.csv", or one table checked
+    # against several targets, never write the same report files.
+    readable = str(Path(path)).lstrip("/\\").replace("/", "__").replace("\\", "__").replace(":", "")
+    safe_target = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in str(target))
+    digest = hashlib.sha1(f"{Path(path)}\0{target}".encode("utf-8")).hexdigest()[:8]
+    return f"{readable or 'report'}__{safe_target}-{digest}"
+
+
+def _limit_memory(limit_mb):
+    if not limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    limit = int(limit_mb) << 20
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def check_one(path: str, target: str, out_dir: str, html: bool = True, chunksize=None) -> dict:
+    """Check one file, write its JSON (and HTML) report and return a summary row."""
+    from .core import check_dataset
+
+    started = time.perf_counter()
+    row = {"path": path, "target": target}
+    try:
+        suffix = Path(path).suffix.lower()
+        if suffix in CSV_SUFFIXES and chunksize:
+            from .stream import check_dataset_stream
+
+            report = check_dataset_stream(path, target, chunksize=chunksize)
+        elif suffix in CSV_SUFFIXES:
+            from .ingest import read_csv_compact
+
+            df, _ = read_csv_compact(path, target=target)
+            if target not in df.columns:
+                raise ValueError(f"Target column '{target}' not found.")
+            report = check_dataset(df, target)
+            del df
+        else:
+            from .files import check_file
+
+            report = check_file(path, target)
+
+        name = _report_name(path, target)
+        out = Path(out_dir)
+        json_path = out / f"{name}.json"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, default=str, indent=2)
+        row["json"] = str(json_path)
+        if html:
+            html_path = out / f"{name}.html"
+            report.save_html(html_path)
+            row["html"] = str(html_path)
+
+        severity = report.results.get("severity") or {}
+        row.update(status="ok", score=severity.get("score"), risk_level=severity.get("risk_level"))
+    except MemoryError:
+        row.update(status="error", error="MemoryError: over the per-file memory limit")
+    except Exception as e:  # one bad file must not stop the batch
+        row.update(status="error", error=f"{type(e).__name__}: {e}")
+    row["seconds"] = round(time.perf_counter() - started, 3)
+    return row
+
+
+def run_batch(jobs, out_dir, workers: int = 1, memory_limit_mb=None, html: bool = True,
+              chunksize=None, on_result=None) -> list:
+    """
+    Check every (path, target) in `jobs` on a process pool, one fresh
+    process per file so `memory_limit_mb` applies per file. on_result(row)
+    is called as each file finishes. A file that kills its worker is
+    retried alone once and then reported as an error.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    rows = []
+
+    def run(batch, n_workers):
+        crashed = []
+        with ProcessPoolExecutor(max_workers=n_workers, max_tasks_per_child=1,
+                                 initializer=_limit_memory, initargs=(memory_limit_mb,)) as pool:
+            futures = {pool.submit(check_one, path, target, out_dir, html, chunksize): (path, target)
+                       for path, target in batch}
+            for fut in as_completed(futures):
+                path, target = futures[fut]
+                try:
+                    row = fut.result()
+                except BrokenProcessPool:
+                    crashed.append((path, target))
+                    continue
+                except Exception as e:  # e.g. the worker could not even start
+                    row = {"path": path, "target": target, "status": "error", "error": f"{type(e).__name__}: {e}"}
+                rows.append(row)
+                if on_result is not None:
+                    on_result(row)
+        return crashed
+
+    crashed = run(jobs, workers)
+    for path, target in crashed:
+        if run([(path, target)], 1):
+            row = {"path": path, "target": target, "status": "error",
+                   "error": "worker process died (memory limit too low?)"}
+            rows.append(row)
+            if on_result is not None:
+                on_result(row)
+    return rows
+
+
+def format_summary(rows) -> str:
+    rows = sorted(rows, key=lambda r: (r.get("score") is None, -(r.get("score") or 0), r["path"]))
+    width = max([len(r["path"]) for r in rows] + [4])
+    lines = [f"{'file':<{width}}  {'score':>5}  {'risk':<14} {'time':>8}"]
+    for r in rows:
+        if r["status"] == "ok":
+            lines.append(f"{r['path']:<{width}}  {r['score']:>5}  {r['risk_level']:<14} {r['seconds']:>7.1f}s")
+        else:
+            lines.append(f"{r['path']:<{width}}  {'-':>5}  {'ERROR':<14} {r.get('seconds', 0):>7.1f}s  {r['error']}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="datasanity", description=__doc__.split("\n\n")[0])
+    parser.add_argument("inputs", nargs="*", help="files or glob patterns (quote them)")
+    parser.add_argument("--target", help="target column for files given as inputs")
+    parser.add_argument("--manifest", help="CSV (path,target columns) or JSON list of {path, target}")
+    parser.add_argument("--out", default="datasanity_reports", help="output directory")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--memory-limit", type=int, metavar="MB", help="address-space limit per file")
+    parser.add_argument("--chunksize", type=int, help="check CSVs chunk by chunk (for files larger than memory)")
+    parser.add_argument("--no-html", action="store_true", help="write JSON reports only")
+    parser.add_argument("--fail-above", type=int, default=70, metavar="SCORE",
+                        help="exit 1 if any severity score is at or above this (default 70)")
+    args = parser.parse_args(argv)
+
+    if args.inputs and not args.target:
+        parser.error("--target is required for files given on the command line")
+    jobs = _jobs(args.inputs, args.target, args.manifest)
+    if not jobs:
+        parser.error("no input files")
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    with open(out / "summary.jsonl", "w", encoding="utf-8") as summary:
+        def record(row):
+            summary.write(json.dumps(row, default=str) + "\n")
+            summary.flush()
+            state = f"{row['score']:>3} {row['risk_level']}" if row["status"] == "ok" else f"ERROR {row['error']}"
+            print(f"[{len(done) + 1}/{len(jobs)}] {row['path']}: {state}", file=sys.stderr)
+            done.append(row)
+
+        done = []
+        rows = run_batch(jobs, out, args.workers, args.memory_limit, not args.no_html, args.chunksize, record)
+
+    print(format_summary(rows))
+    if any(r["status"] != "ok" for r in rows):
+        return 2
+    if any(r["score"] >= args.fail_above for r in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,306 @@
-from .checks.imbalance import check_class_imbalance
-from .checks.missing import check_missing_values
-from .checks.constants import check_constant_columns
-from .checks.id_columns import check_id_like_columns
-from .checks.duplicates import check_duplicates
-from .checks.leakage import check_target_leakage
-from .checks.advice import generate_modeling_advice
-from .report.generator import generate_html_report
-from .checks.severity import compute_dataset_severity
-from .checks.model_suggest import suggest_models
-from .report.codegen import generate_training_code
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .checks.duplicates import row_hashes, _duplicates_from_hashes
+from .profile import profile_dataset, merge_column_shards
+from .registry import registered_checks, select_checks
+from .scheduler import Task, run_tasks, column_shards
+from .cache import TARGET_FREE, cache_key, dataset_fingerprint
+from .sampling import add_confidence_intervals, draw_sample
+
+BASE_CHECKS = ("imbalance", "missing", "constants", "id_columns", "duplicates", "leakage", "numeric_distribution",
+               "temporal", "groups")
+REPORT_STEPS = ("advice", "severity", "model_suggestion", "code_snippet")
 
 
 class DataSanityReport:
     def __init__(self, results: dict):
         self.results = results
+        # Future of the full-table report when check_dataset(sample=..., refine=True).
+        self.refined = None
+        # {step name: {"wall_s", "cpu_s", "rows", "columns"[, "peak_mb"]}} of the run.
+        self.timings = {}
 
     def to_dict(self) -> dict:
+        if self.timings:
+            return {**self.results, "_profile": self.timings}
         return self.results
 
     def to_html(self) -> str:
-        return generate_html_report(self.results).html
-
-
-def check_dataset(df, target: str) -> DataSanityReport:
-    results = {
-        "shape": df.shape,
-        "imbalance": check_class_imbalance(df, target),
-        "missing": check_missing_values(df),
-        "constants": check_constant_columns(df),
-        "id_columns": check_id_like_columns(df),
-        "duplicates": check_duplicates(df),
-        "leakage": check_target_leakage(df, target),
-    }
-
-    results["advice"] = generate_modeling_advice(results)
-    results["severity"] = compute_dataset_severity(results)
-    results["model_suggestion"] = suggest_models(df, target, results)
-    results["code_snippet"] = generate_training_code(results["model_suggestion"])
+        from .report.generator import generate_html_report  # jinja2, only when rendering
+
+        return generate_html_report(self.to_dict()).html
+
+    def save_html(self, filepath="datasanity_report.html"):
+        """Write the HTML report to a file, rendered straight into it."""
+        from .report.generator import generate_html_report
+
+        return generate_html_report(self.to_dict()).save(filepath)
+
+
+def _profile_shards(**shards):
+    return merge_column_shards(*shards.values())
+
+
+def _row_hash_shards(**shards):
+    return tuple(shards.values())
+
+
+def _duplicates(df, row_hashes):
+    return _duplicates_from_hashes(df, *row_hashes)
+
+
+def _advice(df, **results):
+    from .checks.advice import generate_modeling_advice
+
+    return generate_modeling_advice(results)
+
+
+def _severity(df, **results):
+    from .checks.severity import compute_dataset_severity
+
+    return compute_dataset_severity(results)
+
+
+def _model_suggestion(df, target, profile, **results):
+    from .checks.model_suggest import suggest_models
+
+    return suggest_models(df, target, results, profile)
+
+
+def _code_snippet(df, model_suggestion):
+    from .report.codegen import generate_training_code
+
+    return generate_training_code(model_suggestion)
+
+
+def _missing_columns(missing):
+    return {"error": f"Required columns not found: {missing}"}
+
+
+def _registered_tasks(df, target: str, names) -> list:
+    """One Task per registered check in `names`."""
+    registry = registered_checks()
+    n_rows, n_cols = df.shape if df is not None else (0, 0)
+    tasks = []
+    for name in names:
+        check = registry[name]
+        missing = [c for c in check.required_columns if df is not None and c not in df.columns]
+        if missing:
+            tasks.append(Task(name, _missing_columns, (missing,)))
+            continue
+        args = (df, target) if check.needs_target else (df,)
+        scans = {"none": (0, 0), "target": (n_rows, 1), "all": (n_rows, n_cols)}[check.scans]
+        tasks.append(Task(name, check.resolve(), args, deps=check.deps, scans=scans))
+    return tasks
+
+
+def _report_tasks(df, target) -> list:
+    """Tasks that turn base check results into advice, severity, models and code."""
+    return _registered_tasks(df, target, REPORT_STEPS)
+
+
+def _check_tasks(df, target: str, approx_distinct=None, n_shards: int = 1, names=None) -> list:
+    """
+    The check_dataset task graph: the shared inputs, then every registered
+    check in `names` (all default checks when None). Column profiling and
+    row hashing are split into column shards.
+    """
+    shards = column_shards(df.columns, n_shards)
+    n_rows = len(df)
+    profile_parts = tuple(f"profile:{i}" for i in range(len(shards)))
+    hash_parts = tuple(f"row_hashes:{i}" for i in range(len(shards)))
+
+    tasks = []
+    for i, cols in enumerate(shards):
+        tasks.append(Task(profile_parts[i], profile_dataset, (df[cols], approx_distinct), scans=(n_rows, len(cols))))
+        # Only the shard's columns, so a process pool pickles each column once.
+        tasks.append(Task(hash_parts[i], row_hashes, (df[cols],), scans=(n_rows, len(cols))))
+    tasks += [
+        Task("profile", _profile_shards, deps=profile_parts),
+        Task("row_hashes", _row_hash_shards, deps=hash_parts),
+    ]
+    return tasks + _registered_tasks(df, target, select_checks(names))
+
+
+def check_dataset(
+    df,
+    target: str,
+    approx_distinct: float | None = None,
+    executor=None,
+    max_workers: int | None = None,
+    column_shards_per_worker: int = 1,
+    cache=None,
+    sample=None,
+    sample_method: str = "uniform",
+    refine: bool = False,
+    seed: int = 0,
+    trace_memory: bool = False,
+    on_timing=None,
+    checks=None,
+) -> DataSanityReport:
+    """
+    Run all checks on a DataFrame.
+
+    checks: names of registered checks to run (see datasanity.registry),
+    e.g. ["missing", "leakage"]; the checks they depend on run too and are
+    reported as well. Default: every default check, including ones that
+    third-party packages registered through entry points.
+    approx_distinct: relative error for HyperLogLog distinct counts
+    (e.g. 0.01) instead of exact ones; saves memory on high-cardinality
+    columns. ID-like and class-count decisions then use the estimates.
+
+    executor: None (serial), "thread", "process" or a concurrent.futures
+    Executor. Independent checks run concurrently and wide frames are
+    profiled/hashed in column shards (max_workers * column_shards_per_worker
+    of them). Threads are usually the better choice, since the pandas/NumPy
+    kernels release the GIL and no data has to be copied. A process pool
+    gets the frame pickled once per worker, plus the row hashes and
+    profile per task; that copying only pays off with several cores and
+    checks that hold the GIL. The results are the same as the serial run.
+
+    cache: a datasanity.cache.ResultCache. Results are keyed on a sampled
+    fingerprint of the data (see dataset_fingerprint) plus target and
+    config; a repeat run returns the stored report, and target-independent
+    checks are reused when only the target changes.
+
+    sample: run the checks on a row sample instead of the whole table, for
+    quick first results: an int row count or a float fraction.
+    sample_method "uniform" or "stratified" (proportional per target value,
+    class shares then exact). Results gain confidence intervals ("ci" in
+    missing / imbalance / leakage) and a "sampling" section listing the
+    threshold decisions the sample cannot settle ("uncertain",
+    "needs_full_pass"). refine=True also starts the full-table run in a
+    background thread; its report is the Future `report.refined`.
+
+    Every step that runs is timed: `report.timings` (also
+    to_dict()["_profile"]) maps step name to wall / CPU seconds and the
+    rows and columns it read, plus "total" for the whole call.
+    trace_memory=True adds the tracemalloc peak ("peak_mb"; slower).
+    on_timing(name, metrics) is called as each step finishes, e.g. to
+    forward the numbers to a metrics system.
+    """
+    started = time.perf_counter()
+    names = select_checks(checks)
+    if sample is not None:
+        if checks is not None:
+            raise ValueError("checks cannot be combined with sample.")
+        report = _check_sample(
+            df, target, sample, sample_method, refine, seed,
+            approx_distinct=approx_distinct, executor=executor, max_workers=max_workers,
+            column_shards_per_worker=column_shards_per_worker, cache=cache,
+            trace_memory=trace_memory, on_timing=on_timing,
+        )
+        return _finish_timings(report, started, on_timing)
+
+    n_shards = 1
+    if executor not in (None, "serial"):
+        n_shards = (max_workers or os.cpu_count() or 1) * column_shards_per_worker
+
+    cached, initial = _cache_lookup(cache, df, target, approx_distinct, names)
+    if cached is not None:
+        return _finish_timings(DataSanityReport(dict(cached)), started, on_timing)
+
+    timings = {}
+    tasks = _check_tasks(df, target, approx_distinct, n_shards, names)
+    done = run_tasks(tasks, executor, max_workers, initial=initial, wanted=names,
+                     timings=timings, trace_memory=trace_memory, on_timing=on_timing)
+    report = _assemble(df.shape, done, names)
+    _cache_store(cache, df, target, approx_distinct, done, initial, report.results, names)
+    report.timings = timings
+    return _finish_timings(report, started, on_timing)
+
+
+def _finish_timings(report: DataSanityReport, started: float, on_timing=None) -> DataSanityReport:
+    total = {"wall_s": round(time.perf_counter() - started, 6)}
+    report.timings["total"] = total
+    if on_timing is not None:
+        on_timing("total", total)
+    return report
+
+
+def _report_config(approx_distinct, names) -> tuple:
+    if names == BASE_CHECKS + REPORT_STEPS:
+        return (approx_distinct,)
+    return (approx_distinct, names)
+
+
+def _cache_lookup(cache, df, target, approx_distinct, names=BASE_CHECKS + REPORT_STEPS):
+    """(cached report results or None, cached target-free results)."""
+    if cache is None:
+        return None, {}
+    config = (approx_distinct,)
+    fingerprint = dataset_fingerprint(df)
+    cached = cache.get(cache_key("report", fingerprint, target, _report_config(approx_distinct, names)))
+    if cached is not None:
+        return cached, {}
+    initial = {}
+    for name in TARGET_FREE:
+        value = cache.get(cache_key(name, fingerprint, config))
+        if value is not None:
+            initial[name] = value
+    return None, initial
+
+
+def _cache_store(cache, df, target, approx_distinct, done: dict, initial: dict, results: dict,
+                 names=BASE_CHECKS + REPORT_STEPS) -> None:
+    if cache is None:
+        return
+    config = (approx_distinct,)
+    fingerprint = dataset_fingerprint(df)
+    for name in TARGET_FREE:
+        if name in done and name not in initial:
+            cache.set(cache_key(name, fingerprint, config), done[name])
+    cache.set(cache_key("report", fingerprint, target, _report_config(approx_distinct, names)), dict(results))
+
+
+def _check_sample(df, target, sample, method, refine, seed, cache=None, trace_memory=False, on_timing=None,
+                  **kwargs) -> DataSanityReport:
+    config = ("sample", sample, method, seed, kwargs["approx_distinct"])
+    if cache is not None:
+        report_key = cache_key("report", dataset_fingerprint(df), target, config)
+        cached = cache.get(report_key)
+    if cache is None or cached is None:
+        part = draw_sample(df, target, sample, method, seed)
+        n_shards = 1
+        if kwargs["executor"] not in (None, "serial"):
+            n_shards = (kwargs["max_workers"] or os.cpu_count() or 1) * kwargs["column_shards_per_worker"]
+        timings = {}
+        tasks = _check_tasks(part, target, kwargs["approx_distinct"], n_shards)
+        done = run_tasks(tasks, kwargs["executor"], kwargs["max_workers"], wanted=BASE_CHECKS + ("profile",),
+                         timings=timings, trace_memory=trace_memory, on_timing=on_timing)
+        results = {"shape": df.shape, **{name: done[name] for name in BASE_CHECKS}}
+        sampling = add_confidence_intervals(results, df, part, target, done["profile"], method)
+        report = _build_report(results, part, target, done["profile"],
+                               timings=timings, trace_memory=trace_memory, on_timing=on_timing)
+        report.results["sampling"] = sampling
+        if cache is not None:
+            cache.set(report_key, dict(report.results))
+    else:
+        report = DataSanityReport(dict(cached))
+
+    if refine:
+        pool = ThreadPoolExecutor(max_workers=1)
+        report.refined = pool.submit(check_dataset, df, target, cache=cache, **kwargs)
+        pool.shutdown(wait=False)
+    return report
+
+
+def _assemble(shape, done: dict, names=BASE_CHECKS + REPORT_STEPS) -> DataSanityReport:
+    # Fixed key order, whatever order the tasks finished in.
+    results = {"shape": shape}
+    for name in names:
+        results[name] = done[name]
     return DataSanityReport(results)
+
+
+def _build_report(results: dict, df, target: str, profile, timings=None, **measure) -> DataSanityReport:
+    """Add advice, severity, model suggestion and code on top of the base checks."""
+    timings = {} if timings is None else timings
+    done = run_tasks(_report_tasks(df, target), initial={**results, "profile": profile}, timings=timings, **measure)
+    report = _assemble(results["shape"], done)
+    if "streaming" in results:
+        report.results["streaming"] = results["streaming"]
+    report.timings = timings
+    return report
@@ -0,0 +1,241 @@
+from __future__ import annotations
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .core import DataSanityReport
+from .profile import _dtype_classes
+
+# Quantile bins per numeric column and levels kept per categorical column
+# (the rest share an "other" bin).
+DRIFT_BINS = 20
+MAX_LEVELS = 50
+
+# PSI below 0.1 is stable, up to 0.25 a moderate shift, above that a major one.
+PSI_MODERATE = 0.1
+PSI_MAJOR = 0.25
+MISSING_SHIFT = 0.1
+# Added to empty bins so PSI stays finite.
+PSI_EPS = 1e-4
+
+
+class DriftSketch:
+    """
+    Compact summary of a table for drift checks: per column, the counts in
+    a fixed set of bins plus the null count. Numeric columns get quantile
+    bins of the reference data, other columns its most frequent levels and
+    an "other" bin.
+
+        reference = DriftSketch.from_frame(train_df)
+        reference.save("train.sketch")
+        ...
+        current = DriftSketch.load("train.sketch").apply(batch_df)
+        drift = reference.compare(current)
+
+    apply() counts another table into the same bins, so any number of
+    batches can be compared with one reference without re-reading it;
+    merge() adds up sketches with the same bins (e.g. batches of a day).
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, kinds: dict, edges: dict, levels: dict):
+        self.kinds = kinds                      # column -> "numeric" or "categorical"
+        self.edges = edges                      # numeric column -> interior bin edges
+        self.levels = levels                    # categorical column -> pd.Index of levels
+        self.n_rows = 0
+        self.counts = {}                        # column -> int64 counts per bin
+        self.nulls = {}                         # column -> null count
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, bins: int = DRIFT_BINS, max_levels: int = MAX_LEVELS) -> "DriftSketch":
+        """Fit the bins on df (the reference) and count df into them."""
+        classes = _dtype_classes(df)
+        kinds, edges, levels = {}, {}, {}
+        for col in df.columns:
+            s = df[col]
+            values = s.dropna()
+            if classes[col] == "numeric" and values.nunique() > bins:
+                x = values.to_numpy(dtype="float64")
+                x = x[np.isfinite(x)]
+                q = np.linspace(0, 1, bins + 1)[1:-1]
+                kinds[col] = "numeric"
+                edges[col] = np.unique(np.quantile(x, q)) if len(x) else np.array([])
+            else:
+                kinds[col] = "categorical"
+                levels[col] = pd.Index(values.value_counts().index[:max_levels - 1])
+        return cls(kinds, edges, levels).apply(df, _update=True)
+
+    def _bin(self, col, s: pd.Series) -> tuple:
+        null = s.isna().to_numpy()
+        if self.kinds[col] == "numeric":
+            if not pd.api.types.is_numeric_dtype(s.dtype) or pd.api.types.is_bool_dtype(s.dtype):
+                s = pd.to_numeric(s, errors="coerce")   # unparseable values count as missing
+                null = s.isna().to_numpy()
+            x = s.to_numpy(dtype="float64", na_value=np.nan)[~null]
+            codes = np.searchsorted(self.edges[col], x, side="right")
+            n_bins = len(self.edges[col]) + 1
+        else:
+            codes = self.levels[col].get_indexer(s[~null])
+            codes[codes < 0] = len(self.levels[col])   # other
+            n_bins = len(self.levels[col]) + 1
+        return np.bincount(codes, minlength=n_bins).astype("int64"), int(null.sum())
+
+    def apply(self, df: pd.DataFrame, _update: bool = False) -> "DriftSketch":
+        """A sketch of df in this sketch's bins (columns it does not know are ignored)."""
+        out = self if _update else DriftSketch(self.kinds, self.edges, self.levels)
+        out.n_rows = len(df)
+        out.counts, out.nulls = {}, {}
+        for col in self.kinds:
+            if col in df.columns:
+                out.counts[col], out.nulls[col] = self._bin(col, df[col])
+        return out
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        if other.kinds != self.kinds:
+            raise ValueError("Sketches have different columns or bins.")
+        out = DriftSketch(self.kinds, self.edges, self.levels)
+        out.n_rows = self.n_rows + other.n_rows
+        for col in self.kinds:
+            if col in self.counts and col in other.counts:
+                out.counts[col] = self.counts[col] + other.counts[col]
+                out.nulls[col] = self.nulls[col] + other.nulls[col]
+            elif col in self.counts or col in other.counts:
+                src = self if col in self.counts else other
+                out.counts[col], out.nulls[col] = src.counts[col], src.nulls[col]
+        return out
+
+    def save(self, path) -> Path:
+        """Pickle the sketch to `path` (written atomically)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": self.FORMAT_VERSION, "sketch": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "DriftSketch":
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported sketch version in {path}: {payload.get('version')!r}")
+        return payload["sketch"]
+
+    def compare(self, current: "DriftSketch", target: str | None = None) -> dict:
+        """Drift of `current` (a sketch in the same bins, see apply) against this reference."""
+        return _drift_result(self, current, target)
+
+
+def _padded(counts: list) -> np.ndarray:
+    """Counts of unequal length as rows of one zero-padded matrix."""
+    width = max((len(c) for c in counts), default=0)
+    out = np.zeros((len(counts), width))
+    for i, c in enumerate(counts):
+        out[i, :len(c)] = c
+    return out
+
+
+def _drift_result(reference: DriftSketch, current: DriftSketch, target=None) -> dict:
+    """PSI, KS, category shift and missing-rate shift of every shared column, as matrix operations."""
+    missing_columns = [c for c in reference.kinds if c not in current.counts]
+    if reference.n_rows == 0 or current.n_rows == 0:
+        # Shares of an empty table are undefined: no verdict rather than "all drifted".
+        empty = "reference" if reference.n_rows == 0 else "current"
+        return {
+            "n_reference": int(reference.n_rows),
+            "n_current": int(current.n_rows),
+            "columns": {},
+            "drifted_columns": [],
+            "missing_columns": missing_columns,
+            "target": None,
+            "warning": f"The {empty} data has no rows; drift was not checked.",
+        }
+    shared = [c for c in reference.kinds if c in reference.counts and c in current.counts]
+    P = _padded([reference.counts[c] for c in shared])
+    Q = _padded([current.counts[c] for c in shared])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = P / P.sum(axis=1, keepdims=True)
+        q = Q / Q.sum(axis=1, keepdims=True)
+    p, q = np.nan_to_num(p), np.nan_to_num(q)
+    used = (P + Q) > 0                         # padding and empty bins add nothing
+    pe, qe = p + PSI_EPS * used, q + PSI_EPS * used
+    with np.errstate(invalid="ignore", divide="ignore"):
+        psi = np.where(used, (qe - pe) * np.log(np.where(used, qe / pe, 1.0)), 0.0).sum(axis=1)
+    ks = np.abs(np.cumsum(p, axis=1) - np.cumsum(q, axis=1)).max(axis=1, initial=0.0)
+    tv = 0.5 * np.abs(p - q).sum(axis=1)
+
+    null_ref = np.array([reference.nulls[c] for c in shared], dtype="float64") / max(reference.n_rows, 1)
+    null_cur = np.array([current.nulls[c] for c in shared], dtype="float64") / max(current.n_rows, 1)
+
+    columns = {}
+    for i, col in enumerate(shared):
+        numeric = reference.kinds[col] == "numeric"
+        level = "major" if psi[i] > PSI_MAJOR else "moderate" if psi[i] > PSI_MODERATE else "stable"
+        missing_shift = float(null_cur[i] - null_ref[i])
+        entry = {
+            "kind": reference.kinds[col],
+            "psi": round(float(psi[i]), 4),
+            "level": level,
+            "missing_reference": round(float(null_ref[i]), 4),
+            "missing_current": round(float(null_cur[i]), 4),
+            "missing_shift": round(missing_shift, 4),
+        }
+        if numeric:
+            entry["ks"] = round(float(ks[i]), 4)
+        else:
+            entry["category_shift"] = round(float(tv[i]), 4)
+            # Share of current values outside the reference levels (new or rare categories).
+            entry["other_share_current"] = round(float(q[i, len(reference.levels[col])]), 4)
+        entry["drifted"] = level != "stable" or abs(missing_shift) > MISSING_SHIFT
+        columns[col] = entry
+
+    # The target is reported on its own, not counted among the feature columns.
+    target_drift = columns.pop(target, None) if target is not None else None
+    drifted = sorted((c for c, e in columns.items() if e["drifted"]), key=lambda c: -columns[c]["psi"])
+    warnings = []
+    if drifted:
+        warnings.append(f"{len(drifted)} of {len(columns)} columns drifted.")
+    if target_drift is not None and target_drift["drifted"]:
+        warnings.append("The target distribution shifted; re-check labels and class balance before retraining.")
+    return {
+        "n_reference": int(reference.n_rows),
+        "n_current": int(current.n_rows),
+        "columns": columns,
+        "drifted_columns": drifted,
+        "missing_columns": missing_columns,
+        "target": target_drift,
+        "warning": " ".join(warnings) or None,
+    }
+
+
+def compare_datasets(reference, current, target: str | None = None) -> DataSanityReport:
+    """
+    Train/serving drift of `current` against `reference`.
+
+    Both may be DataFrames or DriftSketches: a reference sketch (see
+    DriftSketch.from_frame / load) is reused as is, so one saved reference
+    can be compared with many batches. Per column: PSI over the reference
+    quantile bins (or levels), the KS statistic on those bins for numeric
+    columns, the total variation distance of category shares for the
+    others, and the change in missing rate. `target`, if given, is
+    reported separately under "target" and left out of "columns". If
+    either side has no rows there is no verdict, only a warning.
+
+    Returns a DataSanityReport with a "drift" section.
+    """
+    if not isinstance(reference, DriftSketch):
+        reference = DriftSketch.from_frame(reference)
+    new_columns = []                            # a sketch only knows the reference columns
+    if isinstance(current, pd.DataFrame):
+        new_columns = [c for c in current.columns if c not in reference.kinds]
+        shape = current.shape
+        current = reference.apply(current)
+    else:
+        shape = (current.n_rows, len(current.counts))
+    drift = reference.compare(current, target)
+    drift["new_columns"] = new_columns
+    return DataSanityReport({"shape": shape, "drift": drift})
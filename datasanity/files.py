@@ -0,0 +1,348 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .core import BASE_CHECKS, DataSanityReport, _build_report
+from .profile import ColumnProfile, DatasetProfile, _dtype_classes, profile_column
+from .checks.missing import check_missing_values
+from .checks.constants import check_constant_columns
+from .checks.id_columns import check_id_like_columns
+from .checks.imbalance import check_class_imbalance
+from .checks.duplicates import (
+    _combine,
+    _duplicates_result,
+    _group_rows,
+    _hash_groups,
+    _verify_groups,
+)
+from .checks.leakage import CorrelationMoments, _leakage_result
+from .checks.distribution import NumericMoments, _distribution_result
+from .checks.temporal import SCAN_ROWS, TemporalState, detect_time_format, epoch_seconds
+from .checks.groups import GroupState, group_candidates
+from .checks.association import (
+    AssociationState,
+    Binner,
+    association_candidates,
+    contingency,
+)
+from .sketch import hash_values
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".feather", ".arrow", ".ipc")
+
+# Rows used to fit the association bins of a column.
+BIN_SAMPLE_ROWS = 50_000
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("check_file needs pyarrow: pip install pyarrow") from e
+
+
+class _ColumnReader:
+    """Reads single columns from a Parquet or Arrow/Feather file."""
+
+    def __init__(self, path: Path):
+        import pyarrow.parquet as pq
+
+        self.path = path
+        suffix = path.suffix.lower()
+        if suffix not in PARQUET_SUFFIXES + ARROW_SUFFIXES:
+            raise ValueError(f"Unsupported file type '{suffix}' (expected Parquet, Arrow IPC or Feather).")
+        self.parquet = suffix in PARQUET_SUFFIXES
+        if self.parquet:
+            self._file = pq.ParquetFile(path)
+            self.schema = self._file.schema_arrow
+            self.n_rows = self._file.metadata.num_rows
+        else:
+            reader = self._ipc_reader()
+            self.schema = reader.schema
+            self.n_rows = reader.count_rows()
+        self.columns = list(self.schema.names)
+
+    def _ipc_reader(self, col=None):
+        """
+        An Arrow IPC reader over the memory-mapped file, limited to one
+        column when given: only that column's buffers are read (and, for
+        compressed files, decompressed).
+        """
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        source = pa.memory_map(str(self.path))
+        if col is None:
+            return ipc.open_file(source)
+        fields = [self.columns.index(col)]
+        return ipc.open_file(source, options=ipc.IpcReadOptions(included_fields=fields))
+
+    def read(self, col) -> pd.Series:
+        if self.parquet:
+            # pyarrow decodes the column's row groups on its own thread pool.
+            table = self._file.read(columns=[col], use_threads=True)
+        else:
+            table = self._ipc_reader(col).read_all()
+        return table.column(0).to_pandas().rename(col)
+
+    def head(self, col, n: int) -> pd.Series:
+        """The first n values of a column (Parquet: from the first row group only)."""
+        import pyarrow as pa
+
+        if self.parquet:
+            if self._file.metadata.num_row_groups == 0:
+                return self.read(col)
+            table = self._file.read_row_group(0, columns=[col])
+        else:
+            # Only the record batches covering the first n rows are read.
+            reader = self._ipc_reader(col)
+            batches, rows = [], 0
+            for i in range(reader.num_record_batches):
+                if rows >= n and batches:
+                    break
+                batches.append(reader.get_batch(i))
+                rows += batches[-1].num_rows
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        return table.slice(0, n).column(0).to_pandas().rename(col)
+
+    def may_hold_time(self, col) -> bool:
+        """Whether the column type can hold timestamps or date strings."""
+        import pyarrow.types as pat
+
+        t = self.schema.field(col).type
+        if pat.is_dictionary(t):
+            t = t.value_type
+        return pat.is_timestamp(t) or pat.is_date(t) or pat.is_string(t) or pat.is_large_string(t)
+
+    def metadata_stats(self) -> dict:
+        """
+        Exact null counts and constant/non-constant decisions from Parquet
+        row-group statistics. Only columns where the statistics are exact
+        are returned: floats are skipped (NaN is not a Parquet null but is
+        missing for pandas) and string min/max may be truncated, so those
+        only prove a column is not constant.
+        """
+        import pyarrow.types as pat
+
+        if not self.parquet:
+            return {}
+        meta = self._file.metadata
+        out = {}
+        for i, col in enumerate(self.columns):
+            field = self.schema.field(col)
+            if pat.is_floating(field.type) or pat.is_nested(field.type):
+                continue
+            stats = [meta.row_group(g).column(i).statistics for g in range(meta.num_row_groups)]
+            if not stats or any(s is None or not s.has_null_count for s in stats):
+                continue
+            nulls = sum(s.null_count for s in stats)
+            constant = None
+            if nulls == self.n_rows:
+                constant = True
+            elif nulls > 0:
+                constant = False
+            elif all(s.has_min_max for s in stats):
+                values = {s.min for s in stats} | {s.max for s in stats}
+                if len(values) > 1:
+                    constant = False
+                elif not (pat.is_string(field.type) or pat.is_binary(field.type)):
+                    constant = True
+            out[col] = {"null_count": int(nulls), "constant": constant}
+        return out
+
+
+def _metadata_profile(col, stats: dict, n_rows: int) -> ColumnProfile:
+    # Distinct count is only known as "1" or "at least 2" here.
+    return ColumnProfile(
+        name=col,
+        dtype="unknown",
+        dtype_class="categorical",
+        n_rows=n_rows,
+        null_count=stats["null_count"],
+        n_unique=1 if stats["constant"] else 2,
+        approx_unique=True,
+    )
+
+
+def _scan_column(reader, col, target, y, y_codes, y_binner, y_values, target_numeric, hashes, shape, days, seed):
+    """Everything the checks need from one column, read once."""
+    s = y if col == target else reader.read(col)
+    cls = _dtype_classes(s.to_frame())[col]
+    profile = profile_column(s, cls)
+
+    h = None
+    if hashes:
+        h = hash_values(s + 0.0 if pd.api.types.is_float_dtype(s.dtype) else s)
+
+    moments = table = numeric = None
+    lockstep = {}
+    if cls == "numeric" and (shape or days or (target_numeric and col != target)):
+        x = s.to_numpy(dtype="float64", na_value=np.nan)[:, None]
+        if target_numeric and col != target:
+            moments = CorrelationMoments.from_arrays([col], x, y_values)
+        if shape:
+            numeric = NumericMoments.from_arrays([col], x)
+        if col != target:
+            lockstep = {t: CorrelationMoments.from_arrays([col], x, d) for t, d in days.items()}
+    if y_codes is not None and col != target:
+        rng = np.random.default_rng(seed)
+        sample = s.iloc[np.sort(rng.choice(len(s), size=min(BIN_SAMPLE_ROWS, len(s)), replace=False))]
+        xb = Binner(sample, cls == "numeric")
+        table = contingency(xb.transform(s), y_codes, xb.n_codes, y_binner.n_codes)
+    return profile, h, moments, table, numeric, lockstep
+
+
+def check_file(
+    path,
+    target: str,
+    checks=None,
+    max_workers: int | None = None,
+    seed: int = 0,
+) -> DataSanityReport:
+    """
+    Run the checks on a Parquet, Arrow IPC or Feather file with pyarrow,
+    without building one DataFrame of the whole file.
+
+    Columns are read one at a time (max_workers in parallel) and reduced to
+    profile stats, a row-hash contribution, correlation moments and an
+    association table against the target, then dropped. Peak memory is a
+    few columns plus one 8-byte hash per row.
+
+    checks: subset of ("imbalance", "missing", "constants", "id_columns",
+    "duplicates", "leakage", "numeric_distribution", "temporal", "groups");
+    only the columns those checks need are read. Time columns are detected
+    on the first rows (first row group) of string and timestamp columns;
+    grouping keys are picked from the profile and read again after the scan.
+    For Parquet, missing values and constant columns are answered from
+    row-group statistics wherever those are exact.
+    """
+    _require_pyarrow()
+    path = Path(path)
+    reader = _ColumnReader(path)
+    # A missing target gives the same error results as check_dataset, not an exception.
+    has_target = target in reader.columns
+
+    checks = tuple(BASE_CHECKS if checks is None else checks)
+    unknown = set(checks) - set(BASE_CHECKS)
+    if unknown:
+        raise ValueError(f"Unknown checks: {sorted(unknown)}")
+
+    n_rows = reader.n_rows
+    meta = reader.metadata_stats()
+    full_scan = any(c in checks for c in ("id_columns", "duplicates", "leakage", "numeric_distribution", "temporal",
+                                          "groups"))
+    if full_scan:
+        to_read = list(reader.columns)
+    else:
+        to_read = [c for c in reader.columns if c == target or meta.get(c, {}).get("constant") is None]
+
+    y = reader.read(target) if has_target else None
+    target_class = _dtype_classes(y.to_frame())[target] if has_target else None
+    target_numeric = target_class == "numeric" and "leakage" in checks
+    y_values = y.to_numpy(dtype="float64", na_value=np.nan) if target_numeric else None
+    y_binner = y_codes = None
+    if "leakage" in checks and has_target:
+        y_binner = Binner(y.sample(min(BIN_SAMPLE_ROWS, n_rows), random_state=seed), target_class == "numeric")
+        y_codes = y_binner.transform(y)
+
+    temporal = TemporalState()
+    days = {}
+    if "temporal" in checks:
+        temporal.formats = {}
+        for col in reader.columns:
+            if col == target or not reader.may_hold_time(col):
+                continue
+            fmt = detect_time_format(reader.head(col, SCAN_ROWS))
+            if fmt is not None:
+                temporal.formats[col] = fmt
+        temporal.numeric_target = target_class in ("numeric", "bool")
+        times = {col: epoch_seconds(reader.read(col), fmt) for col, fmt in temporal.formats.items()}
+        temporal.add_rows(times, y)
+        days = {col: np.where(v, t / 86400.0, np.nan) for col, (t, v) in times.items()}
+        del times
+
+    columns = {}
+    row_hash = np.zeros(n_rows, dtype="uint64")
+    moments = CorrelationMoments()
+    numeric = NumericMoments()
+    associations = AssociationState()
+    workers = max_workers or 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(to_read), workers):
+            batch = to_read[start:start + workers]
+            futures = [
+                pool.submit(
+                    _scan_column, reader, col, target, y, y_codes, y_binner, y_values,
+                    target_numeric, "duplicates" in checks, "numeric_distribution" in checks, days, seed,
+                )
+                for col in batch
+            ]
+            # Folded in column order, so the row hash does not depend on timing.
+            for col, fut in zip(batch, futures):
+                profile, h, m, table, shape, lockstep = fut.result()
+                columns[col] = profile
+                if h is not None:
+                    row_hash = _combine(row_hash, h)
+                if m is not None:
+                    moments = moments.merge(m)
+                if table is not None:
+                    associations.tables[col] = table
+                if shape is not None:
+                    numeric = numeric.merge(shape)
+                for t, ls in lockstep.items():
+                    temporal.add_lockstep(t, ls)
+
+    for col in reader.columns:
+        if col not in columns:
+            columns[col] = _metadata_profile(col, meta[col], n_rows)
+    profile = DatasetProfile(n_rows=n_rows, columns={c: columns[c] for c in reader.columns})
+
+    results = {"shape": (n_rows, len(reader.columns))}
+    if "imbalance" in checks:
+        frame = y.to_frame() if has_target else pd.DataFrame(index=range(n_rows))
+        results["imbalance"] = check_class_imbalance(frame, target, profile)
+    if "missing" in checks:
+        results["missing"] = check_missing_values(None, profile)
+    if "constants" in checks:
+        results["constants"] = check_constant_columns(None, profile)
+    if "id_columns" in checks:
+        results["id_columns"] = check_id_like_columns(None, profile)
+    if "duplicates" in checks:
+        results["duplicates"] = _file_duplicates(reader, row_hash)
+    if "leakage" in checks and not has_target:
+        results["leakage"] = {"suspicious_features": []}
+    elif "leakage" in checks:
+        corrs = moments.correlations() if target_numeric else pd.Series(dtype="float64")
+        candidates = association_candidates(None, target, profile)
+        results["leakage"] = _leakage_result(corrs, target, associations.associations(candidates))
+    if "numeric_distribution" in checks:
+        results["numeric_distribution"] = _distribution_result(numeric.stats(), target)
+    if "temporal" in checks:
+        results["temporal"] = temporal.result()
+    if "groups" in checks:
+        groups = GroupState(group_candidates(profile, target) if has_target else [])
+        classes = {c: profile[c].dtype_class for c in groups.columns}
+        classes[target] = target_class
+        for col in groups.columns:
+            groups.update(pd.DataFrame({col: reader.read(col), target: y}), target, classes)
+        results["groups"] = groups.result()
+
+    if set(checks) != set(BASE_CHECKS):
+        # Partial run: report only what was asked for.
+        return DataSanityReport(results)
+    return _build_report(results, None, target, profile)
+
+
+def _file_duplicates(reader, row_hash: np.ndarray) -> dict:
+    """Duplicate count from row hashes; only rows sharing a hash are re-read to verify."""
+    order, starts, sizes = _hash_groups(row_hash)
+    if len(starts) == 0:
+        return _duplicates_result(0)
+    rows = np.sort(_group_rows(order, starts, sizes))
+    candidates = pd.DataFrame({col: reader.read(col).iloc[rows].to_numpy() for col in reader.columns})
+    # Re-index the hash groups onto the candidate frame.
+    local = np.searchsorted(rows, order)
+    return _duplicates_result(_verify_groups(candidates, reader.columns, local, starts, sizes))
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# String columns whose first-chunk sample has at most this share (and
+# count) of distinct values are read as category.
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MAX_LEVELS = 10_000
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def infer_compact_dtypes(sample: pd.DataFrame, keep=()) -> dict:
+    """
+    Compact dtypes for the string columns of a first-chunk sample:
+    "category" for low-cardinality ones, pyarrow strings for the rest.
+    Numeric columns are left to compact_frame, which checks the whole
+    column before downcasting. Columns in `keep` map to their sample dtype.
+    """
+    dtypes = {}
+    for col in sample.columns:
+        s = sample[col]
+        if not (s.dtype == object or pd.api.types.is_string_dtype(s.dtype)):
+            continue
+        n_unique = s.nunique()
+        if col in keep:
+            dtypes[col] = s.dtype
+        elif n_unique <= CATEGORY_MAX_LEVELS and n_unique <= CATEGORY_MAX_RATIO * max(s.notna().sum(), 1):
+            dtypes[col] = "category"
+        elif pd.api.types.is_string_dtype(s.dtype) and s.dtype != object:
+            dtypes[col] = s.dtype       # already a pyarrow-backed string (pandas >= 3)
+        elif _has_pyarrow() and s.dropna().map(type).eq(str).all():
+            dtypes[col] = "string[pyarrow]"
+        else:
+            dtypes[col] = s.dtype
+    return dtypes
+
+
+def _to_category(s: pd.Series, value_dtype) -> pd.Series:
+    # Categories keep the value dtype of a default read (str / object), so
+    # missing values and category values compare the same way.
+    codes, uniques = pd.factorize(s, sort=True)
+    categories = pd.Index(uniques.to_numpy(dtype=object), dtype=value_dtype)
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=s.index, name=s.name)
+
+
+def _compact_float(s: pd.Series) -> pd.Series:
+    x = s.to_numpy()
+    values = x[~np.isnan(x)]
+    if len(values) and np.isfinite(values).all() and np.all(values == np.round(values)):
+        # Whole numbers with gaps (ints that read_csv widened to float).
+        ints = pd.to_numeric(pd.Series(values), downcast="integer")
+        if np.array_equal(ints.to_numpy(dtype="float64"), values):
+            return s.astype(pd.api.types.pandas_dtype(ints.dtype.name.capitalize()))
+    if np.array_equal(x.astype("float32").astype("float64"), x, equal_nan=True):
+        return s.astype("float32")
+    return s
+
+
+def compact_frame(df: pd.DataFrame, keep=()) -> pd.DataFrame:
+    """
+    Smallest dtypes that keep every value: ints downcast to the narrowest
+    width holding the column's range, whole-number floats (ints with
+    missing values) to nullable Int*, other floats to float32 only when
+    the round trip is exact. Columns in `keep` are not touched.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in keep:
+            out[col] = s
+        elif pd.api.types.is_integer_dtype(s.dtype) and not isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+            out[col] = pd.to_numeric(s, downcast="integer")
+        elif s.dtype == np.float64:
+            out[col] = _compact_float(s)
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def _concat_column(parts: list, compact: bool) -> pd.Series:
+    """One column from its compacted chunks."""
+    dtypes = {p.dtype for p in parts}
+    if len(dtypes) > 1 and all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+        # Sorted categories, as _to_category gives for the whole column.
+        return pd.Series(union_categoricals(parts, sort_categories=True), name=parts[0].name)
+    if compact and len(dtypes) > 1 and all(pd.api.types.is_numeric_dtype(d) for d in dtypes):
+        if not all(pd.api.types.is_integer_dtype(d) and isinstance(d, np.dtype) for d in dtypes):
+            # e.g. Int8 in one chunk, float32 in the next: the whole column read as float64, compacted once.
+            return _compact_float(pd.concat([p.astype("float64") for p in parts], ignore_index=True))
+    return pd.concat(parts, ignore_index=True)
+
+
+def read_csv_compact(
+    source,
+    target: str | None = None,
+    sample_rows: int = 100_000,
+    chunksize: int = 1_000_000,
+    **read_csv_kwargs,
+):
+    """
+    Read a CSV with compact dtypes. Returns (df, memory) where memory is
+    {"default_bytes" (estimated from the sample), "compact_bytes",
+    "saved_bytes", "saved_fraction", "dtypes"}.
+
+    The first `sample_rows` rows decide which string columns become
+    category. The file is then read `chunksize` rows at a time and each
+    chunk compacted before the next is read, so peak memory is the compact
+    table plus one default-width chunk. Numeric columns are downcast only
+    as far as their actual values allow (chunks are reconciled to one
+    dtype per column), so the checks give the same results as on a
+    default read. The target column keeps its default dtype.
+
+    Parsing is single-threaded (pandas' C engine): the multithreaded
+    pyarrow engine cannot read in chunks, so it would hold the whole
+    default-width table at once.
+    """
+    keep = (target,) if target is not None else ()
+    sample = pd.read_csv(source, nrows=sample_rows, **read_csv_kwargs)
+    _rewind(source)
+    dtypes = infer_compact_dtypes(sample, keep)
+
+    # String columns are read as strings, then converted per chunk.
+    chunks = []
+    reader = pd.read_csv(source, chunksize=chunksize,
+                         dtype={col: object for col in dtypes} or None, **read_csv_kwargs)
+    for chunk in reader:
+        for col, dtype in dtypes.items():
+            if dtype == "category":
+                chunk[col] = _to_category(chunk[col], sample[col].dtype)
+            elif chunk[col].dtype != dtype:
+                chunk[col] = chunk[col].astype(dtype)
+        chunks.append(compact_frame(chunk, keep))
+    if not chunks:
+        chunks = [compact_frame(sample.iloc[:0], keep)]
+
+    columns = list(chunks[0].columns)
+    out = {}
+    for col in columns:
+        # Popped chunk by chunk, so each column is held once, not twice.
+        out[col] = _concat_column([c.pop(col) for c in chunks], col not in keep)
+    df = pd.DataFrame(out)
+
+    compact = int(df.memory_usage(deep=True).sum())
+    default = int(sample.memory_usage(deep=True).sum() / max(len(sample), 1) * len(df))
+    saved = max(default - compact, 0)
+    return df, {
+        "default_bytes": default,
+        "compact_bytes": compact,
+        "saved_bytes": saved,
+        "saved_fraction": round(saved / default, 4) if default else 0.0,
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }
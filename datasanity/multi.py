@@ -0,0 +1,166 @@
+from __future__ import annotations
+import os
+import time
+
+import pandas as pd
+
+from .core import _assemble, _check_tasks, _registered_tasks
+from .registry import registered_checks, select_checks
+from .scheduler import _measured_call, run_tasks
+
+# Built-in target checks that check_dataset_multi computes for all targets
+# at once; a check re-registered under one of these names runs per target.
+BATCHED = {
+    "imbalance": "datasanity.checks.imbalance:check_class_imbalance",
+    "leakage": "datasanity.checks.leakage:check_target_leakage",
+    "numeric_distribution": "datasanity.checks.distribution:check_numeric_distribution",
+    "temporal": "datasanity.checks.temporal:check_temporal",
+    "groups": "datasanity.checks.groups:check_group_leakage",
+    "model_suggestion": "datasanity.core:_model_suggestion",
+}
+
+
+def _is_builtin(check, spec: str) -> bool:
+    fn = check.fn
+    return fn == spec or f"{getattr(fn, '__module__', '')}:{getattr(fn, '__name__', '')}" == spec
+
+
+def _target_free(names, registry) -> list:
+    """Checks in `names` that neither take the target nor depend on a check that does."""
+    free = set()
+    changed = True
+    while changed:
+        changed = False
+        for name in names:
+            check = registry[name]
+            if name in free or check.needs_target:
+                continue
+            if all(d in free or d in ("profile", "row_hashes") for d in check.deps):
+                free.add(name)
+                changed = True
+    return [name for name in names if name in free]
+
+
+def _batched_leakage(df, targets, profile) -> dict:
+    """check_target_leakage for every target: one correlation matrix, shared association bins."""
+    from .checks.association import association_candidates, target_associations_multi
+    from .checks.leakage import _leakage_result, target_correlation_matrix
+
+    numeric = profile.names("numeric")
+    numeric_targets = [t for t in targets if t in numeric]
+    corrs = target_correlation_matrix(df, numeric_targets, numeric) if numeric_targets else None
+    associations = target_associations_multi(
+        df, {t: association_candidates(df, t, profile) for t in targets}, profile
+    )
+    out = {}
+    for t in targets:
+        row = corrs.loc[t].drop(t) if t in numeric_targets else pd.Series(dtype="float64")
+        out[t] = _leakage_result(row, t, associations[t])
+    return out
+
+
+def _batched(name, df, targets, profile, results) -> dict:
+    """{target: result} of one BATCHED check."""
+    present = [t for t in targets if t in df.columns]
+    if name == "imbalance":
+        from .checks.imbalance import check_class_imbalance
+
+        return {t: check_class_imbalance(df, t, profile) for t in targets}
+    if name == "leakage":
+        out = _batched_leakage(df, present, profile) if present else {}
+        return {t: out.get(t, {"suspicious_features": []}) for t in targets}
+    if name == "numeric_distribution":
+        from .checks.distribution import _distribution_result, numeric_stats
+
+        stats = numeric_stats(df, profile)
+        return {t: _distribution_result(stats, t) for t in targets}
+    if name == "temporal":
+        from .checks.temporal import check_temporal_multi
+
+        return check_temporal_multi(df, targets, profile)
+    if name == "groups":
+        from .checks.groups import check_group_leakage_multi
+
+        return check_group_leakage_multi(df, targets, profile)
+    if name == "model_suggestion":
+        from .checks.model_suggest import _count_feature_types, suggest_models
+
+        feature_types = _count_feature_types(df, None, profile)
+        return {
+            t: suggest_models(df, t, {d: results[t][d] for d in ("imbalance", "numeric_distribution", "temporal",
+                                                                 "groups") if d in results[t]}, profile, feature_types)
+            for t in targets
+        }
+    raise KeyError(name)
+
+
+def check_dataset_multi(
+    df,
+    targets,
+    executor=None,
+    max_workers: int | None = None,
+    column_shards_per_worker: int = 1,
+    checks=None,
+) -> dict:
+    """
+    check_dataset against several candidate targets of one feature table:
+    {target: DataSanityReport}, each with the same results as its own
+    check_dataset call.
+
+    Checks that do not use the target (profile, missing, constants,
+    ID-like columns, duplicates) run once. The built-in target checks are
+    batched across targets: leakage correlations are one matrix product of
+    the centred numeric columns against all numeric targets, association
+    bins are fitted and applied once per column, numeric distribution
+    moments, time columns, group key hashes and feature-type counts are
+    computed once.
+    Advice, severity, code and any other registered target checks then run
+    per target.
+
+    executor, max_workers, column_shards_per_worker and checks are as in
+    check_dataset. report.timings holds the shared steps (their time is
+    spent once for all targets) plus the target's own steps; "total" is
+    the whole call.
+    """
+    started = time.perf_counter()
+    targets = list(dict.fromkeys(targets))
+    if not targets:
+        return {}
+    registry = registered_checks()
+    names = select_checks(checks)
+
+    n_shards = 1
+    if executor not in (None, "serial"):
+        n_shards = (max_workers or os.cpu_count() or 1) * column_shards_per_worker
+
+    shared_timings = {}
+    free = _target_free(names, registry)
+    tasks = _check_tasks(df, None, None, n_shards, free)
+    shared = run_tasks(tasks, executor, max_workers, wanted=free + ["profile"], timings=shared_timings)
+    profile = shared["profile"]
+
+    per_target = {t: {} for t in targets}
+    for name in names:
+        if name not in BATCHED or not _is_builtin(registry[name], BATCHED[name]):
+            continue
+        if any(d != "profile" and d not in shared and d not in per_target[targets[0]] for d in registry[name].deps):
+            continue
+        out, shared_timings[name] = _measured_call(_batched, (name, df, targets, profile, per_target), {})
+        for t in targets:
+            per_target[t][name] = out[t]
+
+    reports = {}
+    for t in targets:
+        timings = dict(shared_timings)
+        initial = {**shared, **per_target[t]}
+        rest = [name for name in names if name not in initial]
+        done = run_tasks(_registered_tasks(df, t, rest), executor, max_workers, initial=initial,
+                         wanted=names, timings=timings)
+        report = _assemble(df.shape, done, names)
+        report.timings = timings
+        reports[t] = report
+
+    total = {"wall_s": round(time.perf_counter() - started, 6)}
+    for report in reports.values():
+        report.timings["total"] = total
+    return reports
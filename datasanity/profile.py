@@ -0,0 +1,149 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .sketch import approx_nunique
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    dtype_class: str          # "numeric", "bool" or "categorical"
+    n_rows: int
+    null_count: int
+    n_unique: int             # distinct values, all nulls counted as one value
+    min: object = None
+    max: object = None
+    approx_unique: bool = False  # n_unique is a HyperLogLog estimate
+
+    @property
+    def null_fraction(self) -> float:
+        return self.null_count / self.n_rows if self.n_rows else 0.0
+
+
+@dataclass
+class DatasetProfile:
+    n_rows: int
+    columns: dict = field(default_factory=dict)   # name -> ColumnProfile
+
+    @property
+    def shape(self) -> tuple:
+        return (self.n_rows, len(self.columns))
+
+    def __getitem__(self, name) -> ColumnProfile:
+        return self.columns[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self.columns
+
+    def names(self, *dtype_classes: str) -> list:
+        """Column names (in frame order), optionally filtered by dtype class."""
+        if not dtype_classes:
+            return list(self.columns)
+        return [c for c, p in self.columns.items() if p.dtype_class in dtype_classes]
+
+    def null_fractions(self) -> pd.Series:
+        return pd.Series(
+            {c: p.null_fraction for c, p in self.columns.items()}, dtype="float64"
+        )
+
+    def n_unique(self) -> pd.Series:
+        return pd.Series({c: p.n_unique for c, p in self.columns.items()}, dtype="int64")
+
+
+def _scalar(v):
+    # NumPy scalar -> plain Python value, NA -> None.
+    if pd.isna(v):
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+
+def _dtype_classes(df: pd.DataFrame) -> dict:
+    # Same dtype selection the checks use (select_dtypes only looks at metadata).
+    numeric = set(df.select_dtypes(include=np.number).columns)
+    boolean = set(df.select_dtypes(include="bool").columns)
+    out = {}
+    for col in df.columns:
+        if col in numeric:
+            out[col] = "numeric"
+        elif col in boolean:
+            out[col] = "bool"
+        else:
+            out[col] = "categorical"
+    return out
+
+
+def profile_column(s: pd.Series, dtype_class: str, approx_distinct: float | None = None) -> ColumnProfile:
+    """
+    Profile one column with a single hashing pass (pd.factorize).
+    Null count and distinct count both come from the factorized codes;
+    min/max are taken over the distinct values, not the full column.
+
+    With approx_distinct (a relative error, e.g. 0.01) the distinct count
+    comes from a HyperLogLog sketch instead, which needs no per-value hash
+    table; constant columns are still detected exactly.
+    """
+    if approx_distinct is not None:
+        return _profile_column_approx(s, dtype_class, approx_distinct)
+
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    null_count = int(np.count_nonzero(codes < 0))
+    n_unique = len(uniques) + (1 if null_count else 0)
+
+    lo = hi = None
+    if dtype_class == "numeric" and len(uniques):
+        u = pd.Series(uniques)
+        lo, hi = _scalar(u.min()), _scalar(u.max())
+
+    return ColumnProfile(
+        name=s.name,
+        dtype=str(s.dtype),
+        dtype_class=dtype_class,
+        n_rows=len(s),
+        null_count=null_count,
+        n_unique=n_unique,
+        min=lo,
+        max=hi,
+    )
+
+
+def _profile_column_approx(s: pd.Series, dtype_class: str, error: float) -> ColumnProfile:
+    lo = hi = None
+    if dtype_class == "numeric" and len(s):
+        lo, hi = _scalar(s.min()), _scalar(s.max())
+
+    return ColumnProfile(
+        name=s.name,
+        dtype=str(s.dtype),
+        dtype_class=dtype_class,
+        n_rows=len(s),
+        null_count=int(s.isna().sum()),
+        n_unique=approx_nunique(s, error),
+        min=lo,
+        max=hi,
+        approx_unique=True,
+    )
+
+
+def profile_dataset(df: pd.DataFrame, approx_distinct: float | None = None) -> DatasetProfile:
+    """
+    Build a column profile shared by all checks, so each column is
+    scanned once instead of once per check.
+    """
+    classes = _dtype_classes(df)
+    columns = {
+        col: profile_column(df[col], classes[col], approx_distinct) for col in df.columns
+    }
+    return DatasetProfile(n_rows=len(df), columns=columns)
+
+
+def merge_column_shards(*shards: DatasetProfile) -> DatasetProfile:
+    """Combine profiles of disjoint column groups of the same rows (in order)."""
+    columns = {}
+    for shard in shards:
+        columns.update(shard.columns)
+    n_rows = shards[0].n_rows if shards else 0
+    return DatasetProfile(n_rows=n_rows, columns=columns)
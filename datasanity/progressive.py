@@ -0,0 +1,129 @@
+from __future__ import annotations
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .core import _cache_lookup, _cache_store, _check_tasks
+from .registry import COST_CLASSES, registered_checks, select_checks
+from .scheduler import _measured_call, _needed
+
+# Cost of the shared inputs; checks use their registered cost class.
+INPUT_COST = {"profile": 0, "row_hashes": 2}
+
+
+def _cost(task) -> int:
+    name = task.name.split(":")[0]
+    check = registered_checks().get(name)
+    if check is not None:
+        return COST_CLASSES.index(check.cost)
+    return INPUT_COST.get(name, 1)
+
+
+async def check_dataset_iter(
+    df,
+    target: str,
+    approx_distinct: float | None = None,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    timeouts: dict | None = None,
+    cache=None,
+    checks=None,
+):
+    """
+    Async version of check_dataset that yields (name, result) pairs as the
+    checks finish, instead of one report at the end:
+
+        async for name, result in check_dataset_iter(df, "target"):
+            ...
+
+    "shape" comes first, then the checks in order of their registered
+    cost class (cheap profile-based checks first, duplicates and leakage
+    last) as their inputs become ready. `checks` selects which checks run,
+    as in check_dataset. The checks run on a thread pool of max_workers,
+    so the event loop is never blocked.
+
+    timeout / timeouts: seconds allowed per task (timeouts maps a task name
+    to its own limit). A check that runs over yields {"error": ...}, and so
+    does every step that depends on it. Leaving the loop early (break,
+    task cancellation) cancels whatever has not started; a check already
+    running in a thread finishes in the background and is discarded.
+
+    The last pair is ("_profile", timings) with the wall / CPU time and
+    rows / columns read of every step, as in check_dataset's report.timings
+    (empty when the whole report came from the cache).
+    """
+    yield "shape", df.shape
+
+    public = select_checks(checks)
+    cached, initial = _cache_lookup(cache, df, target, approx_distinct, public)
+    if cached is not None:
+        for name in public:
+            yield name, cached[name]
+        # Nothing ran, so there is nothing to time.
+        yield "_profile", {}
+        return
+
+    workers = max_workers or min(4, os.cpu_count() or 1)
+    timeouts = timeouts or {}
+    results = dict(initial)
+    timings = {}
+    failed = {}
+    pending = _needed(_check_tasks(df, target, approx_distinct, workers, public), results, public)
+    for name in public:
+        if name in results:
+            yield name, results[name]
+
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    running = {}
+    try:
+        while pending or running:
+            for t in [t for t in pending if any(d in failed for d in t.deps)]:
+                pending.remove(t)
+                dep = next(d for d in t.deps if d in failed)
+                failed[t.name] = {"error": f"Skipped: '{dep.split(':')[0]}' did not finish."}
+                if t.name in public:
+                    yield t.name, failed[t.name]
+
+            # Only as many tasks in flight as workers, so a cheap check that
+            # becomes ready later is not queued behind an expensive one.
+            ready = sorted((t for t in pending if all(d in results for d in t.deps)), key=_cost)
+            while ready and len(running) < workers:
+                t = ready.pop(0)
+                pending.remove(t)
+                fut = pool.submit(_measured_call, t.fn, t.args, {d: results[d] for d in t.deps})
+                limit = timeouts.get(t.name, timeouts.get(t.name.split(":")[0], timeout))
+                deadline = loop.time() + limit if limit is not None else None
+                running[asyncio.wrap_future(fut)] = (t, limit, deadline)
+            if not running:
+                continue
+
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            wait_for = max(min(deadlines) - loop.time(), 0) if deadlines else None
+            finished, _ = await asyncio.wait(running, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+            for fut in finished:
+                t = running.pop(fut)[0]
+                name = t.name
+                results[name], timings[name] = fut.result()
+                timings[name]["rows"], timings[name]["columns"] = t.scans
+                if name in public:
+                    yield name, results[name]
+
+            now = loop.time()
+            for fut, (t, limit, deadline) in list(running.items()):
+                name = t.name
+                if deadline is not None and now >= deadline:
+                    fut.cancel()
+                    del running[fut]
+                    failed[name] = {"error": f"Timed out after {limit}s."}
+                    if name in public:
+                        yield name, failed[name]
+    finally:
+        for fut in running:
+            fut.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if not failed:
+        report = {"shape": df.shape, **{name: results[name] for name in public}}
+        _cache_store(cache, df, target, approx_distinct, results, initial, report, public)
+    yield "_profile", timings
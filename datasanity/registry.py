@@ -0,0 +1,144 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Callable
+
+COST_CLASSES = ("cheap", "medium", "expensive")
+
+# Third-party packages register checks under this entry point group, e.g.
+#   [project.entry-points."datasanity.checks"]
+#   outliers = "my_pkg.checks:OUTLIER_CHECK"
+# The object is a Check, or a function registered under the entry point name.
+ENTRY_POINT_GROUP = "datasanity.checks"
+
+# Inputs every check may depend on; computed by core, not registered.
+SHARED_INPUTS = ("profile", "row_hashes")
+
+
+@dataclass
+class Check:
+    """
+    A check that check_dataset can run.
+
+    fn is called as fn(df, target, **deps) if needs_target, else
+    fn(df, **deps); each dependency result (another check, or the shared
+    "profile" / "row_hashes" inputs) arrives as a keyword argument named
+    after it. fn may be given as "module:function" and is imported on
+    first use. cost ("cheap", "medium", "expensive") orders progressive
+    runs; scans ("none", "target", "all") is what the check reads from the
+    frame itself, for timings. When a required column is missing the check
+    is not run and its result is an error. default=False checks only run
+    when selected.
+    """
+    name: str
+    fn: Callable | str
+    deps: tuple = ()
+    cost: str = "cheap"
+    needs_target: bool = False
+    required_columns: tuple = ()
+    scans: str = "none"
+    default: bool = True
+
+    def __post_init__(self):
+        if self.cost not in COST_CLASSES:
+            raise ValueError(f"cost must be one of {COST_CLASSES}, got {self.cost!r}.")
+        self.deps = tuple(self.deps)
+        self.required_columns = tuple(self.required_columns)
+
+    def resolve(self) -> Callable:
+        if isinstance(self.fn, str):
+            module, _, attr = self.fn.partition(":")
+            self.fn = getattr(import_module(module), attr)
+        return self.fn
+
+
+_REGISTRY: dict = {}
+_entry_points_loaded = False
+
+
+def register_check(check: Check | None = None, replace: bool = False, **kwargs) -> Check:
+    """
+    Register a Check (or build one from keyword arguments):
+
+        register_check(name="outliers", fn=find_outliers, deps=("profile",))
+    """
+    check = check if check is not None else Check(**kwargs)
+    if check.name in SHARED_INPUTS:
+        raise ValueError(f"'{check.name}' is reserved.")
+    if check.name in _REGISTRY and not replace:
+        raise ValueError(f"Check '{check.name}' is already registered.")
+    _REGISTRY[check.name] = check
+    return check
+
+
+def _load_entry_points() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        obj = ep.load()
+        if not isinstance(obj, Check):
+            obj = Check(name=ep.name, fn=obj)
+        if obj.name not in _REGISTRY:
+            register_check(obj)
+
+
+def registered_checks() -> dict:
+    """{name: Check} in registration order, entry-point checks included."""
+    _load_entry_points()
+    return dict(_REGISTRY)
+
+
+def select_checks(checks=None) -> tuple:
+    """
+    Names of the checks to run, in registration order: `checks` plus
+    everything they depend on, or every default check when None.
+    """
+    registry = registered_checks()
+    wanted = [name for name, c in registry.items() if c.default] if checks is None else list(checks)
+    unknown = [name for name in wanted if name not in registry]
+    if unknown:
+        raise ValueError(f"Unknown checks: {unknown}. Registered: {list(registry)}")
+    selected, stack = set(), wanted
+    while stack:
+        name = stack.pop()
+        if name in selected or name in SHARED_INPUTS:
+            continue
+        if name not in registry:
+            raise ValueError(f"Check depends on unknown check '{name}'.")
+        selected.add(name)
+        stack.extend(registry[name].deps)
+    return tuple(name for name in registry if name in selected)
+
+
+# Built-in checks, imported only when they run.
+for _check in (
+    Check("imbalance", "datasanity.checks.imbalance:check_class_imbalance", ("profile",),
+          needs_target=True, scans="target"),
+    Check("missing", "datasanity.checks.missing:check_missing_values", ("profile",)),
+    Check("constants", "datasanity.checks.constants:check_constant_columns", ("profile",)),
+    Check("id_columns", "datasanity.checks.id_columns:check_id_like_columns", ("profile",)),
+    Check("duplicates", "datasanity.core:_duplicates", ("row_hashes",), cost="expensive", scans="all"),
+    Check("leakage", "datasanity.checks.leakage:check_target_leakage", ("profile",),
+          cost="expensive", needs_target=True, scans="all"),
+    Check("numeric_distribution", "datasanity.checks.distribution:check_numeric_distribution", ("profile",),
+          cost="medium", needs_target=True, scans="all"),
+    Check("temporal", "datasanity.checks.temporal:check_temporal", ("profile",),
+          cost="medium", needs_target=True, scans="all"),
+    Check("groups", "datasanity.checks.groups:check_group_leakage", ("profile",),
+          cost="medium", needs_target=True, scans="all"),
+    Check("advice", "datasanity.core:_advice",
+          ("imbalance", "missing", "constants", "id_columns", "duplicates", "leakage", "numeric_distribution",
+           "temporal", "groups")),
+    Check("severity", "datasanity.core:_severity",
+          ("imbalance", "missing", "constants", "id_columns", "duplicates", "leakage", "numeric_distribution",
+           "temporal", "groups")),
+    Check("model_suggestion", "datasanity.core:_model_suggestion",
+          ("profile", "imbalance", "numeric_distribution", "temporal", "groups"), needs_target=True),
+    Check("code_snippet", "datasanity.core:_code_snippet", ("model_suggestion",), cost="medium"),
+):
+    register_check(_check)
+del _check
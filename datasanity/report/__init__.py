@@ -1,3 +1,10 @@
-from .generator import generate_html_report, HtmlReport
-
+# The HTML generator needs jinja2; import it only when it is used.
 __all__ = ["generate_html_report", "HtmlReport"]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module 'datasanity.report' has no attribute {name!r}")
+    from . import generator
+
+    return getattr(generator, name)
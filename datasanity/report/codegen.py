@@ -19,6 +19,12 @@ def generate_training_code(model_suggestion: dict) -> str:
     has_cat = n_cat > 0
 
     is_classification = task == "classification"
+    log_target = not is_classification and bool((model_suggestion or {}).get("log_target"))
+    time_column = (model_suggestion or {}).get("time_column")
+    time_format = (model_suggestion or {}).get("time_format")
+    if time_format == "native":
+        time_format = None                      # already a datetime column
+    group_column = (model_suggestion or {}).get("group_column")
 
     metric_block = (
         "from sklearn.metrics import classification_report\n"
@@ -31,7 +37,61 @@ def generate_training_code(model_suggestion: dict) -> str:
         "print('RMSE:', np.sqrt(mean_squared_error(y_val, preds)))\n"
     )
 
+    # With a time column, rows are sorted by time and the latest 20% become the validation set.
+    time_block = (
+        "\n"
+        "# Sort by time so the split trains on the past and validates on the latest rows\n"
+        f"time_column = {time_column!r}\n"
+        f"time_format = {time_format!r}  # as detected, e.g. day-first dates\n"
+        "df = df.assign(_time=pd.to_datetime(df[time_column], format=time_format, errors='coerce', utc=True))\n"
+        "df = df.sort_values('_time', kind='stable', na_position='first').drop(columns=['_time', time_column])\n"
+        if time_column and not group_column
+        else
+        # With groups too, whole groups are ordered by their first timestamp instead.
+        "\n"
+        "# Order whole groups by their first timestamp, so validation holds the groups that start latest\n"
+        f"time_column = {time_column!r}\n"
+        f"time_format = {time_format!r}  # as detected, e.g. day-first dates\n"
+        f"group_column = {group_column!r}\n"
+        "df = df.assign(_time=pd.to_datetime(df[time_column], format=time_format, errors='coerce', utc=True))\n"
+        "df = df.assign(_start=df.groupby(group_column)['_time'].transform('min'))\n"
+        "df = df.sort_values(['_start', group_column], kind='stable', na_position='first')\n"
+        "df = df.drop(columns=['_time', '_start', time_column])\n"
+        if time_column else ""
+    )
+
+    # With a grouping key that leaks under a random split, each group stays on one side of the split.
+    group_block = (
+        "\n"
+        "# Rows repeat per group: keep each group in either train or validation, never both\n"
+        + ("" if time_column else f"group_column = {group_column!r}\n")
+        + "groups = X.pop(group_column)\n"
+        if group_column else ""
+    )
+
     split_block = (
+        "# The last 20% of groups (by first timestamp) are the validation set\n"
+        "ordered = groups.drop_duplicates()\n"
+        "val = groups.isin(ordered.iloc[int(len(ordered) * 0.8):]).to_numpy()\n"
+        "X_train, X_val = X[~val], X[val]\n"
+        "y_train, y_val = y[~val], y[val]\n"
+        if group_column and time_column
+        else
+        "from sklearn.model_selection import GroupShuffleSplit\n"
+        "train_idx, val_idx = next(GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42).split(X, y, groups))\n"
+        "X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]\n"
+        "y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]\n"
+        "# For cross-validation use GroupKFold the same way:\n"
+        "# from sklearn.model_selection import GroupKFold, cross_val_score\n"
+        "# cross_val_score(model, X, y, groups=groups, cv=GroupKFold(n_splits=5))\n"
+        if group_column
+        else
+        "from sklearn.model_selection import train_test_split\n"
+        "X_train, X_val, y_train, y_val = train_test_split(\n"
+        "    X, y, test_size=0.2, shuffle=False\n"
+        ")\n"
+        if time_column
+        else
         "from sklearn.model_selection import train_test_split\n"
         "X_train, X_val, y_train, y_val = train_test_split(\n"
         "    X, y, test_size=0.2, random_state=42, stratify=y\n"
@@ -52,6 +112,13 @@ def generate_training_code(model_suggestion: dict) -> str:
         "from sklearn.linear_model import Ridge\n"
         "estimator = Ridge(alpha=1.0)\n"
     )
+    if log_target:
+        # The target is right-skewed and non-negative: fit on log1p, predict on the original scale.
+        base_estimator += (
+            "from sklearn.compose import TransformedTargetRegressor\n"
+            "import numpy as np\n"
+            "estimator = TransformedTargetRegressor(regressor=estimator, func=np.log1p, inverse_func=np.expm1)\n"
+        )
 
     preprocessing = (
         "from sklearn.compose import ColumnTransformer\n"
@@ -133,10 +200,10 @@ df = pd.read_csv("your_data.csv")
 target = "TARGET_COLUMN"  # <- set this
 # Drop obvious ID-like columns (optional)
 # df = df.drop(columns=["id", "customer_id"], errors="ignore")
-
+{time_block}
 X = df.drop(columns=[target])
 y = df[target]
-
+{group_block}
 # 2) Split
 {split_block}
 
@@ -1,37 +1,104 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from ..utils import truncate_dict, truncate_list
 
-@dataclass
-class HtmlReport:
-    html: str
-
-    def save(self, filepath: str | Path = "datasanity_report.html") -> Path:
-        path = Path(filepath)
-        path.write_text(self.html, encoding="utf-8")
-        return path
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+CSS_PATH = Path(__file__).resolve().parents[2] / "assets" / "styles" / "report.css"
+CSS_MARKER = "/*__EMBEDDED_CSS__*/"
 
+# Longest dict / list shown per section; the rest is summarized.
+MAX_SECTION_ITEMS = 50
 
-def generate_html_report(results: dict) -> HtmlReport:
-    templates_dir = Path(__file__).parent / "templates"
-    project_root = Path(__file__).resolve().parents[2]
-    css_path = project_root / "assets" / "styles" / "report.css"
+# (section, key) pairs that can grow with the number of columns or classes.
+_LARGE_FIELDS = (
+    ("imbalance", "distribution"),
+    ("imbalance", "ci"),
+    ("missing", "high_missing_columns"),
+    ("missing", "ci"),
+    ("constants", "constant_columns"),
+    ("id_columns", "id_like_columns"),
+    ("leakage", "suspicious_features"),
+    ("leakage", "associations"),
+    ("leakage", "ci"),
+    ("leakage", "association_ci"),
+    ("numeric_distribution", "columns"),
+    ("numeric_distribution", "skewed_columns"),
+    ("numeric_distribution", "log_transform_candidates"),
+    ("numeric_distribution", "outlier_columns"),
+    ("numeric_distribution", "infinite_columns"),
+    ("temporal", "time_columns"),
+    ("temporal", "columns"),
+    ("temporal", "target_by_period"),
+    ("temporal", "lockstep_features"),
+    ("temporal", "after_event_columns"),
+    ("groups", "candidates"),
+    ("groups", "columns"),
+    ("drift", "drifted_columns"),
+    ("drift", "missing_columns"),
+    ("drift", "new_columns"),
+)
 
-    css = ""
-    if css_path.exists():
-        css = css_path.read_text(encoding="utf-8")
 
-    env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
+@lru_cache(maxsize=1)
+def _environment() -> Environment:
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
         autoescape=select_autoescape(["html", "xml"]),
+        auto_reload=False,
     )
-    template = env.get_template("report.html")
 
-    html = template.render(results=results)
 
-    # 🔥 Ubaci CSS ručno (nema Jinja u style tagu)
-    html = html.replace("/*__EMBEDDED_CSS__*/", css)
+@lru_cache(maxsize=1)
+def _template():
+    """report.html with the CSS embedded, compiled once per process."""
+    env = _environment()
+    source, _, _ = env.loader.get_source(env, "report.html")
+    css = CSS_PATH.read_text(encoding="utf-8") if CSS_PATH.exists() else ""
+    # The style tag has no Jinja in it; the CSS goes in verbatim.
+    source = source.replace(CSS_MARKER, "{% raw %}" + css + "{% endraw %}")
+    return env.from_string(source)
+
+
+def _truncated(results: dict, max_items: int = MAX_SECTION_ITEMS) -> dict:
+    out = dict(results)
+    for section, key in _LARGE_FIELDS:
+        part = out.get(section)
+        if isinstance(part, dict) and key in part:
+            value = part[key]
+            short = truncate_dict(value, max_items) if isinstance(value, dict) else truncate_list(value, max_items)
+            if short is not value:
+                out[section] = {**part, key: short}
+    return out
 
-    return HtmlReport(html=html)
+
+class HtmlReport:
+    """
+    Rendered lazily: `html` renders the whole page into a string, save()
+    streams it into the file without building that string.
+    """
+
+    def __init__(self, html: str | None = None, results: dict | None = None):
+        self._html = html
+        self._results = results
+
+    @property
+    def html(self) -> str:
+        if self._html is None:
+            self._html = _template().render(results=self._results)
+        return self._html
+
+    def save(self, filepath: str | Path = "datasanity_report.html") -> Path:
+        path = Path(filepath)
+        if self._html is not None:
+            path.write_text(self._html, encoding="utf-8")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                _template().stream(results=self._results).dump(f)
+        return path
+
+
+def generate_html_report(results: dict) -> HtmlReport:
+    return HtmlReport(results=_truncated(results))
@@ -0,0 +1,192 @@
+from __future__ import annotations
+import math
+
+import numpy as np
+import pandas as pd
+
+from .checks.imbalance import _imbalance_result
+from .checks.leakage import target_correlations
+from .checks.association import association_candidates, target_associations
+
+Z_95 = 1.959964
+
+# Thresholds used by the checks; a sampled decision is "uncertain" when the
+# interval around the estimate contains the threshold.
+MISSING_THRESHOLD = 0.3
+MINORITY_THRESHOLD = 0.1
+LEAKAGE_THRESHOLD = 0.95
+ASSOCIATION_THRESHOLD = 0.9
+
+
+def _sample_size(size, n_rows: int) -> int:
+    if isinstance(size, float) and 0 < size <= 1:
+        return max(1, int(round(size * n_rows)))
+    return min(int(size), n_rows)
+
+
+def draw_sample(df: pd.DataFrame, target: str, size, method: str = "uniform", seed: int = 0) -> pd.DataFrame:
+    """
+    Row sample of `size` rows (int) or fraction of rows (float in (0, 1]).
+
+    "uniform": simple random sample without replacement (O(size) to draw).
+    "stratified": proportional allocation per target value, every class
+    gets at least one row. Classes are filled from a 4x uniform oversample;
+    only classes too rare to fill that way are located with a full scan.
+    """
+    n = len(df)
+    m = _sample_size(size, n)
+    if m >= n:
+        return df
+    rng = np.random.default_rng(seed)
+    if method == "uniform":
+        return df.iloc[np.sort(rng.choice(n, size=m, replace=False))]
+    if method != "stratified":
+        raise ValueError("method must be 'uniform' or 'stratified'.")
+
+    codes, uniques = pd.factorize(df[target], use_na_sentinel=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    quota = np.maximum(np.round(m * counts / n).astype("int64"), np.minimum(counts, 1))
+
+    pool = rng.choice(n, size=min(4 * m, n), replace=False)
+    pool_codes = codes[pool]
+    picked = []
+    for k in range(len(uniques)):
+        rows = pool[pool_codes == k][:quota[k]]
+        if len(rows) < quota[k]:
+            rows = rng.choice(np.flatnonzero(codes == k), size=quota[k], replace=False)
+        picked.append(rows)
+    return df.iloc[np.sort(np.concatenate(picked))]
+
+
+def _fpc(n: int, N: int | None) -> float:
+    # Finite population correction: the interval shrinks to a point when
+    # the sample is the whole table.
+    if not N or N <= 1:
+        return 1.0
+    return math.sqrt(max(N - n, 0) / (N - 1))
+
+
+def wilson_interval(p: float, n: int, N: int | None = None, z: float = Z_95) -> tuple:
+    """Wilson score interval for a proportion p observed on n of N rows."""
+    if n == 0:
+        return (0.0, 1.0)
+    f = _fpc(n, N)
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = f * z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    if f == 0:
+        return (p, p)
+    return (max(center - half, 0.0), min(center + half, 1.0))
+
+
+def correlation_interval(r: float, n: int, N: int | None = None, z: float = Z_95) -> tuple:
+    """Fisher-z interval for a Pearson correlation r on n of N rows."""
+    if math.isnan(r) or n <= 3:
+        return (-1.0, 1.0)
+    f = _fpc(n, N)
+    if f == 0 or abs(r) >= 1:
+        return (r, r)
+    zr = math.atanh(r)
+    half = f * z / math.sqrt(n - 3)
+    return (math.tanh(zr - half), math.tanh(zr + half))
+
+
+def _straddles(ci, threshold: float) -> bool:
+    return ci[0] <= threshold < ci[1]
+
+
+def _round(ci) -> list:
+    return [round(ci[0], 4), round(ci[1], 4)]
+
+
+def add_confidence_intervals(
+    results: dict,
+    df: pd.DataFrame,
+    sample: pd.DataFrame,
+    target: str,
+    profile,
+    method: str = "uniform",
+    z: float = Z_95,
+) -> dict:
+    """
+    Add interval estimates to results computed on `sample` and return the
+    "sampling" summary. Each of missing / imbalance / leakage gets a "ci"
+    dict for the entries near its threshold; decisions whose interval
+    contains the threshold are listed under "uncertain", and
+    "needs_full_pass" is set when there are any. Leakage also gets
+    "association_ci", Cramér's V intervals of every feature whose upper
+    bound reaches 0.9.
+    """
+    n, N = len(sample), len(df)
+    uncertain = []
+
+    # Missing rates: intervals for columns whose upper bound reaches 30%.
+    missing_ci = {}
+    for col in profile.names():
+        ci = wilson_interval(profile[col].null_fraction, n, N, z)
+        if ci[1] > MISSING_THRESHOLD:
+            missing_ci[col] = _round(ci)
+            if _straddles(ci, MISSING_THRESHOLD):
+                uncertain.append(f"missing:{col}")
+    results["missing"]["ci"] = missing_ci
+
+    imbalance = results.get("imbalance", {})
+    if "error" not in imbalance:
+        if method == "stratified":
+            # Class shares are fixed by the design; read them off the full column.
+            y = df[target]
+            exact = _imbalance_result(y.value_counts(dropna=False), int(y.nunique(dropna=False)),
+                                      pd.api.types.is_numeric_dtype(y))
+            imbalance.update(exact)
+            imbalance["ci"] = {}
+        elif imbalance.get("task_hint") == "classification":
+            class_ci = {k: wilson_interval(p, n, N, z) for k, p in imbalance["distribution"].items()}
+            imbalance["ci"] = {k: _round(ci) for k, ci in class_ci.items()}
+            if imbalance.get("minority_share") is not None:
+                # The rarest class may be pooled into "other"; its share is kept separately.
+                lowest = wilson_interval(imbalance["minority_share"], n, N, z)
+                if _straddles(lowest, MINORITY_THRESHOLD):
+                    uncertain.append("imbalance:minority_share")
+        else:
+            imbalance["ci"] = {}
+
+    leakage = results.get("leakage", {})
+    leakage_ci = {}
+    numeric = [c for c in profile.names("numeric") if c != target]
+    if target in profile and profile[target].dtype_class == "numeric" and numeric:
+        corrs = target_correlations(sample, target, numeric).abs()
+        for col, r in corrs.items():
+            ci = correlation_interval(r, n, N, z)
+            if ci[1] > LEAKAGE_THRESHOLD:
+                leakage_ci[col] = _round(ci)
+                if _straddles(ci, LEAKAGE_THRESHOLD):
+                    uncertain.append(f"leakage:{col}")
+    leakage["ci"] = leakage_ci
+
+    # Associations were scored on the whole sample; score every candidate again
+    # with intervals for a sample of n out of N rows, flagged or not.
+    association_ci = {}
+    if "suspicious_features" in leakage and target in sample.columns:
+        candidates = association_candidates(sample, target, profile)
+        scores = target_associations(sample, target, candidates, profile, threshold=ASSOCIATION_THRESHOLD,
+                                     sample_rows=n, population=N)
+        for col, a in scores.items():
+            if a["ci"][1] >= ASSOCIATION_THRESHOLD:
+                association_ci[col] = a["ci"]
+                if col in (leakage.get("associations") or {}):
+                    leakage["associations"][col]["ci"] = a["ci"]
+                if _straddles(a["ci"], ASSOCIATION_THRESHOLD) and f"leakage:{col}" not in uncertain:
+                    uncertain.append(f"leakage:{col}")
+    leakage["association_ci"] = association_ci
+
+    return {
+        "method": method,
+        "n_sampled": n,
+        "n_rows": N,
+        "fraction": round(n / N, 6) if N else 1.0,
+        "confidence": round(math.erf(z / math.sqrt(2)), 4),
+        # Counts in these checks are for the sample, not the whole table.
+        "approximate_checks": ["id_columns", "duplicates", "numeric_distribution", "temporal", "groups"],
+        "uncertain": uncertain,
+        "needs_full_pass": bool(uncertain),
+    }
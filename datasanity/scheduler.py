@@ -0,0 +1,237 @@
+from __future__ import annotations
+import os
+import time
+import tracemalloc
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class Task:
+    """
+    One unit of work in a check graph.
+    `fn` is called as fn(*args, **{dep: result_of_dep for dep in deps}),
+    so dependency results arrive as keyword arguments named after the task.
+    For process pools `fn` must be a module-level function.
+    """
+    name: str
+    fn: Callable
+    args: tuple = ()
+    deps: tuple = ()
+    # (rows, columns) of the input frame the task reads, for timings.
+    scans: tuple = (0, 0)
+
+
+# Frames sent once to each worker of a process pool (see _shared_frames).
+_SHARED: dict = {}
+
+
+@dataclass(frozen=True)
+class _Shared:
+    """Stands in for a task argument held in the worker's _SHARED."""
+    key: int
+
+
+def _share(frames: dict) -> None:
+    _SHARED.update(frames)
+
+
+def _resolve(args: tuple) -> tuple:
+    return tuple(_SHARED[a.key] if isinstance(a, _Shared) else a for a in args)
+
+
+def _shared_frames(tasks: list) -> tuple:
+    """
+    Frames passed to more than one task, replaced by _Shared placeholders:
+    a process pool then pickles each of them once per worker (through the
+    pool initializer) instead of once per task. Returns (tasks, frames).
+    """
+    import pandas as pd
+
+    seen, frames = {}, {}
+    for t in tasks:
+        for a in t.args:
+            if isinstance(a, pd.DataFrame):
+                if id(a) in seen and seen[id(a)] is not t:
+                    frames[id(a)] = a
+                seen.setdefault(id(a), t)
+    if not frames:
+        return tasks, {}
+    out = []
+    for t in tasks:
+        args = tuple(_Shared(id(a)) if id(a) in frames else a for a in t.args)
+        out.append(Task(t.name, t.fn, args, t.deps, t.scans))
+    return out, frames
+
+
+def _call(fn, args, kwargs):
+    return fn(*_resolve(args), **kwargs)
+
+
+def _measured_call(fn, args, kwargs, trace_memory: bool = False):
+    """
+    Run fn and return (result, {"wall_s", "cpu_s"[, "peak_mb"]}).
+    cpu_s is the CPU time of the calling thread. peak_mb is the tracemalloc
+    peak above the allocations alive at the start; tracemalloc is
+    process-wide, so tasks overlapping on a thread pool share their peaks.
+    """
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    args = _resolve(args)
+    t0, c0 = time.perf_counter(), time.thread_time()
+    out = fn(*args, **kwargs)
+    metrics = {
+        "wall_s": round(time.perf_counter() - t0, 6),
+        "cpu_s": round(time.thread_time() - c0, 6),
+    }
+    if trace_memory:
+        metrics["peak_mb"] = round(max(tracemalloc.get_traced_memory()[1] - base, 0) / 1e6, 3)
+    return out, metrics
+
+
+def _ordered(tasks: list, known=()) -> list:
+    """Topological order (stable with respect to the input order)."""
+    by_name = {t.name: t for t in tasks}
+    done, out = set(known), []
+
+    def visit(t, stack=()):
+        if t.name in done:
+            return
+        if t.name in stack:
+            raise ValueError(f"Cycle in check graph at '{t.name}'.")
+        for d in t.deps:
+            if d in done:
+                continue
+            if d not in by_name:
+                raise ValueError(f"Task '{t.name}' depends on unknown task '{d}'.")
+            visit(by_name[d], stack + (t.name,))
+        done.add(t.name)
+        out.append(t)
+
+    for t in tasks:
+        visit(t)
+    return out
+
+
+def make_executor(executor, max_workers: int | None = None, shared: dict | None = None):
+    """
+    Returns (executor, owned). `executor` may be None/"serial", "thread",
+    "process" or an existing concurrent.futures.Executor (not shut down here).
+    `shared` frames are sent to each worker of a new process pool once.
+    """
+    if executor is None or executor == "serial":
+        return None, False
+    if isinstance(executor, Executor):
+        return executor, False
+    workers = max_workers or os.cpu_count() or 1
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers), True
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers, initializer=_share, initargs=(shared or {},)), True
+    raise ValueError(f"Unknown executor: {executor!r} (use 'serial', 'thread' or 'process').")
+
+
+def _needed(tasks: list, known, wanted) -> list:
+    """Tasks required to produce `wanted`, stopping at already known results."""
+    by_name = {t.name: t for t in tasks}
+    need, stack = set(), [w for w in wanted if w not in known]
+    while stack:
+        name = stack.pop()
+        if name in need or name in known:
+            continue
+        need.add(name)
+        stack.extend(by_name[name].deps if name in by_name else ())
+    return [t for t in tasks if t.name in need]
+
+
+def run_tasks(
+    tasks: list,
+    executor=None,
+    max_workers: int | None = None,
+    initial: dict | None = None,
+    wanted=None,
+    timings: dict | None = None,
+    trace_memory: bool = False,
+    on_timing=None,
+) -> dict:
+    """
+    Run a task graph and return {task name: result}.
+    Independent tasks run concurrently on the pool; a task is submitted as
+    soon as all of its dependencies have finished. `initial` holds results
+    that are already known (tasks may depend on them); with `wanted`, only
+    the tasks needed for those names are run.
+
+    timings: dict filled with {task name: metrics} (see _measured_call plus
+    "rows"/"columns" scanned); on_timing(name, metrics) is called as each
+    task finishes.
+    """
+    results = dict(initial or {})
+    if wanted is not None:
+        tasks = _needed(tasks, results, wanted)
+    shared = {}
+    if executor == "process":
+        tasks, shared = _shared_frames(tasks)
+    ordered = _ordered(tasks, results)
+    pool, owned = make_executor(executor, max_workers, shared)
+    measure = timings is not None or on_timing is not None
+    was_tracing = tracemalloc.is_tracing()
+
+    def finish(t, out):
+        if not measure:
+            results[t.name] = out
+            return
+        results[t.name], metrics = out
+        metrics["rows"], metrics["columns"] = t.scans
+        if timings is not None:
+            timings[t.name] = metrics
+        if on_timing is not None:
+            on_timing(t.name, metrics)
+
+    def call_args(t):
+        kwargs = {d: results[d] for d in t.deps}
+        if measure:
+            return _measured_call, (t.fn, t.args, kwargs, trace_memory)
+        return _call, (t.fn, t.args, kwargs)
+
+    try:
+        if pool is None:
+            for t in ordered:
+                fn, args = call_args(t)
+                finish(t, fn(*args))
+            return results
+
+        pending = list(ordered)
+        running = {}
+        while pending or running:
+            ready = [t for t in pending if all(d in results for d in t.deps)]
+            for t in ready:
+                pending.remove(t)
+                fn, args = call_args(t)
+                running[pool.submit(fn, *args)] = t
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in finished:
+                finish(running.pop(f), f.result())
+    finally:
+        if pool is not None and owned:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if trace_memory and not was_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+    return results
+
+
+def column_shards(columns, n_shards: int) -> list:
+    """Split columns into at most n_shards contiguous groups."""
+    columns = list(columns)
+    n_shards = max(1, min(n_shards, len(columns)))
+    size = -(-len(columns) // n_shards) if columns else 1
+    return [columns[i:i + size] for i in range(0, len(columns), size)] or [[]]
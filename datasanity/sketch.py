@@ -0,0 +1,133 @@
+from __future__ import annotations
+import math
+
+import numpy as np
+import pandas as pd
+
+# Rows hashed per block, so hashing never materialises a full-column copy.
+BLOCK_ROWS = 1 << 20
+
+
+def hash_values(s: pd.Series) -> np.ndarray:
+    """64-bit hashes of a Series' values (pandas' vectorized hash)."""
+    return pd.util.hash_pandas_object(s, index=False).to_numpy()
+
+
+def hash_numeric(s: pd.Series) -> np.ndarray:
+    """
+    hash_values of a numeric Series that does not depend on whether it was
+    parsed as int or float (e.g. int in one chunk, float because of NaN in
+    the next): integers, and floats that hold an exact integer, hash as
+    int64, so large integer IDs stay distinct; other floats hash as float64
+    (with -0.0 folded into 0.0). Datetimes and timedeltas hash their int64
+    nanoseconds.
+    """
+    dtype = s.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype):
+        return hash_values(pd.Series(s.dt.as_unit("ns").array.asi8))
+    if pd.api.types.is_integer_dtype(dtype):
+        # Missing values of nullable ints hash as 0; callers mask nulls.
+        return hash_values(pd.Series(s.to_numpy(dtype="int64", na_value=0)))
+    x = s.to_numpy(dtype="float64", na_value=np.nan)
+    whole = (np.floor(x) == x) & (np.abs(x) < 2.0 ** 63)
+    h = hash_values(pd.Series(x + 0.0)).copy()
+    if whole.any():
+        h[whole] = hash_values(pd.Series(x[whole].astype("int64")))
+    return h
+
+
+def _bit_length(w: np.ndarray) -> np.ndarray:
+    # float64 holds integers below 2**53 exactly, so shift the top bits down
+    # before using frexp to read off the bit length.
+    hi = w >> np.uint64(11)
+    _, e_hi = np.frexp(hi.astype("float64"))
+    _, e_lo = np.frexp(w.astype("float64"))
+    return np.where(hi > 0, e_hi + 11, e_lo)
+
+
+class HyperLogLog:
+    """
+    Mergeable HyperLogLog distinct-count sketch over 64-bit hashes.
+
+    `error` is the target relative standard error (about 1.04 / sqrt(m)
+    with m = 2**precision registers); 0.01 uses 16 KiB of registers.
+    Sketches built with the same precision can be merged, e.g. from
+    different chunks or worker processes (they pickle as a plain array).
+    """
+
+    def __init__(self, error: float = 0.01, precision: int | None = None):
+        if precision is None:
+            precision = math.ceil(math.log2((1.04 / error) ** 2))
+        self.precision = int(min(max(precision, 4), 18))
+        self.registers = np.zeros(1 << self.precision, dtype="uint8")
+
+    @property
+    def error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        hashes = np.asarray(hashes, dtype="uint64")
+        idx = (hashes >> np.uint64(64 - p)).astype("int64")
+        w = hashes << np.uint64(p)
+        rank = np.minimum(64 - _bit_length(w) + 1, 64 - p + 1).astype("uint8")
+        np.maximum.at(self.registers, idx, rank)
+
+    def update(self, s: pd.Series) -> "HyperLogLog":
+        """Add the non-null values of a Series, block by block."""
+        for start in range(0, len(s), BLOCK_ROWS):
+            block = s.iloc[start:start + BLOCK_ROWS]
+            self.add(hash_values(block[block.notna()]))
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype("int64")))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small range: linear counting is far more accurate.
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def __len__(self) -> int:
+        return int(round(self.estimate()))
+
+
+def is_constant(s: pd.Series) -> bool:
+    """
+    True if a Series holds at most one distinct value (all nulls count as one).
+    Scans block by block and stops at the first block with a second value.
+    """
+    if len(s) == 0:
+        return True
+    nulls = s.isna()
+    if nulls.all():
+        return True
+    if nulls.any():
+        return False
+    first = s.iloc[0]
+    for start in range(0, len(s), BLOCK_ROWS):
+        if not (s.iloc[start:start + BLOCK_ROWS] == first).all():
+            return False
+    return True
+
+
+def approx_nunique(s: pd.Series, error: float = 0.01) -> int:
+    """
+    Approximate nunique(dropna=False) with a HyperLogLog sketch.
+    Columns with at most one value are detected exactly (early exit).
+    """
+    if is_constant(s):
+        return 0 if len(s) == 0 else 1
+    has_null = bool(s.isna().any())
+    # Not constant, so there are at least two distinct values.
+    return max(len(HyperLogLog(error).update(s)) + int(has_null), 2)
@@ -0,0 +1,536 @@
+from __future__ import annotations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .arrayfile import read_arrays, write_arrays
+from .profile import ColumnProfile, DatasetProfile, _dtype_classes, _scalar
+from .sketch import HyperLogLog, hash_numeric, hash_values
+from .checks.missing import check_missing_values
+from .checks.constants import check_constant_columns
+from .checks.id_columns import check_id_like_columns
+from .checks.imbalance import _imbalance_result
+from .checks.duplicates import SpilledHashSet, _combine, _duplicates_result
+from .checks.leakage import CorrelationMoments, _leakage_result
+from .checks.distribution import NumericMoments, _distribution_result
+from .checks.association import AssociationState, Binner, association_candidates
+from .checks.temporal import TemporalState, TimeBuckets
+from .checks.groups import GroupState, GroupStats, group_candidates
+
+# Every null hashes to the same value, whatever dtype the chunk was parsed as.
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _merge_class(a: str | None, b: str | None) -> str | None:
+    # None = only nulls seen so far, so the type is still open.
+    if a is None:
+        return b
+    if b is None or a == b:
+        return a
+    return "categorical"
+
+
+def _hash_column(s: pd.Series, dtype_class: str) -> np.ndarray:
+    # A numeric column can be int in one chunk and float (because of NaN)
+    # in the next; hash_numeric hashes equal values equally either way.
+    if dtype_class == "numeric":
+        return hash_numeric(s)
+    # bool columns with nulls are parsed as object; hash both the same way.
+    if dtype_class == "bool":
+        return hash_values(s.astype(object))
+    return hash_values(s)
+
+
+def _row_hashes(df: pd.DataFrame, classes: dict) -> np.ndarray:
+    h = np.zeros(len(df), dtype="uint64")
+    for col in df.columns:
+        s = df[col]
+        col_hash = _hash_column(s, classes[col]).copy()
+        col_hash[s.isna().to_numpy()] = _NULL_HASH
+        h = _combine(h, col_hash)
+    return h
+
+
+class HashSet:
+    """
+    Exact set of 64-bit hashes that grows chunk by chunk.
+    New chunks are kept as pending sorted arrays and folded in once they
+    outgrow the base, so merging stays O(n log n) overall. Counting only
+    looks up the pending values in the sorted base, so a small delta on a
+    large set is counted in O(delta * log n).
+    """
+
+    def __init__(self, values=None):
+        self._base = np.unique(values) if values is not None else np.empty(0, dtype="uint64")
+        self._pending = []
+        self._pending_size = 0
+
+    @classmethod
+    def from_sorted(cls, values: np.ndarray) -> "HashSet":
+        """Wrap unique, sorted hashes without copying them (e.g. a memory-mapped array)."""
+        out = cls()
+        out._base = values
+        return out
+
+    def add(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        self._pending.append(np.unique(values))
+        self._pending_size += len(self._pending[-1])
+        if self._pending_size > max(len(self._base), 1 << 16):
+            self._compact()
+
+    def _compact(self) -> None:
+        if self._pending:
+            self._base = np.unique(np.concatenate([self._base] + self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def merge(self, other: "HashSet") -> "HashSet":
+        other._compact()
+        self.add(other._base)
+        return self
+
+    def values(self) -> np.ndarray:
+        self._compact()
+        return self._base
+
+    def __len__(self) -> int:
+        if not self._pending:
+            return len(self._base)
+        new = np.unique(np.concatenate(self._pending))
+        if len(self._base):
+            pos = np.minimum(np.searchsorted(self._base, new), len(self._base) - 1)
+            new = new[self._base[pos] != new]
+        return len(self._base) + len(new)
+
+
+class ColumnState:
+    """
+    Mergeable per-column partial state (nulls, distinct values, min/max).
+    Distinct values go into an exact HashSet, or into a HyperLogLog sketch
+    when approx_distinct is set. The first two distinct hashes are always
+    kept exactly, so constant columns never depend on the estimate.
+    """
+
+    def __init__(self, name, approx_distinct: float | None = None):
+        self.name = name
+        self.dtype = None
+        self.dtype_class = None
+        self.n_rows = 0
+        self.null_count = 0
+        self.distinct = HashSet() if approx_distinct is None else HyperLogLog(approx_distinct)
+        self.first_values = set()
+        self.min = None
+        self.max = None
+
+    def _see(self, hashes) -> None:
+        # Early exit: once two distinct values are known, stop looking.
+        for h in hashes:
+            if len(self.first_values) >= 2:
+                break
+            self.first_values.add(int(h))
+
+    def update(self, s: pd.Series, dtype_class: str) -> None:
+        mask = s.isna().to_numpy()
+        nulls = int(mask.sum())
+        self.n_rows += len(s)
+        self.null_count += nulls
+        if nulls == len(s):
+            return
+
+        self.dtype = str(s.dtype)
+        self.dtype_class = _merge_class(self.dtype_class, dtype_class)
+        values = s[~mask]
+        hashes = _hash_column(values, dtype_class)
+        self.distinct.add(hashes)
+        if len(self.first_values) < 2:
+            self._see(np.unique(hashes)[:2])
+        # Ranges of timedelta columns are not kept: saved states store plain numbers.
+        if dtype_class == "numeric" and not pd.api.types.is_timedelta64_dtype(values.dtype):
+            self._update_range(values.min(), values.max())
+
+    def _update_range(self, lo, hi) -> None:
+        lo, hi = _scalar(lo), _scalar(hi)
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def merge(self, other: "ColumnState") -> "ColumnState":
+        self.n_rows += other.n_rows
+        self.null_count += other.null_count
+        self.dtype = self.dtype or other.dtype
+        self.dtype_class = _merge_class(self.dtype_class, other.dtype_class)
+        self.distinct.merge(other.distinct)
+        self._see(other.first_values)
+        if other.min is not None:
+            self._update_range(other.min, other.max)
+        return self
+
+    def to_profile(self) -> ColumnProfile:
+        # A column that only ever held nulls is read as float64 by pandas.
+        dtype_class = self.dtype_class or "numeric"
+        numeric = dtype_class == "numeric"
+        return ColumnProfile(
+            name=self.name,
+            dtype=self.dtype or "float64",
+            dtype_class=dtype_class,
+            n_rows=self.n_rows,
+            null_count=self.null_count,
+            n_unique=self._n_unique(),
+            min=self.min if numeric else None,
+            max=self.max if numeric else None,
+            approx_unique=isinstance(self.distinct, HyperLogLog),
+        )
+
+    def _n_unique(self) -> int:
+        has_null = 1 if self.null_count else 0
+        if len(self.first_values) < 2:
+            return len(self.first_values) + has_null
+        return max(len(self.distinct), 2) + has_null
+
+
+class DatasetState:
+    """
+    Mergeable partial state for every check in check_dataset.
+
+    Feed it chunks with update() (or combine states built elsewhere with
+    merge()), then call results() to get the same dict check_dataset
+    builds from a full DataFrame. save()/load() persist it between runs,
+    so appended rows only need update() (see check_dataset_incremental),
+    and saved states of partitions can be merged without the data.
+    """
+
+    FORMAT_VERSION = 6
+
+    def __init__(self, target: str, approx_distinct: float | None = None, spill_dir=None):
+        self.target = target
+        self.approx_distinct = approx_distinct
+        self.n_rows = 0
+        self.columns = {}                       # name -> ColumnState
+        # Row hashes, for duplicates; spill_dir keeps them on disk instead.
+        self.rows = HashSet() if spill_dir is None else SpilledHashSet(spill_dir)
+        self.target_counts = pd.Series(dtype="float64")
+        self.corr = CorrelationMoments()
+        self.numeric = NumericMoments()
+        self.associations = AssociationState()
+        self.temporal = TemporalState()
+        self.groups = GroupState()
+
+    def update(self, chunk: pd.DataFrame) -> "DatasetState":
+        classes = _dtype_classes(chunk)
+        self.n_rows += len(chunk)
+
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnState(col, self.approx_distinct)
+            self.columns[col].update(chunk[col], classes[col])
+
+        self.rows.add(_row_hashes(chunk, classes))
+
+        numeric = [c for c in chunk.columns if classes[c] == "numeric"]
+        if numeric:
+            # Quartiles cannot be merged across chunks; only the moments are kept.
+            X = chunk[numeric].to_numpy(dtype="float64", na_value=np.nan)
+            self.numeric = self.numeric.merge(NumericMoments.from_arrays(numeric, X, quartiles=False))
+
+        if self.target in chunk.columns:
+            counts = chunk[self.target].value_counts(dropna=False, sort=False)
+            self.target_counts = self.target_counts.add(counts, fill_value=0)
+            if classes[self.target] == "numeric":
+                self.corr = self.corr.merge(
+                    CorrelationMoments.from_frame(chunk, self.target, numeric)
+                )
+            self.associations.update(chunk, self.target, classes)
+        self.temporal.update(chunk, self.target, classes)
+        self.groups.update(chunk, self.target, classes)
+        return self
+
+    def merge(self, other: "DatasetState") -> "DatasetState":
+        self.n_rows += other.n_rows
+        for col, state in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(state)
+            else:
+                self.columns[col] = state
+        self.rows.merge(other.rows)
+        self.target_counts = self.target_counts.add(other.target_counts, fill_value=0)
+        self.corr = self.corr.merge(other.corr)
+        self.numeric = self.numeric.merge(other.numeric)
+        self.associations.merge(other.associations)
+        self.temporal.merge(other.temporal)
+        self.groups.merge(other.groups)
+        return self
+
+    def save(self, path) -> Path:
+        """
+        Write the state to `path` in the profile file format (see
+        datasanity.arrayfile): a JSON header with the per-column scalars,
+        and the hash sets, sketches, moments and contingency tables as
+        NumPy arrays. Written atomically.
+        """
+        if isinstance(self.rows, SpilledHashSet):
+            raise ValueError("States with spilled row hashes cannot be saved.")
+        return write_arrays(path, *_pack(self))
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> "DatasetState":
+        """
+        Read a state written by save(). With mmap=True the row and distinct
+        value hashes stay memory-mapped (read-only; updates and merges copy),
+        so loading takes about the same time whatever the size of the data.
+        """
+        meta, arrays = read_arrays(path, mmap)
+        if meta.get("kind") != "DatasetState" or meta.get("version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported state version in {path}: {meta.get('version')!r}")
+        return _unpack(meta, arrays)
+
+    def close(self) -> None:
+        """Remove spilled row hashes, if any."""
+        if isinstance(self.rows, SpilledHashSet):
+            self.rows.close()
+
+    def profile(self) -> DatasetProfile:
+        return DatasetProfile(
+            n_rows=self.n_rows,
+            columns={col: state.to_profile() for col, state in self.columns.items()},
+        )
+
+    def results(self, profile: DatasetProfile | None = None) -> dict:
+        profile = profile or self.profile()
+        target = self.target
+
+        if target not in profile:
+            imbalance = {"error": "Target column not found."}
+        else:
+            counts = self.target_counts.astype("int64")
+            counts = counts.iloc[np.argsort(-counts.to_numpy(), kind="stable")]
+            imbalance = _imbalance_result(
+                counts,
+                profile[target].n_unique,
+                profile[target].dtype_class in ("numeric", "bool"),
+            )
+
+        if target not in profile:
+            leakage = {"suspicious_features": []}
+        else:
+            corrs = pd.Series(dtype="float64")
+            if profile[target].dtype_class == "numeric":
+                # Columns that turned out non-numeric in a later chunk are not
+                # part of the correlation, same as select_dtypes on the full frame.
+                numeric = set(profile.names("numeric"))
+                corr = self.corr.drop([c for c in self.corr.columns if c not in numeric])
+                corrs = corr.correlations().drop(target, errors="ignore")
+            candidates = association_candidates(None, target, profile)
+            leakage = _leakage_result(corrs, target, self.associations.associations(candidates))
+
+        numeric = set(profile.names("numeric"))
+        numeric_stats = self.numeric.drop([c for c in self.numeric.columns if c not in numeric]).stats()
+
+        # Rows are compared by their 64-bit hash only, never re-read: distinct
+        # rows sharing a hash count as duplicates. Expected such pairs ~ d^2 / 2^65.
+        distinct = float(len(self.rows))
+        approximate = ["duplicates"] + (["id_columns"] if self.approx_distinct is not None else [])
+
+        return {
+            "shape": profile.shape,
+            "imbalance": imbalance,
+            "missing": check_missing_values(None, profile),
+            "constants": check_constant_columns(None, profile),
+            "id_columns": check_id_like_columns(None, profile),
+            "duplicates": _duplicates_result(self.n_rows - int(distinct)),
+            "leakage": leakage,
+            "numeric_distribution": _distribution_result(numeric_stats, target),
+            "temporal": self.temporal.result(),
+            # Key columns were picked on the first chunk; report those the full profile confirms.
+            "groups": self.groups.result(group_candidates(profile, target)),
+            "streaming": {
+                "approximate_checks": approximate,
+                "row_hash_bits": 64,
+                "expected_hash_collisions": float(f"{distinct * distinct / 2.0 ** 65:.3g}"),
+            },
+        }
+
+
+_CORR_FIELDS = ("n", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+
+def _put_values(key, values: pd.Index, meta: dict, arrays: dict) -> None:
+    # Plain NumPy dtypes go in as arrays; strings and other objects as a JSON list.
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufmM":
+        arrays[key] = values.to_numpy()
+    else:
+        meta[key] = {"dtype": str(values.dtype),
+                     "values": [None if v is pd.NA or v is pd.NaT else v for v in values.tolist()]}
+
+
+def _get_values(key, meta: dict, arrays: dict) -> pd.Index:
+    if key in arrays:
+        return pd.Index(arrays[key])
+    return pd.Index(meta[key]["values"], dtype=meta[key]["dtype"])
+
+
+def _offsets(parts: list) -> tuple:
+    """Concatenation of 1D arrays and the [start, stop) of each."""
+    bounds = np.cumsum([0] + [len(p) for p in parts]).tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _pack(state: DatasetState) -> tuple:
+    """(meta, arrays) of a DatasetState for write_arrays."""
+    meta = {
+        "kind": "DatasetState",
+        "version": DatasetState.FORMAT_VERSION,
+        "target": state.target,
+        "approx_distinct": state.approx_distinct,
+        "n_rows": state.n_rows,
+    }
+    arrays = {"row_hashes": state.rows.values()}
+
+    hashes = [c.distinct.values() for c in state.columns.values() if isinstance(c.distinct, HashSet)]
+    registers = [c.distinct.registers for c in state.columns.values() if isinstance(c.distinct, HyperLogLog)]
+    arrays["distinct_hashes"] = np.concatenate(hashes) if hashes else np.empty(0, dtype="uint64")
+    arrays["distinct_registers"] = np.concatenate(registers) if registers else np.empty(0, dtype="uint8")
+    hash_bounds, register_bounds = iter(_offsets(hashes)), iter(_offsets(registers))
+    columns = []
+    for c in state.columns.values():
+        exact = isinstance(c.distinct, HashSet)
+        columns.append({
+            "name": c.name, "dtype": c.dtype, "dtype_class": c.dtype_class,
+            "n_rows": c.n_rows, "null_count": c.null_count,
+            "first_values": sorted(c.first_values), "min": c.min, "max": c.max,
+            "distinct": "exact" if exact else "hll",
+            "bounds": next(hash_bounds if exact else register_bounds),
+        })
+    meta["columns"] = columns
+
+    _put_values("target_values", state.target_counts.index, meta, arrays)
+    arrays["target_counts"] = state.target_counts.to_numpy(dtype="float64")
+
+    meta["corr_columns"] = state.corr.columns
+    arrays["corr"] = np.vstack([getattr(state.corr, f) for f in _CORR_FIELDS])
+    meta["numeric_columns"] = state.numeric.columns
+    arrays["numeric"] = np.vstack([getattr(state.numeric, f) for f in NumericMoments.FIELDS])
+
+    assoc = state.associations
+    meta["association_target"] = assoc.target
+    meta["mixed"] = sorted(assoc.mixed, key=str)
+    binners, edges = [], []
+    for i, (col, b) in enumerate((assoc.binners or {}).items()):
+        if b.edges is not None:
+            edges.append(b.edges)
+            binners.append([col, "edges", None])
+        else:
+            _put_values(f"levels/{i}", b.levels, meta, arrays)
+            binners.append([col, "levels", None])
+    for entry, bounds in zip((e for e in binners if e[1] == "edges"), _offsets(edges)):
+        entry[2] = bounds
+    meta["binners"] = binners if assoc.binners is not None else None
+    arrays["binner_edges"] = np.concatenate(edges) if edges else np.empty(0)
+
+    tables = list(assoc.tables.items())
+    meta["tables"] = [[col, list(t.shape)] for col, t in tables]
+    arrays["tables"] = np.concatenate([t.reshape(-1) for _, t in tables]).astype("int64") if tables \
+        else np.empty(0, dtype="int64")
+
+    temporal = state.temporal
+    buckets = []
+    for i, (col, b) in enumerate(temporal.buckets.items()):
+        buckets.append([col, b.unit, b.start, b.n_rows, b.n_missing, b.min, b.max, b.first, b.last, b.ordered])
+        arrays[f"time_counts/{i}"] = b.counts
+        arrays[f"time_target/{i}"] = b.target
+    for i, m in enumerate(temporal.lockstep.values()):
+        arrays[f"lockstep/{i}"] = np.vstack([getattr(m, f) for f in _CORR_FIELDS])
+    meta["temporal"] = {
+        "formats": None if temporal.formats is None else list(temporal.formats.items()),
+        "numeric_target": temporal.numeric_target,
+        "buckets": buckets,
+        "lockstep": [[col, m.columns] for col, m in temporal.lockstep.items()],
+        "later": [[a, b, n_later, n_both] for (a, b), (n_later, n_both) in temporal.later.items()],
+    }
+    _put_values("temporal_levels", pd.Index(temporal.levels, dtype=object), meta, arrays)
+
+    groups = state.groups
+    for i, stats in enumerate(groups.stats.values()):
+        arrays[f"group_keys/{i}"], arrays[f"group_values/{i}"] = stats.table()
+    meta["groups"] = {
+        "columns": groups.columns,
+        "numeric_target": groups.numeric_target,
+        "shift": groups.shift,
+        "stats": [[col, stats.values.shape[1]] for col, stats in groups.stats.items()],
+    }
+    _put_values("group_levels", pd.Index(groups.levels, dtype=object), meta, arrays)
+    return meta, arrays
+
+
+def _unpack(meta: dict, arrays: dict) -> DatasetState:
+    state = DatasetState(meta["target"], meta["approx_distinct"])
+    state.n_rows = meta["n_rows"]
+    state.rows = HashSet.from_sorted(arrays["row_hashes"])
+
+    for entry in meta["columns"]:
+        c = ColumnState(entry["name"], state.approx_distinct)
+        c.dtype, c.dtype_class = entry["dtype"], entry["dtype_class"]
+        c.n_rows, c.null_count = entry["n_rows"], entry["null_count"]
+        c.first_values = set(entry["first_values"])
+        c.min, c.max = entry["min"], entry["max"]
+        start, stop = entry["bounds"]
+        if entry["distinct"] == "exact":
+            c.distinct = HashSet.from_sorted(arrays["distinct_hashes"][start:stop])
+        else:
+            # HyperLogLog updates its registers in place, so they are copied.
+            registers = arrays["distinct_registers"][start:stop]
+            c.distinct = HyperLogLog(precision=int(np.log2(len(registers))))
+            c.distinct.registers[:] = registers
+        state.columns[c.name] = c
+
+    state.target_counts = pd.Series(arrays["target_counts"], index=_get_values("target_values", meta, arrays))
+
+    state.corr = CorrelationMoments(meta["corr_columns"])
+    for field, values in zip(_CORR_FIELDS, arrays["corr"]):
+        setattr(state.corr, field, values)
+    state.numeric = NumericMoments(meta["numeric_columns"])
+    for field, values in zip(NumericMoments.FIELDS, arrays["numeric"]):
+        setattr(state.numeric, field, values)
+
+    assoc = state.associations
+    assoc.target = meta["association_target"]
+    assoc.mixed = set(meta["mixed"])
+    if meta["binners"] is not None:
+        assoc.binners = {}
+        for i, (col, kind, bounds) in enumerate(meta["binners"]):
+            if kind == "edges":
+                assoc.binners[col] = Binner.fitted(edges=arrays["binner_edges"][bounds[0]:bounds[1]])
+            else:
+                assoc.binners[col] = Binner.fitted(levels=_get_values(f"levels/{i}", meta, arrays))
+    start = 0
+    for col, shape in meta["tables"]:
+        size = shape[0] * shape[1]
+        assoc.tables[col] = arrays["tables"][start:start + size].reshape(shape)
+        start += size
+
+    spec, temporal = meta["temporal"], state.temporal
+    temporal.formats = None if spec["formats"] is None else dict(map(tuple, spec["formats"]))
+    temporal.numeric_target = spec["numeric_target"]
+    temporal.levels = _get_values("temporal_levels", meta, arrays).tolist()
+    for i, (col, unit, start, n_rows, n_missing, lo, hi, first, last, ordered) in enumerate(spec["buckets"]):
+        b = TimeBuckets()
+        b.unit, b.start, b.n_rows, b.n_missing, b.ordered = unit, start, n_rows, n_missing, ordered
+        b.min, b.max, b.first, b.last = lo, hi, first, last
+        b.counts, b.target = arrays[f"time_counts/{i}"], arrays[f"time_target/{i}"]
+        temporal.buckets[col] = b
+    for i, (col, columns) in enumerate(spec["lockstep"]):
+        m = CorrelationMoments(columns)
+        for field, values in zip(_CORR_FIELDS, arrays[f"lockstep/{i}"]):
+            setattr(m, field, values)
+        temporal.lockstep[col] = m
+    temporal.later = {(a, b): [n_later, n_both] for a, b, n_later, n_both in spec["later"]}
+
+    spec, groups = meta["groups"], state.groups
+    groups.columns, groups.numeric_target, groups.shift = spec["columns"], spec["numeric_target"], spec["shift"]
+    groups.levels = _get_values("group_levels", meta, arrays).tolist()
+    for i, (col, width) in enumerate(spec["stats"]):
+        stats = GroupStats(width)
+        stats.keys, stats.values = arrays[f"group_keys/{i}"], arrays[f"group_values/{i}"]
+        groups.stats[col] = stats
+    return state
@@ -0,0 +1,160 @@
+from __future__ import annotations
+from pathlib import Path
+
+import pandas as pd
+
+from .core import DataSanityReport, _build_report
+from .state import DatasetState
+
+
+def iter_chunks(source, chunksize: int = 100_000, **read_csv_kwargs):
+    """
+    Yield DataFrame chunks from a CSV path, a DataFrame or an iterable of DataFrames.
+    Extra keyword arguments are passed to pd.read_csv for paths.
+    """
+    if isinstance(source, (str, Path)):
+        with pd.read_csv(source, chunksize=chunksize, **read_csv_kwargs) as reader:
+            yield from reader
+    elif isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+    else:
+        yield from source
+
+
+def check_dataset_stream(
+    source,
+    target: str,
+    chunksize: int = 100_000,
+    approx_distinct: float | None = None,
+    spill_dir=None,
+    **read_csv_kwargs,
+) -> DataSanityReport:
+    """
+    Streaming version of check_dataset for data that does not fit in memory.
+
+    `source` is a CSV path, a DataFrame or any iterable of DataFrame chunks.
+    Each chunk is folded into a mergeable DatasetState and dropped, so only
+    one chunk is held at a time. Missing values, constants, target
+    distribution and leakage state have a fixed size per column; exact
+    distinct counts (ID-like columns) and duplicate detection keep one
+    64-bit hash per distinct value / row. Pass approx_distinct (relative
+    error, e.g. 0.01) to count distinct values with fixed-size HyperLogLog
+    sketches instead, and spill_dir (a directory, e.g. "/tmp") to keep row
+    hashes in partitioned files on disk instead of in memory.
+
+    Matches check_dataset on the concatenated data (as long as every column
+    parses to the same kind of dtype in all chunks) except for two fields:
+    association bins of numeric columns are fitted on the first chunk only,
+    so Cramér's V can differ slightly, and the quartile and outlier fields
+    of numeric_distribution are None, since they need the sorted column.
+    Duplicates are counted on row hashes without re-reading the rows, so
+    a hash collision counts as a duplicate; the "streaming" section lists
+    the approximate checks and the expected number of such collisions.
+    """
+    state = DatasetState(target, approx_distinct, spill_dir)
+    try:
+        for chunk in iter_chunks(source, chunksize, **read_csv_kwargs):
+            state.update(chunk)
+        profile = state.profile()
+        results = state.results(profile)
+    finally:
+        state.close()
+    return _build_report(results, None, target, profile)
+
+
+def check_dataset_incremental(
+    new_rows,
+    target: str,
+    state_path,
+    chunksize: int = 100_000,
+    approx_distinct: float | None = None,
+    **read_csv_kwargs,
+) -> DataSanityReport:
+    """
+    Delta mode: fold only the newly appended rows into a saved DatasetState
+    and return the report for all rows seen so far.
+
+    `new_rows` is anything check_dataset_stream accepts. The state at
+    `state_path` is created on the first run and overwritten after each
+    update. Work per run is proportional to the new rows (plus writing the
+    state back). With exact distinct counts the saved state holds one hash
+    per distinct value/row; approx_distinct keeps the columns fixed-size.
+    """
+    path = Path(state_path)
+    if path.exists():
+        state = DatasetState.load(path, mmap=False)  # the file is replaced below
+        if state.target != target:
+            raise ValueError(f"State at {path} was built for target '{state.target}', not '{target}'.")
+    else:
+        state = DatasetState(target, approx_distinct)
+
+    for chunk in iter_chunks(new_rows, chunksize, **read_csv_kwargs):
+        state.update(chunk)
+    state.save(path)
+
+    profile = state.profile()
+    return _build_report(state.results(profile), None, target, profile)
+
+
+def build_profile(
+    source,
+    target: str,
+    chunksize: int = 100_000,
+    approx_distinct: float | None = None,
+    reference=None,
+    **read_csv_kwargs,
+) -> DatasetState:
+    """
+    Fold `source` (anything check_dataset_stream accepts) into a
+    DatasetState without building a report; save it with .save(path).
+
+    Profiles of partitions merge with merge_profiles. Association bins are
+    fitted on the first chunk, so pass `reference` (a DatasetState or a
+    saved profile, e.g. of the first partition) to reuse its bins: columns
+    whose bins differ between merged profiles drop out of the association
+    part of the leakage check.
+    """
+    state = DatasetState(target, approx_distinct)
+    if reference is not None:
+        if not isinstance(reference, DatasetState):
+            reference = DatasetState.load(reference)
+        if reference.target != target:
+            raise ValueError(f"Reference profile was built for target '{reference.target}', not '{target}'.")
+        state.associations.binners = reference.associations.binners
+    for chunk in iter_chunks(source, chunksize, **read_csv_kwargs):
+        state.update(chunk)
+    return state
+
+
+def merge_profiles(profiles) -> DatasetState:
+    """One DatasetState from several (states or saved profile paths), e.g. one per partition."""
+    merged = None
+    for profile in profiles:
+        state = profile if isinstance(profile, DatasetState) else DatasetState.load(profile)
+        if merged is None:
+            merged = state
+        elif state.target != merged.target:
+            raise ValueError(f"Cannot merge profiles for targets '{merged.target}' and '{state.target}'.")
+        else:
+            merged.merge(state)
+    if merged is None:
+        raise ValueError("No profiles to merge.")
+    return merged
+
+
+def check_dataset_from_profile(profile, target: str | None = None) -> DataSanityReport:
+    """
+    The check_dataset_stream report of the data behind a saved profile,
+    without reading the data. `profile` is a DatasetState or the path of
+    one saved with .save() (memory-mapped on load).
+
+    The target distribution, correlations and association tables in a
+    profile are built for its own target, so `target`, if given, must be
+    that one.
+    """
+    state = profile if isinstance(profile, DatasetState) else DatasetState.load(profile)
+    if target is not None and target != state.target:
+        raise ValueError(f"Profile was built for target '{state.target}', not '{target}'.")
+    dataset_profile = state.profile()
+    return _build_report(state.results(dataset_profile), None, state.target, dataset_profile)
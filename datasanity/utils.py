@@ -1,3 +1,6 @@
+from itertools import islice
+
+
 def truncate_dict(d: dict, max_items: int = 50) -> dict:
     """
     Truncate large dicts for nicer display in UI/report.
@@ -7,7 +10,13 @@ def truncate_dict(d: dict, max_items: int = 50) -> dict:
         return d
     if len(d) <= max_items:
         return d
-    items = list(d.items())[:max_items]
-    out = dict(items)
+    out = dict(islice(d.items(), max_items))
     out["..."] = f"truncated (showing first {max_items} of {len(d)})"
     return out
+
+
+def truncate_list(items: list, max_items: int = 50) -> list:
+    """Same as truncate_dict, for lists."""
+    if not isinstance(items, list) or len(items) <= max_items:
+        return items
+    return items[:max_items] + [f"... truncated (showing first {max_items} of {len(items)})"]
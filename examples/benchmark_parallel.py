@@ -0,0 +1,44 @@
+"""
+Serial vs thread-pool vs process-pool check_dataset on a wide frame.
+
+    python examples/benchmark_parallel.py [n_rows] [n_cols] [workers]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from datasanity import check_dataset
+
+
+def make_frame(n_rows: int, n_cols: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {f"num_{i}": rng.normal(size=n_rows) for i in range(n_cols // 2)}
+    data.update({f"cat_{i}": rng.choice(list("abcdefgh"), n_rows) for i in range(n_cols - n_cols // 2)})
+    data["target"] = rng.integers(0, 2, n_rows)
+    return pd.DataFrame(data)
+
+
+def timed(df, **kwargs):
+    t0 = time.perf_counter()
+    report = check_dataset(df, "target", **kwargs)
+    # report.results, not to_dict(): that also holds the run's timings.
+    return time.perf_counter() - t0, json.dumps(report.results, default=str)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    df = make_frame(n_rows, n_cols)
+    print(f"frame: {df.shape[0]} rows x {df.shape[1]} columns, {workers} workers")
+
+    serial, expected = timed(df)
+    print(f" serial: {serial:6.2f}s")
+    for executor in ("thread", "process"):
+        elapsed, out = timed(df, executor=executor, max_workers=workers)
+        same = "identical" if out == expected else "DIFFERENT"
+        print(f"{executor:>7}: {elapsed:6.2f}s  x{serial / elapsed:4.1f}  ({same} result)")
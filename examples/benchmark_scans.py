@@ -0,0 +1,93 @@
+"""
+Counts full-column scans done by check_dataset, before and after the
+shared column profile.
+
+"before" calls every check without a profile (the old behaviour),
+"after" runs check_dataset, which profiles each column once.
+
+    python examples/benchmark_scans.py [n_rows] [n_cols]
+"""
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from datasanity import check_dataset
+from datasanity.checks import (
+    check_class_imbalance,
+    check_missing_values,
+    check_constant_columns,
+    check_id_like_columns,
+    check_duplicates,
+    check_target_leakage,
+)
+from datasanity.checks.model_suggest import _count_feature_types
+
+SCANS = Counter()
+
+
+def _count(name, per_column):
+    def wrap(fn):
+        def inner(self, *args, **kwargs):
+            SCANS[name] += self.shape[1] if per_column and self.ndim == 2 else 1
+            return fn(self, *args, **kwargs)
+        return inner
+    return wrap
+
+
+def _count_factorize(fn):
+    def inner(values, *args, **kwargs):
+        SCANS["factorize"] += 1
+        return fn(values, *args, **kwargs)
+    return inner
+
+
+pd.Series.nunique = _count("nunique", False)(pd.Series.nunique)
+pd.Series.value_counts = _count("value_counts", False)(pd.Series.value_counts)
+pd.DataFrame.isnull = _count("isnull", True)(pd.DataFrame.isnull)
+pd.DataFrame.duplicated = _count("duplicated", True)(pd.DataFrame.duplicated)
+pd.DataFrame.corr = _count("corr", True)(pd.DataFrame.corr)
+pd.factorize = _count_factorize(pd.factorize)
+
+
+def make_frame(n_rows: int, n_cols: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {f"num_{i}": rng.normal(size=n_rows) for i in range(n_cols // 2)}
+    data.update({f"cat_{i}": rng.choice(list("abcde"), n_rows) for i in range(n_cols - n_cols // 2)})
+    data["target"] = rng.integers(0, 2, n_rows)
+    return pd.DataFrame(data)
+
+
+def run_before(df, target):
+    results = {
+        "imbalance": check_class_imbalance(df, target),
+        "missing": check_missing_values(df),
+        "constants": check_constant_columns(df),
+        "id_columns": check_id_like_columns(df),
+        "duplicates": check_duplicates(df),
+        "leakage": check_target_leakage(df, target),
+    }
+    _count_feature_types(df, target)
+    return results
+
+
+def measure(label, fn, df):
+    SCANS.clear()
+    t0 = time.perf_counter()
+    fn(df, "target")
+    elapsed = time.perf_counter() - t0
+    total = sum(SCANS.values())
+    print(f"{label:>7}: {total:6d} column scans ({total / df.shape[1]:.1f} per column), {elapsed:.2f}s")
+    for name, n in sorted(SCANS.items()):
+        print(f"         {name:<13}{n}")
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    df = make_frame(n_rows, n_cols)
+    print(f"frame: {df.shape[0]} rows x {df.shape[1]} columns")
+    measure("before", run_before, df)
+    measure("after", check_dataset, df)
@@ -5,4 +5,6 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=["pandas", "numpy", "jinja2"],
+    extras_require={"arrow": ["pyarrow"]},
+    entry_points={"console_scripts": ["datasanity=datasanity.cli:main"]},
 )